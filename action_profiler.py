@@ -0,0 +1,87 @@
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+import cProfile
+import datetime
+import glob
+import io
+import logging
+import os
+import pstats
+import threading
+import time
+
+class ActionProfiler:
+    """cProfile around user actions (Generate, Update OBS, Load Room, Copy All) while debug mode is on.
+    
+    Each profiled action is saved as <directory>/<action>-<timestamp>.prof
+    (open it with snakeviz or `python -m pstats`) and its top `top`
+    functions by cumulative time are written to the debug log. Only the
+    newest `keep` files per action are kept. An action started while
+    another is being profiled on the same thread is part of the outer
+    profile. Generate is recorded once typing in the roster pauses, not on
+    every key; syncs the bus runs after an edit are not profiled.
+    """
+    
+    def __init__(self, directory: str = "profiles", top: int = 15, keep: int = 20, enabled: bool = False):
+        self.directory = directory
+        self.top = top
+        self.keep = keep
+        self.enabled = enabled
+        self.last_summary: Optional[str] = None
+        self._local = threading.local()  # Whether this thread is inside a profiled action
+        self.logger = logging.getLogger(__name__)
+    
+    @contextmanager
+    def profile(self, action: str) -> Iterator[None]:
+        """Profile the body of the with-block as `action` when enabled"""
+        if not self.enabled or getattr(self._local, "active", False):
+            yield
+            return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+ allows one profiler at a time; another thread has it
+            yield
+            return
+        self._local.active = True
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            self._local.active = False
+            try:
+                self._save(action, profiler, time.perf_counter() - started)
+            except Exception as e:
+                self.logger.error(f"Failed to save profile of {action}: {str(e)}")
+    
+    def _save(self, action: str, profiler: cProfile.Profile, elapsed: float) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S-%f")[:-3]
+        path = os.path.join(self.directory, f"{action}-{stamp}.prof")
+        profiler.dump_stats(path)
+        self._prune(action)
+        
+        self.last_summary = f"Profile {action}: {elapsed * 1000:.1f}ms, saved to {path}"
+        self.logger.info(f"{self.last_summary}\n" + "\n".join(self.summarize(profiler)))
+    
+    def summarize(self, profiler: cProfile.Profile) -> List[str]:
+        """The top functions by cumulative time, as pstats prints them"""
+        out = io.StringIO()
+        stats = pstats.Stats(profiler, stream=out)
+        stats.strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+        # Skip pstats' preamble down to the table header
+        lines = out.getvalue().splitlines()
+        start = next((index for index, line in enumerate(lines) if line.lstrip().startswith("ncalls")), 0)
+        return [line for line in lines[start:] if line.strip()]
+    
+    def _prune(self, action: str) -> None:
+        """Delete all but the newest `keep` profiles of an action"""
+        files = sorted(glob.glob(os.path.join(glob.escape(self.directory), f"{glob.escape(action)}-*.prof")))
+        for path in files[:-self.keep]:
+            os.remove(path)
+    
+    def describe(self) -> str:
+        """The last profile for the debug panel"""
+        return self.last_summary or f"Profiling on; no actions profiled yet (saving to {self.directory})"
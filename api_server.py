@@ -0,0 +1,357 @@
+"""HTTP control API for rooms, links and OBS sync, usable without the Tk window
+    
+    python api_server.py [--host 127.0.0.1] [--port 5000] [--no-obs]
+
+Endpoints (JSON bodies and answers):
+    
+    GET    /api/rooms                              List rooms
+    POST   /api/rooms                              Create a room {room, password, host_username, host_character, players}
+    GET    /api/rooms/<room>                       Get a room and its roster
+    PATCH  /api/rooms/<room>                       Update password or host fields
+    DELETE /api/rooms/<room>                       Remove a room
+    PUT    /api/rooms/<room>/players/<username>    Add or update a player {character}
+    DELETE /api/rooms/<room>/players/<username>    Remove a player
+    POST   /api/rooms/<room>/roster                Upsert many players {players, replace}
+    GET    /api/rooms/<room>/links                 Links, with an ETag for conditional GETs
+    POST   /api/rooms/<room>/sync                  Push the room's links to the OBS sources
+
+Players are sent as {username: character} or as [{username, character}].
+With APISettings.token set, requests need "Authorization: Bearer <token>".
+"""
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, Tuple
+import argparse
+import hashlib
+import json
+import logging
+import threading
+
+from flask import Flask, jsonify, request
+
+from event_bus import EventBus, LinksRegenerated, RosterChanged
+from metrics import REGISTRY
+from obs_manager import OBSManager, OBSRequestError, OBSTimeoutError
+from player_manager import Player, PlayerManager
+from settings import RoomSettings
+from vdo_ninja_manager import VDONinjaManager
+
+CACHE_LOOKUPS = REGISTRY.counter("vidlinker_cache_lookups_total", "Cache lookups by cache and result",
+                                 ("cache", "result"))
+LINKS_HIT = CACHE_LOOKUPS.labels("api_links", "hit")
+LINKS_MISS = CACHE_LOOKUPS.labels("api_links", "miss")
+
+class APIError(Exception):
+    """A request the API refuses, with the HTTP status to answer with"""
+    
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+def parse_players(players: Any) -> Dict[str, str]:
+    """A roster sent as {username: character} or [{username, character}], checked to be all strings"""
+    if isinstance(players, list):
+        if not all(isinstance(entry, dict) and "username" in entry for entry in players):
+            raise APIError(400, "Each player needs a username")
+        players = {entry["username"]: entry.get("character", "") for entry in players}
+    if not isinstance(players, dict):
+        raise APIError(400, "Players must be an object or a list of {username, character}")
+    for username, character in players.items():
+        if not isinstance(username, str) or not isinstance(character, str):
+            raise APIError(400, f"Player {username!r} needs a string username and character")
+    return players
+
+class RoomService:
+    """Rooms edited through the API, with links cached per roster revision"""
+    
+    def __init__(self, vdo_ninja: VDONinjaManager, obs_manager: Optional[OBSManager] = None,
+                 layout_manager: Optional[Any] = None, events: Optional[EventBus] = None):
+        self.vdo_ninja = vdo_ninja
+        self.obs = obs_manager
+        self.layout = layout_manager
+        self.events = events
+        self.rooms: Dict[str, RoomSettings] = {}
+        self.revisions: Dict[str, int] = {}
+        self._links: Dict[str, Tuple[int, Dict[str, str], str]] = {}  # room -> (revision, links, etag)
+        self._lock = threading.RLock()
+        self.logger = logging.getLogger(__name__)
+    
+    def get(self, name: str) -> RoomSettings:
+        room = self.rooms.get(name)
+        if room is None:
+            raise APIError(404, f"No room named {name}")
+        return room
+    
+    def create(self, data: Dict[str, Any]) -> RoomSettings:
+        """Create a room from {room, password, host_username, host_character, players}"""
+        room = RoomSettings()
+        room.from_dict({**data, "players": parse_players(data.get("players", {}))})
+        room.host_username = data.get("host_username", "")
+        room.host_character = data.get("host_character", "")
+        if not room.room_name:
+            raise APIError(400, "Room name is not set")
+        with self._lock:
+            if room.room_name in self.rooms:
+                raise APIError(409, f"Room {room.room_name} already exists")
+            self.rooms[room.room_name] = room
+            self._changed(room)
+        return room
+    
+    def update(self, name: str, data: Dict[str, Any]) -> RoomSettings:
+        """Change a room's password or host fields"""
+        with self._lock:
+            room = self.get(name)
+            for key, field_name in (("password", "room_password"), ("host_username", "host_username"),
+                                    ("host_character", "host_character")):
+                if key in data:
+                    setattr(room, field_name, data[key])
+            self._changed(room)
+        return room
+    
+    def delete(self, name: str) -> None:
+        with self._lock:
+            self.get(name)
+            del self.rooms[name]
+            self.revisions.pop(name, None)
+            self._links.pop(name, None)
+    
+    def upsert_players(self, name: str, players: Dict[str, str], replace: bool = False) -> RoomSettings:
+        """Add or update players in one go; with `replace`, players not listed are removed"""
+        with self._lock:
+            room = self.get(name)
+            roster = {} if replace else dict(room.players)
+            roster.update(players)
+            if roster != room.players:
+                room.players = roster
+                self._changed(room)
+        return room
+    
+    def remove_player(self, name: str, username: str) -> RoomSettings:
+        with self._lock:
+            room = self.get(name)
+            if username not in room.players:
+                raise APIError(404, f"No player named {username} in {name}")
+            room.players = {user: character for user, character in room.players.items() if user != username}
+            self._changed(room)
+        return room
+    
+    def _changed(self, room: RoomSettings) -> None:
+        """Bump a room's revision after an edit (called with the lock held)"""
+        room.player_info = "\n".join(f"{user},{character}" for user, character in room.players.items())
+        self.revisions[room.room_name] = self.revisions.get(room.room_name, 0) + 1
+        if self.events is not None:
+            self.events.publish(RosterChanged(room.room_name, dict(room.players), room.host_username,
+                                              room.host_character))
+    
+    def summaries(self) -> List[Dict[str, Any]]:
+        """Name, roster size and revision of every room"""
+        with self._lock:
+            return [{"room": name, "players": len(room.players), "revision": self.revisions[name]}
+                    for name, room in self.rooms.items()]
+    
+    def links(self, name: str) -> Tuple[Dict[str, str], str, int]:
+        """Get (links, etag, revision) for a room, generating them once per revision"""
+        with self._lock:
+            links, etag, revision, generated = self._cached_links(name)
+        if generated:
+            self._announce(name, links)
+        return links, etag, revision
+    
+    def _cached_links(self, name: str) -> Tuple[Dict[str, str], str, int, bool]:
+        """links() for a caller holding the lock, plus whether they were generated just now"""
+        room = self.get(name)
+        revision = self.revisions[name]
+        cached = self._links.get(name)
+        if cached is not None and cached[0] == revision:
+            LINKS_HIT.inc()
+            return cached[1], cached[2], revision, False
+        LINKS_MISS.inc()
+        
+        links = self.vdo_ninja.generate_room_links(room.room_name, room.room_password,
+                                                   host_username=room.host_username,
+                                                   host_character=room.host_character,
+                                                   players=room.players)
+        etag = hashlib.sha1(json.dumps(links, sort_keys=True).encode()).hexdigest()[:20]
+        self._links[name] = (revision, links, etag)
+        return links, etag, revision, True
+    
+    def _announce(self, name: str, links: Dict[str, str]) -> None:
+        # Published outside the lock, so subscribers can call back into the service
+        if self.events is not None:
+            self.events.publish(LinksRegenerated(name, links))
+    
+    def players(self, name: str) -> List[Player]:
+        """The roster as PlayerManager players, with their links and push ids"""
+        with self._lock:
+            room = self.get(name)
+            links, _, _, generated = self._cached_links(name)
+            room_name, roster = room.room_name, dict(room.players)
+        if generated:
+            self._announce(name, links)
+        return self._players(room_name, roster, links)
+    
+    @staticmethod
+    def _players(room_name: str, roster: Dict[str, str], links: Dict[str, str]) -> List[Player]:
+        players = []
+        for username, character in roster.items():
+            players.append(Player(
+                username=username,
+                character_name=character,
+                push_id=PlayerManager.generate_push_id(room_name, username, character),
+                # OBS shows the same link the player joins with
+                room_link=links.get(username),
+                solo_link=links.get(username)
+            ))
+        return players
+    
+    def describe(self, name: str) -> Dict[str, Any]:
+        """A room as the API returns it"""
+        # One snapshot, so a concurrent edit or delete can't land halfway through
+        with self._lock:
+            room = self.get(name)
+            links, _, revision, generated = self._cached_links(name)
+            roster = dict(room.players)
+            described = {
+                "room": room.room_name,
+                "host_username": room.host_username,
+                "host_character": room.host_character,
+                "has_password": bool(room.room_password),
+                "revision": revision
+            }
+        if generated:
+            self._announce(name, links)
+        manager = PlayerManager()
+        manager.update_player_links(self._players(described["room"], roster, links))
+        # Slot 0 is the host, so players start at p1
+        described["players"] = [dict(asdict(player), slot=index + 1) for index, player in enumerate(manager.players)]
+        described["sources"] = [asdict(manager.create_obs_source(player, index + 1))
+                                for index, player in enumerate(manager.players)]
+        return described
+    
+    def sync(self, name: str) -> Dict[str, Any]:
+        """Push a room's links to the pNvdosolo/pNname sources"""
+        if self.obs is None or not self.obs.connected:
+            raise APIError(503, "Not connected to OBS")
+        links, _, revision = self.links(name)
+        try:
+            results = self.obs.update_sources(links, layout=self.layout)
+        except OBSTimeoutError as e:
+            raise APIError(504, f"OBS did not answer in time: {str(e)}")
+        except OBSRequestError as e:
+            raise APIError(502, f"OBS refused the update: {str(e)}")
+        failed = [result for result in results if not result.ok]
+        if failed:
+            raise APIError(502, f"OBS refused {len(failed)} of {len(results)} source updates: {failed[0].error}")
+        return {"room": name, "slots": self.obs.slot_count, "revision": revision}
+
+def create_app(service: RoomService, token: str = "") -> Flask:
+    """Build the Flask app around a RoomService"""
+    app = Flask(__name__)
+    
+    @app.before_request
+    def check_token():
+        if token and request.headers.get("Authorization") != f"Bearer {token}":
+            return jsonify(error="Missing or wrong API token"), 401
+    
+    @app.errorhandler(APIError)
+    def api_error(e):
+        return jsonify(error=str(e)), e.status
+    
+    def body() -> Dict[str, Any]:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            raise APIError(400, "Expected a JSON object")
+        return data
+    
+    @app.route("/api/rooms", methods=["GET"])
+    def list_rooms():
+        return jsonify(rooms=service.summaries())
+    
+    @app.route("/api/rooms", methods=["POST"])
+    def create_room():
+        room = service.create(body())
+        return jsonify(service.describe(room.room_name)), 201
+    
+    @app.route("/api/rooms/<name>", methods=["GET"])
+    def get_room(name):
+        return jsonify(service.describe(name))
+    
+    @app.route("/api/rooms/<name>", methods=["PATCH"])
+    def update_room(name):
+        service.update(name, body())
+        return jsonify(service.describe(name))
+    
+    @app.route("/api/rooms/<name>", methods=["DELETE"])
+    def delete_room(name):
+        service.delete(name)
+        return "", 204
+    
+    @app.route("/api/rooms/<name>/players/<username>", methods=["PUT"])
+    def put_player(name, username):
+        service.upsert_players(name, parse_players({username: body().get("character", "")}))
+        return jsonify(service.describe(name))
+    
+    @app.route("/api/rooms/<name>/players/<username>", methods=["DELETE"])
+    def delete_player(name, username):
+        service.remove_player(name, username)
+        return jsonify(service.describe(name))
+    
+    @app.route("/api/rooms/<name>/roster", methods=["POST"])
+    def upsert_roster(name):
+        data = body()
+        players = parse_players(data.get("players", {}))
+        service.upsert_players(name, players, replace=bool(data.get("replace", False)))
+        return jsonify(service.describe(name))
+    
+    @app.route("/api/rooms/<name>/links", methods=["GET"])
+    def get_links(name):
+        links, etag, revision = service.links(name)
+        response = jsonify(room=name, revision=revision, links=links)
+        response.set_etag(etag)
+        return response.make_conditional(request)
+    
+    @app.route("/api/rooms/<name>/sync", methods=["POST"])
+    def sync_room(name):
+        return jsonify(service.sync(name))
+    
+    return app
+
+def main():
+    from layout_manager import LayoutManager
+    from settings import Settings
+    
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", help="Address to listen on (default: from settings)")
+    parser.add_argument("--port", type=int, help="Port to listen on (default: from settings)")
+    parser.add_argument("--no-obs", action="store_true", help="Do not connect to OBS")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    settings = Settings()
+    settings.load()
+    
+    obs = None
+    if not args.no_obs and settings.interface.enable_obs:
+        obs = OBSManager(
+            pipeline_window=settings.obs.pipeline_window,
+            request_timeout=settings.obs.request_timeout,
+            connect_timeout=settings.obs.connect_timeout,
+            sync_deadline=settings.obs.sync_deadline,
+            encoding=settings.obs.encoding,
+            lane_rates=settings.obs.lane_rates,
+            lane_max_wait=settings.obs.lane_max_wait
+        )
+        try:
+            obs.connect(host=settings.obs.host, port=settings.obs.port, password=settings.obs.password)
+        except Exception as e:
+            logging.error(f"Failed to connect to OBS; sync requests will fail: {str(e)}")
+    
+    service = RoomService(VDONinjaManager(), obs, LayoutManager(settings.layout, settings.video))
+    app = create_app(service, settings.api.token)
+    try:
+        app.run(host=args.host or settings.api.host, port=args.port or settings.api.port, threaded=True)
+    finally:
+        if obs is not None and obs.connected:
+            obs.disconnect()
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,32 @@
+from startup_timer import STARTUP
 import os
 import json
+import copy
+import sys
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import webbrowser
 import traceback
 from typing import Optional, Dict, List
 from settings import Settings
-from obs_manager import OBSManager
 from vdo_ninja_manager import VDONinjaManager
+from layout_manager import LayoutManager
+from log_tail import LogTail
+from log_setup import setup_logging
+from event_log import log_event, OUTCOME_FAILED, OUTCOME_TIMEOUT
+from metrics import REGISTRY, MetricsServer
+from ui_watchdog import StallWatchdog
+from action_profiler import ActionProfiler
+from memory_profiler import MemoryProfiler
+from event_bus import (EventBus, RosterChanged, LinksRegenerated, OBSStateChanged, SettingsApplied,
+                       DISPATCH_THREAD, POLICY_LATEST)
 from ui_components import SettingsDialog, ScrollableFrame
 import datetime
 import logging
+import threading
+import time
+
+# OBS, the HTTP API, the push server and the session calendar are imported in start_services,
+# after the window is up; obswebsocket and flask alone were most of the import time
 
 class PlayerFrame(ttk.Frame):
     def __init__(self, parent, player_num, initial_name="", initial_char="", **kwargs):
@@ -125,8 +141,8 @@ class RoomConfigFrame(ttk.LabelFrame):
     
     def on_field_change(self, event=None):
         """Handle field changes"""
-        if hasattr(self.app, 'generate_links'):
-            self.app.generate_links()
+        if hasattr(self.app, 'schedule_generate'):
+            self.app.schedule_generate()
     
     def on_password_change(self, event=None):
         """Handle password field changes"""
@@ -135,8 +151,8 @@ class RoomConfigFrame(ttk.LabelFrame):
             self.include_password.set(False)
         
         # Trigger link update
-        if hasattr(self.app, 'generate_links'):
-            self.app.generate_links()
+        if hasattr(self.app, 'schedule_generate'):
+            self.app.schedule_generate()
     
     def get_room_name(self):
         """Get current room name"""
@@ -161,6 +177,7 @@ class RoomConfigFrame(ttk.LabelFrame):
 class App:
     def __init__(self):
         """Initialize the application"""
+        STARTUP.mark("imports")
         self.root = tk.Tk()
         self.root.title("VDO.Ninja Link Manager")
         
@@ -168,19 +185,42 @@ class App:
         self.main_frame = ttk.Frame(self.root, padding="10 10 10 10")
         self.main_frame.pack(fill="both", expand=True)
         
-        # Initialize logging
-        self.debug_log_path = "obs_debug.log"
-        logging.basicConfig(
-            filename=self.debug_log_path,
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        self.logger = logging.getLogger(__name__)
-        
         # Load settings
         self.settings = Settings()
         self.settings.load()
+        STARTUP.mark("settings loaded")
+        
+        # Initialize logging; records are written on a background thread, never on the UI thread
+        self.debug_log_path = "obs_debug.log"
+        setup_logging(self.debug_log_path, max_bytes=self.settings.interface.log_max_kb * 1024,
+                      backups=self.settings.interface.log_backups,
+                      events_path=self.settings.interface.event_log or None,
+                      events_max_bytes=self.settings.interface.event_log_max_kb * 1024)
+        self.logger = logging.getLogger(__name__)
+        # Profile user actions while debug mode is on
+        self.profiler = ActionProfiler(self.settings.interface.profile_dir, top=self.settings.interface.profile_top,
+                                       enabled=self.settings.interface.debug_mode)
+        self._generate_job = None  # Pending regenerate_links() after an edit
+        self.memory_profiler = MemoryProfiler(top=self.settings.interface.memory_top,
+                                              enabled=self.settings.interface.memory_profile)
+        self.debug_tail = LogTail(self.debug_log_path, initial_bytes=self.settings.interface.debug_tail_kb * 1024,
+                                  max_lines=self.settings.interface.debug_max_lines)
+        
+        # Roster edits, link generation, OBS sync and the debug panel talk through the event bus
+        self.events = EventBus()
+        self.events.subscribe(RosterChanged, self.store_roster, name="store-roster")
+        # OBS only needs the newest links; edits made while a sync runs collapse into one follow-up sync
+        self.events.subscribe(LinksRegenerated, lambda e: self.update_obs_sources(e.links), name="obs-sync",
+                              dispatch=DISPATCH_THREAD, policy=POLICY_LATEST,
+                              where=lambda e: not e.obs_synced and e.room_name == self.settings.room.room_name)
+        self.events.subscribe(SettingsApplied, lambda e: self.connect_to_obs(), name="obs-connect")
+        self.events.subscribe(SettingsApplied, name="profiler",
+                              handler=lambda e: setattr(self.profiler, 'enabled', self.settings.interface.debug_mode))
+        self.events.subscribe(SettingsApplied, name="memory-profiler",
+                              handler=lambda e: setattr(self.memory_profiler, 'enabled',
+                                                        self.settings.interface.memory_profile))
+        self.events.subscribe(OBSStateChanged, lambda e: self.root.after(0, self.update_debug_info),
+                              name="debug-panel")
         
         # Create UI components
         self.create_room_config_frame()
@@ -202,21 +242,145 @@ class App:
         
         # Set window size and position
         self.root.geometry(f"{width}x{height}+{x}+{y}")
+        STARTUP.mark("ui built")
         
-        # Initialize OBS manager
-        self.obs_manager = OBSManager()
-        if self.settings.interface.enable_obs:
-            self.connect_to_obs()
-        
-        # Initialize VDO.Ninja manager
+        # Links need no OBS; everything that does is created by start_services once the window shows
         self.vdo_ninja = VDONinjaManager()
+        self.layout_manager = LayoutManager(self.settings.layout, self.settings.video)
+        self.obs_manager = None
+        self.preset_manager = None
+        self.room_manager = None
+        self.push_server = None
+        self.session_scheduler = None
+        self.metrics_server = None
+        self.obs_connect_lock = threading.Lock()
+        
+        # Log the main thread's stack whenever the UI stops responding; started once the main loop runs
+        self.ui_watchdog = None
+        if self.settings.interface.stall_threshold_ms > 0:
+            self.ui_watchdog = StallWatchdog(self.root, interval=self.settings.interface.heartbeat_ms / 1000,
+                                             threshold=self.settings.interface.stall_threshold_ms / 1000)
+            self.root.after(0, self.ui_watchdog.start)
         
         # Load initial room config if exists
         if self.settings.room and self.settings.room.room_name:
             self.room_config.set_room_name(self.settings.room.room_name)
             self.room_config.set_room_password(self.settings.room.room_password)
             self.generate_links()
-            
+        
+    def start_services(self):
+        """Create the OBS manager and the servers around it, then connect to OBS in the background"""
+        from obs_manager import OBSManager
+        from preset_manager import PresetManager
+        from room_manager import RoomManager, OBSConnectionPool
+        
+        # Initialize OBS manager
+        obs_manager = OBSManager(
+            pipeline_window=self.settings.obs.pipeline_window,
+            request_timeout=self.settings.obs.request_timeout,
+            connect_timeout=self.settings.obs.connect_timeout,
+            sync_deadline=self.settings.obs.sync_deadline,
+            encoding=self.settings.obs.encoding,
+            stats_history=self.settings.obs.stats_history,
+            skipped_frames_threshold=self.settings.obs.skipped_frames_threshold,
+            lane_rates=self.settings.obs.lane_rates,
+            lane_max_wait=self.settings.obs.lane_max_wait
+        )
+        if self.settings.obs.capture_path:
+            obs_manager.start_capture(self.settings.obs.capture_path)
+        self.obs_manager = obs_manager
+        
+        # Preload room presets for hot-swapping with Ctrl+1..Ctrl+9
+        self.preset_manager = PresetManager(self.obs_manager, self.vdo_ninja, self.layout_manager)
+        self.preset_manager.load_all(self.settings.presets.files)
+        if self.settings.presets.hotkeys:
+            for index in range(min(9, len(self.preset_manager.presets))):
+                self.root.bind(f"<Control-Key-{index + 1}>", lambda e, i=index: self.activate_preset(i))
+        
+        # Extra rooms share the main OBS connection (or open their own) and a pool of sync workers
+        self.obs_pool = OBSConnectionPool()
+        self.obs_pool.add(self.settings.obs.host, self.settings.obs.port, self.obs_manager, self.settings.obs.password)
+        self.room_manager = RoomManager(
+            self.obs_pool,
+            self.vdo_ninja,
+            self.layout_manager,
+            default_target=(self.settings.obs.host, self.settings.obs.port, self.settings.obs.password),
+            workers=self.settings.rooms.workers,
+            max_rooms=self.settings.rooms.max_rooms
+        )
+        
+        # Stream roster and link changes to dashboards
+        if self.settings.push.enabled:
+            try:
+                from push_server import PushServer
+                self.push_server = PushServer(self.events, self.settings.push.host, self.settings.push.port,
+                                              max_pending=self.settings.push.max_pending)
+                self.push_server.start()
+            except Exception as e:
+                self.logger.error(f"Failed to start push server: {str(e)}")
+                self.push_server = None
+        
+        # Serve the HTTP control API next to the window
+        if self.settings.api.enabled:
+            from api_server import RoomService, create_app
+            self.api_service = RoomService(self.vdo_ninja, self.obs_manager, self.layout_manager, self.events)
+            api = create_app(self.api_service, self.settings.api.token)
+            threading.Thread(target=api.run, name="api-server", daemon=True,
+                             kwargs={"host": self.settings.api.host, "port": self.settings.api.port,
+                                     "threaded": True}).start()
+            self.logger.info(f"HTTP API listening on {self.settings.api.host}:{self.settings.api.port}")
+        
+        # Switch rooms on the session calendar, pre-warming each one before it starts
+        if self.settings.sessions.calendar:
+            try:
+                from session_scheduler import SessionScheduler
+                self.session_scheduler = SessionScheduler(self.obs_manager, self.vdo_ninja, self.layout_manager,
+                                                          lead_time=self.settings.sessions.lead_time,
+                                                          on_switch=self.on_session_switch)
+                self.session_scheduler.load(self.settings.sessions.calendar)
+                self.session_scheduler.start()
+            except Exception as e:
+                self.logger.error(f"Failed to start session calendar {self.settings.sessions.calendar}: {str(e)}")
+        
+        # Expose counters, queue depths and UI lag for Prometheus
+        if self.settings.metrics.enabled:
+            try:
+                self.register_metrics()
+                self.metrics_server = MetricsServer(REGISTRY, self.settings.metrics.host, self.settings.metrics.port)
+                self.metrics_server.start()
+            except Exception as e:
+                self.logger.error(f"Failed to start metrics endpoint: {str(e)}")
+                self.metrics_server = None
+        STARTUP.mark("services started")
+        
+        # Connecting can take up to connect_timeout; the window stays responsive meanwhile
+        if self.settings.interface.enable_obs:
+            threading.Thread(target=self.connect_at_startup, name="obs-connect", daemon=True).start()
+    
+    def connect_at_startup(self):
+        """Connect to OBS, load the extra rooms and sync the room that was open at startup"""
+        self.connect_to_obs()
+        self.room_manager.load_all(self.settings.rooms.files)
+        if self.obs_manager.is_connected():
+            STARTUP.mark("OBS connected")
+            self.logger.info(STARTUP.describe())
+            if self.settings.room.room_name:
+                self.root.after(0, self.generate_links)
+    
+    def register_metrics(self):
+        """Publish connection state and queue depths, read when Prometheus scrapes"""
+        REGISTRY.gauge("vidlinker_obs_connected", "Whether OBS is connected").set_function(
+            lambda: 1 if self.obs_manager is not None and self.obs_manager.connected else 0)
+        if self.obs_manager is not None:
+            REGISTRY.gauge("vidlinker_obs_lane_queue_depth", "OBS commands waiting per scheduler lane",
+                           ("lane",)).set_function(self.obs_manager.scheduler.queue_lengths)
+        REGISTRY.gauge("vidlinker_event_bus_pending", "Events queued per bus subscriber", ("subscriber",)).set_function(
+            lambda: {entry["name"]: entry["pending"] for entry in self.events.subscriber_stats()})
+        REGISTRY.gauge("vidlinker_push_clients", "Dashboards connected to the push server").set_function(
+            lambda: len(self.push_server.clients) if self.push_server else 0)
+        REGISTRY.gauge("vidlinker_rooms", "Extra rooms kept in sync").set_function(
+            lambda: len(self.room_manager.rooms))
+    
     def create_room_config_frame(self):
         """Create the room configuration frame"""
         # Create frame
@@ -339,8 +503,8 @@ class App:
         }
         
         # Bind events
-        name_entry.bind('<KeyRelease>', lambda e: self.generate_links())
-        char_entry.bind('<KeyRelease>', lambda e: self.generate_links())
+        name_entry.bind('<KeyRelease>', lambda e: self.schedule_generate())
+        char_entry.bind('<KeyRelease>', lambda e: self.schedule_generate())
         
         # Load host info if available
         if hasattr(self.settings, 'room'):
@@ -385,8 +549,8 @@ class App:
         })
         
         # Bind events
-        name_entry.bind('<KeyRelease>', lambda e: self.generate_links())
-        char_entry.bind('<KeyRelease>', lambda e: self.generate_links())
+        name_entry.bind('<KeyRelease>', lambda e: self.schedule_generate())
+        char_entry.bind('<KeyRelease>', lambda e: self.schedule_generate())
         
         # Update links
         self.generate_links()
@@ -408,11 +572,21 @@ class App:
         # Update links
         self.generate_links()
 
-    def generate_links(self):
-        """Generate all links"""
+    def schedule_generate(self):
+        """Regenerate links once typing pauses rather than on every key"""
+        if self._generate_job is not None:
+            self.root.after_cancel(self._generate_job)
+        self._generate_job = self.root.after(self.settings.interface.edit_debounce_ms, self.regenerate_links)
+    
+    def regenerate_links(self):
+        """Generate links after an edit; this is the Generate action the profiler records"""
+        self._generate_job = None
+        with self.profiler.profile("generate"), self.memory_profiler.track("generate"):
+            self.generate_links()
+    
+    def generate_links(self, obs_synced=False):
+        """Generate all links; with `obs_synced` the caller pushes them to OBS instead of the bus"""
         try:
-            links = {}
-            
             # Get room name and password
             room_name = self.room_config.get_room_name()
             if not room_name:
@@ -420,69 +594,43 @@ class App:
             
             password = self.room_config.get_room_password()
             
-            # Update settings with current values
-            self.settings.room.room_name = room_name
-            self.settings.room.room_password = self.room_config.get_room_password()
-            
-            # Save host info
+            # Collect host info and player names and characters in list order
+            host_username = host_character = ""
             if hasattr(self, 'host_entry'):
-                self.settings.room.host_username = self.host_entry['name'].get().strip()
-                self.settings.room.host_character = self.host_entry['character'].get().strip()
-            
-            # Generate host/director params
-            params = {
-                "room": room_name,
-                "director": "1",
-                "quality": "1080p",
-                "meshcast": "1"
-            }
-            
-            # Only add password if it exists
-            if password:
-                params["password"] = password
-            
-            # Add host name if provided
-            if self.settings.room.host_username:
-                params["username"] = self.settings.room.host_username
-            
-            # Add host character if provided
-            if self.settings.room.host_character:
-                params["character"] = self.settings.room.host_character
-            
-            links['host'] = "https://vdo.ninja/?" + "&".join(f"{k}={v}" for k, v in params.items())
-            
-            # Generate player links
+                host_username = self.host_entry['name'].get().strip()
+                host_character = self.host_entry['character'].get().strip()
+            players = {}
             for entry in self.player_entries:
                 username = entry['name'].get().strip()
-                character = entry['character'].get().strip()
-                
-                if username:  # Only generate link if username is provided
-                    player_params = {
-                        "room": room_name,
-                        "username": username,
-                        "quality": "1080p",
-                        "meshcast": "1"
-                    }
-                    
-                    # Only add password if it exists
-                    if password:
-                        player_params["password"] = password
-                    
-                    # Add character if provided
-                    if character:
-                        player_params["character"] = character
-                    
-                    player_url = "https://vdo.ninja/?" + "&".join(f"{k}={v}" for k, v in player_params.items())
-                    links[username] = player_url
-            
-            # Update OBS sources if connected
-            self.update_obs_sources(links)
+                if username:
+                    players[username] = entry['character'].get().strip()
+            self.events.publish(RosterChanged(room_name, players, host_username, host_character))
+            
+            started = time.perf_counter()
+            links = self.vdo_ninja.generate_room_links(
+                room_name, password,
+                host_username=host_username,
+                host_character=host_character,
+                players=players
+            )
+            log_event("generate_links", room=room_name, latency=time.perf_counter() - started, players=len(players))
+            
+            # OBS picks the links up from the bus
+            self.events.publish(LinksRegenerated(room_name, links, obs_synced))
             
             return links
             
         except Exception as e:
             self.logger.error(f"Failed to generate links: {str(e)}")
+            log_event("generate_links", OUTCOME_FAILED, error=str(e))
             messagebox.showerror("Error", f"Failed to generate links: {str(e)}")
+    
+    def store_roster(self, event: RosterChanged):
+        """Keep the room settings in step with the roster being edited"""
+        self.settings.room.room_name = event.room_name
+        self.settings.room.room_password = self.room_config.get_room_password()
+        self.settings.room.host_username = event.host_username
+        self.settings.room.host_character = event.host_character
 
     def create_debug_frame(self):
         """Create the debug frame"""
@@ -492,6 +640,9 @@ class App:
         
         # Create text widget with scrollbar
         self.debug_text = tk.Text(debug_frame, height=8)
+        # Header lines go before this mark and log lines after it
+        self.debug_text.mark_set('log_start', '1.0')
+        self.debug_text.mark_gravity('log_start', tk.LEFT)
         scrollbar = ttk.Scrollbar(debug_frame, orient="vertical", command=self.debug_text.yview)
         self.debug_text.configure(yscrollcommand=scrollbar.set)
         
@@ -515,11 +666,15 @@ class App:
             text="Clear Log",
             command=self.clear_debug_log
         ).pack(side="left", padx=5)
+        
+        self.update_debug_info()
+        self.root.after(1000, self.poll_debug_log)
 
     def show_documentation(self):
         """Show documentation in web browser"""
         try:
             doc_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "documentation.html")
+            import webbrowser
             webbrowser.open(doc_path)
         except Exception as e:
             self.logger.error(f"Failed to open documentation: {str(e)}")
@@ -533,7 +688,7 @@ class App:
         
         def on_save():
             self.settings.save()
-            self.connect_to_obs()
+            self.events.publish(SettingsApplied())
             dialog.destroy()
         
         dialog.on_save = on_save
@@ -589,130 +744,221 @@ class App:
             if not file_path:
                 return
                 
-            # Load from file
-            with open(file_path, 'r') as f:
-                room_data = json.load(f)
-            
-            # Update settings first
-            self.settings.room.from_dict(room_data)
-            
-            # Update UI with loaded settings
-            self.room_config.set_room_name(self.settings.room.room_name)
-            self.room_config.set_room_password(self.settings.room.room_password)
-            
-            # Update host fields
-            self.host_entry['name'].delete(0, tk.END)
-            self.host_entry['name'].insert(0, self.settings.room.host_username)
-            self.host_entry['character'].delete(0, tk.END)
-            self.host_entry['character'].insert(0, self.settings.room.host_character)
-            
-            # Clear existing players
-            for entry in self.player_entries:
-                entry['frame'].destroy()
-            self.player_entries.clear()
-            
-            # Add loaded players from settings
-            for name, character in self.settings.room.players.items():
-                # Create new player entry
-                player_frame = ttk.Frame(self.scrollable_frame)
-                player_frame.pack(fill="x", padx=5, pady=2)
-                
-                # Player number
-                player_num = len(self.player_entries) + 1
-                ttk.Label(player_frame, text=f"Player {player_num}:", width=8).pack(side="left", padx=2)
-                
-                # Name entry
-                ttk.Label(player_frame, text="Name:", width=6).pack(side="left", padx=2)
-                name_entry = ttk.Entry(player_frame, width=20)
-                name_entry.insert(0, name)
-                name_entry.pack(side="left", padx=2)
-                
-                # Character entry
-                ttk.Label(player_frame, text="Character:", width=10).pack(side="left", padx=2)
-                char_entry = ttk.Entry(player_frame, width=20)
-                char_entry.insert(0, character)
-                char_entry.pack(side="left", padx=2)
+            with self.profiler.profile("load_room"), self.memory_profiler.track("load_room"):
+                # Load from file
+                with open(file_path, 'r') as f:
+                    room_data = json.load(f)
                 
-                # Buttons frame
-                btn_frame = ttk.Frame(player_frame)
-                btn_frame.pack(side="right", padx=2)
+                # Update settings first
+                self.settings.room.from_dict(room_data)
+                self.show_room()
                 
-                # Delete button
-                delete_btn = ttk.Button(btn_frame, text="Delete",
-                                      command=lambda f=player_frame, n=name_entry, c=char_entry:
-                                      self.delete_player_entry(f, n, c))
-                delete_btn.pack(side="left", padx=2)
-                
-                # Store references
-                self.player_entries.append({
-                    'frame': player_frame,
-                    'name': name_entry,
-                    'character': char_entry
-                })
-                
-                # Bind events
-                name_entry.bind('<KeyRelease>', lambda e: self.generate_links())
-                char_entry.bind('<KeyRelease>', lambda e: self.generate_links())
+                # Generate links for loaded configuration
+                self.generate_links()
             
-            # Generate links for loaded configuration
-            self.generate_links()
             messagebox.showinfo("Success", "Room configuration loaded successfully!")
             
         except Exception as e:
             self.logger.error(f"Failed to load room: {str(e)}")
             messagebox.showerror("Error", f"Failed to load room configuration: {str(e)}")
+    
+    def activate_preset(self, index: int):
+        """Switch OBS to a preloaded room, then show it in the window"""
+        try:
+            preset = self.preset_manager.activate(index)
+        except Exception as e:
+            self.logger.error(f"Failed to switch room preset {index + 1}: {str(e)}")
+            return
+        
+        # OBS has already switched; rebuilding the widgets can wait for the next idle moment
+        self.settings.room = copy.deepcopy(preset.room)
+        self.root.after_idle(self.show_room)
+    
+    def on_session_switch(self, session):
+        """Show a room the session calendar switched to (called from the scheduler thread)"""
+        room = copy.deepcopy(session.preset.room)
+        
+        def show():
+            self.settings.room = room
+            self.show_room()
+        self.root.after(0, show)
+    
+    def show_room(self):
+        """Rebuild the room fields and player list from the room settings"""
+        # Update UI with loaded settings
+        self.room_config.set_room_name(self.settings.room.room_name)
+        self.room_config.set_room_password(self.settings.room.room_password)
+        
+        # Update host fields
+        self.host_entry['name'].delete(0, tk.END)
+        self.host_entry['name'].insert(0, self.settings.room.host_username)
+        self.host_entry['character'].delete(0, tk.END)
+        self.host_entry['character'].insert(0, self.settings.room.host_character)
+        
+        # Clear existing players
+        for entry in self.player_entries:
+            entry['frame'].destroy()
+        self.player_entries.clear()
+        
+        # Add loaded players from settings
+        for name, character in self.settings.room.players.items():
+            # Create new player entry
+            player_frame = ttk.Frame(self.scrollable_frame)
+            player_frame.pack(fill="x", padx=5, pady=2)
+            
+            # Player number
+            player_num = len(self.player_entries) + 1
+            ttk.Label(player_frame, text=f"Player {player_num}:", width=8).pack(side="left", padx=2)
+            
+            # Name entry
+            ttk.Label(player_frame, text="Name:", width=6).pack(side="left", padx=2)
+            name_entry = ttk.Entry(player_frame, width=20)
+            name_entry.insert(0, name)
+            name_entry.pack(side="left", padx=2)
+            
+            # Character entry
+            ttk.Label(player_frame, text="Character:", width=10).pack(side="left", padx=2)
+            char_entry = ttk.Entry(player_frame, width=20)
+            char_entry.insert(0, character)
+            char_entry.pack(side="left", padx=2)
+            
+            # Buttons frame
+            btn_frame = ttk.Frame(player_frame)
+            btn_frame.pack(side="right", padx=2)
+            
+            # Delete button
+            delete_btn = ttk.Button(btn_frame, text="Delete",
+                                  command=lambda f=player_frame, n=name_entry, c=char_entry:
+                                  self.delete_player_entry(f, n, c))
+            delete_btn.pack(side="left", padx=2)
+            
+            # Store references
+            self.player_entries.append({
+                'frame': player_frame,
+                'name': name_entry,
+                'character': char_entry
+            })
+            
+            # Bind events
+            name_entry.bind('<KeyRelease>', lambda e: self.schedule_generate())
+            char_entry.bind('<KeyRelease>', lambda e: self.schedule_generate())
 
     def connect_to_obs(self):
         """Try to connect to OBS"""
-        if self.settings.interface.enable_obs:
-            try:
-                self.obs_manager.connect(
-                    host=self.settings.obs.host,
-                    port=self.settings.obs.port,
-                    password=self.settings.obs.password
-                )
-                self.logger.info("Successfully connected to OBS")
-            except Exception as e:
-                self.logger.error(f"Failed to connect to OBS: {str(e)}")
+        if self.obs_manager is None:
+            self.logger.info("OBS manager not initialized yet, connecting once it starts")
+        elif self.settings.interface.enable_obs:
+            with self.obs_connect_lock:
+                self._connect_to_obs()
         else:
             self.logger.info("OBS integration is disabled")
+    
+    def _connect_to_obs(self):
+        """Connect to OBS and start the helpers that need a connection"""
+        from obs_manager import OBSTimeoutError
+        from reconciler import DriftReconciler
+        from source_lifecycle import SourceLifecycleManager
+        
+        try:
+            self.obs_manager.connect(
+                host=self.settings.obs.host,
+                port=self.settings.obs.port,
+                password=self.settings.obs.password
+            )
+            self.logger.info("Successfully connected to OBS")
+            
+            if self.settings.obs.stats_interval > 0:
+                self.obs_manager.start_stats_sampler(self.settings.obs.stats_interval)
+            
+            # Park browser sources that are off air
+            if self.settings.obs.lifecycle_mode != "off":
+                if getattr(self, 'source_lifecycle', None):
+                    self.source_lifecycle.stop()
+                self.source_lifecycle = SourceLifecycleManager(
+                    self.obs_manager,
+                    mode=self.settings.obs.lifecycle_mode,
+                    preroll=self.settings.obs.preroll_seconds,
+                    park_delay=self.settings.obs.park_delay
+                )
+                self.source_lifecycle.start()
+            
+            # Repair sources edited by hand in OBS
+            if self.settings.obs.reconcile_interval > 0:
+                if getattr(self, 'reconciler', None):
+                    self.reconciler.stop()
+                self.reconciler = DriftReconciler(
+                    self.obs_manager,
+                    interval=self.settings.obs.reconcile_interval,
+                    quiet_period=self.settings.obs.reconcile_quiet_period,
+                    max_repairs_per_minute=self.settings.obs.reconcile_max_repairs
+                )
+                self.reconciler.start()
+            
+            # Scene item ids are per connection
+            if getattr(self, 'preset_manager', None):
+                self.preset_manager.refresh()
+            if getattr(self, 'room_manager', None):
+                self.room_manager.resync()
+            self.events.publish(OBSStateChanged(True, self.settings.obs.host, self.settings.obs.port))
+        except OBSTimeoutError as e:
+            self.logger.error(f"Timed out connecting to OBS at {self.settings.obs.host}:{self.settings.obs.port}: {str(e)}")
+            self.events.publish(OBSStateChanged(False, self.settings.obs.host, self.settings.obs.port, str(e)))
+        except Exception as e:
+            self.logger.error(f"Failed to connect to OBS: {str(e)}")
+            self.events.publish(OBSStateChanged(False, self.settings.obs.host, self.settings.obs.port, str(e)))
             
     def update_obs_sources(self, links=None):
-        """Update OBS sources with the current links"""
+        """Update OBS sources with the current links; returns whether every source was updated"""
+        self.logger.info("Starting to update OBS sources...")
+        if getattr(self, 'obs_manager', None) is None:
+            self.logger.info("OBS manager not initialized, skipping source update")
+            return False
+        from obs_manager import OBSTimeoutError
+        
         try:
-            self.logger.info("Starting to update OBS sources...")
-            if not hasattr(self, 'obs_manager') or self.obs_manager is None:
-                self.logger.info("OBS manager not initialized, skipping source update")
-                return
-            
             if links is None:
                 links = self.generate_links()
             
-            self.obs_manager.update_sources(links)
+            room_name = self.settings.room.room_name
+            self.obs_manager.room_prefixes[""] = room_name
+            started = time.perf_counter()
+            # The host label goes out with the sources, so no later sync puts "Host" back over it
+            results = self.obs_manager.update_sources(links, layout=getattr(self, 'layout_manager', None),
+                                                      host_label=self.settings.room.host_username or "Host")
+            failed = sum(1 for result in results if not result.ok)
+            if failed:
+                log_event("sync", OUTCOME_FAILED, room=room_name, latency=time.perf_counter() - started,
+                          slots=len(links), error=f"{failed} of {len(results)} requests failed")
+                return False
+            log_event("sync", room=room_name, latency=time.perf_counter() - started, slots=len(links))
             self.logger.info("Successfully updated OBS sources")
+            return True
             
+        except OBSTimeoutError as e:
+            self.logger.error(f"Timed out updating OBS sources: {str(e)}")
+            log_event("sync", OUTCOME_TIMEOUT, room=self.settings.room.room_name, error=str(e))
         except Exception as e:
             self.logger.error(f"Failed to update OBS sources: {str(e)}")
+            log_event("sync", OUTCOME_FAILED, room=self.settings.room.room_name, error=str(e))
             if hasattr(traceback, 'format_exc'):
                 self.logger.error(traceback.format_exc())
+        return False
     
     def update_obs_sources_manual(self):
         """Manually update OBS sources and host label"""
         try:
-            # Generate links first
-            self.generate_links()
+            with self.profiler.profile("update_obs"), self.memory_profiler.track("update_obs"):
+                connected = self.obs_manager and self.obs_manager.is_connected()
+                # Sync here rather than on the bus, so the dialog can say how it went
+                links = self.generate_links(obs_synced=bool(connected))
+                if links is None:
+                    return  # generate_links() has shown the error
+                updated = connected and self.update_obs_sources(links)
             
-            if self.obs_manager and self.obs_manager.is_connected():
-                # Get host name
-                host_name = ""
-                if hasattr(self, 'host_entry'):
-                    host_name = self.host_entry['name'].get().strip()
-                
-                # Update host label in OBS
-                if host_name:
-                    self.obs_manager.update_text_source("p0name", host_name)
-                
+            if updated:
                 messagebox.showinfo("Success", "OBS sources and labels updated!")
+            elif connected:
+                messagebox.showerror("Error", "Some OBS sources were not updated. See the debug log for details.")
             else:
                 messagebox.showwarning("Warning", "OBS is not connected. Please check connection settings.")
         except Exception as e:
@@ -722,19 +968,23 @@ class App:
     def copy_all_links(self, html=False):
         """Copy all links to clipboard"""
         try:
-            links = self.generate_links()
+            with self.profiler.profile("copy_all"), self.memory_profiler.track("copy_all"):
+                links = self.generate_links()
+                
+                if html:
+                    html_links = "\n".join(f'<a href="{url}">{name}</a>' for name, url in links.items())
+                    self.root.clipboard_clear()
+                    self.root.clipboard_append(html_links)
+                    self.root.update()
+                else:
+                    plain_links = "\n".join(f"{name}: {url}" for name, url in links.items())
+                    self.root.clipboard_clear()
+                    self.root.clipboard_append(plain_links)
+                    self.root.update()
             
             if html:
-                html_links = "\n".join(f'<a href="{url}">{name}</a>' for name, url in links.items())
-                self.root.clipboard_clear()
-                self.root.clipboard_append(html_links)
-                self.root.update()
                 messagebox.showinfo("Success", "All links copied to clipboard as HTML!")
             else:
-                plain_links = "\n".join(f"{name}: {url}" for name, url in links.items())
-                self.root.clipboard_clear()
-                self.root.clipboard_append(plain_links)
-                self.root.update()
                 messagebox.showinfo("Success", "All links copied to clipboard!")
             
         except Exception as e:
@@ -840,9 +1090,9 @@ class App:
         """Write a debug message to the log"""
         self.logger.info(message)
         self.update_debug_info()
-
-    def get_debug_info(self):
-        """Get debug info"""
+    
+    def get_debug_header(self) -> List[str]:
+        """Get the status lines shown above the debug log"""
         # Check actual OBS connection state
         obs_connected = False
         if hasattr(self, 'obs_manager') and self.obs_manager is not None:
@@ -857,24 +1107,84 @@ class App:
             f"OBS Connected: {obs_connected}",
             f"OBS Host: {self.settings.obs.host}",
             f"OBS Port: {self.settings.obs.port}",
-            "=== Debug Log ===",
         ]
         
-        # Get log content
-        try:
-            with open(self.debug_log_path, 'r') as f:
-                log_content = f.read()
-        except Exception as e:
-            log_content = f"Error reading debug log: {str(e)}"
-        
-        return "\n".join(header_info + [log_content])
+        # Request outcome counters
+        if hasattr(self, 'obs_manager') and self.obs_manager is not None:
+            metrics = self.obs_manager.metrics
+            header_info.append(
+                f"OBS Requests: {metrics['requests']} (failures: {metrics['failures']}, "
+                f"timeouts: {metrics['timeouts']}, connect timeouts: {metrics['connect_timeouts']})"
+            )
+            header_info.extend(self.obs_manager.get_stats_summary())
+            header_info.extend(self.obs_manager.scheduler.describe())
+        if hasattr(self, 'layout_manager'):
+            header_info.append(self.layout_manager.describe_savings(len(self.player_entries) + 1))
+        if getattr(self, 'source_lifecycle', None):
+            header_info.append(self.source_lifecycle.describe())
+        if getattr(self, 'reconciler', None):
+            header_info.extend(self.reconciler.describe())
+        if getattr(self, 'preset_manager', None):
+            header_info.append(self.preset_manager.describe())
+        if getattr(self, 'session_scheduler', None):
+            header_info.append(self.session_scheduler.describe())
+        if getattr(self, 'room_manager', None):
+            header_info.extend(self.room_manager.describe())
+        if getattr(self, 'push_server', None):
+            header_info.append(self.push_server.describe())
+        if getattr(self, 'profiler', None) and self.profiler.enabled:
+            header_info.append(self.profiler.describe())
+        if getattr(self, 'memory_profiler', None) and self.memory_profiler.enabled:
+            header_info.append(self.memory_profiler.describe())
+        if getattr(self, 'ui_watchdog', None):
+            header_info.append(self.ui_watchdog.describe())
+        if getattr(self, 'events', None):
+            header_info.extend(self.events.describe())
+        header_info.append(STARTUP.describe())
+        header_info.append("=== Debug Log ===")
+        return header_info
+
+    def get_debug_info(self):
+        """Get debug info"""
+        # Only the tail of the log is kept in memory
+        self.append_debug_lines(self.debug_tail.read_new())
+        return "\n".join(self.get_debug_header() + list(self.debug_tail.lines))
 
     def update_debug_info(self):
         """Update debug info display"""
-        if hasattr(self, 'debug_text'):
-            self.debug_text.delete('1.0', tk.END)
-            self.debug_text.insert(tk.END, self.get_debug_info())
-            
+        if not hasattr(self, 'debug_text'):
+            return
+        # Replace the header, then append only the log lines written since the last update
+        header = self.get_debug_header()
+        self.debug_text.delete('1.0', 'log_start')
+        self.debug_text.insert('1.0', "\n".join(header) + "\n")
+        self.debug_text.mark_set('log_start', f'{len(header) + 1}.0')
+        self.append_debug_lines(self.debug_tail.read_new())
+    
+    def append_debug_lines(self, lines: List[str]):
+        """Append log lines to the debug panel, dropping the oldest past the line cap"""
+        if not lines or not hasattr(self, 'debug_text'):
+            return
+        at_end = self.debug_text.yview()[1] >= 1.0
+        self.debug_text.insert(tk.END, "".join(line + "\n" for line in lines))
+        
+        # Lines before log_start belong to the header
+        header_lines = int(self.debug_text.index('log_start').split('.')[0]) - 1
+        log_lines = int(self.debug_text.index('end-1c').split('.')[0]) - 1 - header_lines
+        excess = log_lines - self.debug_tail.lines.maxlen
+        if excess > 0:
+            self.debug_text.delete('log_start', f'log_start + {excess} lines')
+        if at_end:
+            self.debug_text.see(tk.END)
+    
+    def poll_debug_log(self):
+        """Pick up new log lines every second"""
+        try:
+            self.append_debug_lines(self.debug_tail.read_new())
+        except Exception as e:
+            self.logger.error(f"Failed to read debug log: {str(e)}")
+        self.root.after(1000, self.poll_debug_log)
+    
     def copy_debug_info(self):
         """Copy debug info to clipboard"""
         debug_info = self.get_debug_info()
@@ -888,6 +1198,8 @@ class App:
         try:
             with open(self.debug_log_path, 'w') as f:
                 f.write("")
+            self.debug_tail.reset()
+            self.debug_text.delete('log_start', tk.END)
             self.logger.info("Debug log cleared")
             self.update_debug_info()
             messagebox.showinfo("Success", "Debug log cleared!")
@@ -895,10 +1207,27 @@ class App:
             self.logger.error(f"Failed to clear debug log: {str(e)}")
             messagebox.showerror("Error", f"Failed to clear debug log: {str(e)}")
     
-    def run(self):
-        """Start the application"""
+    def run(self, startup_report: bool = False):
+        """Start the application; with startup_report, print startup timings and exit once services start"""
+        # Paint the window before OBS and the servers are created, so it shows at once
+        self.root.update()
+        STARTUP.mark("first paint")
+        self.root.after(0, self.start_services)
+        if startup_report:
+            self.root.after(0, self.print_startup_report)
         self.root.mainloop()
+    
+    def print_startup_report(self):
+        """Print each startup phase's time since launch as JSON, then close the window"""
+        print(json.dumps({phase: round(elapsed, 4) for phase, elapsed in STARTUP.marks.items()}))
+        sys.stdout.flush()
+        self.root.destroy()
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="VDO.Ninja Link Manager")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="Print startup phase timings as JSON once the window is up, then exit")
+    args = parser.parse_args()
     app = App()
-    app.run()
+    app.run(startup_report=args.startup_report)
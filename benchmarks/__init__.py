@@ -0,0 +1 @@
+"""Headless benchmarks for vidLinker; run modules with `python -m benchmarks.<name>`"""
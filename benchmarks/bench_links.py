@@ -0,0 +1,54 @@
+"""Link generation cost at roster sizes from 1 to 10k players
+    
+    python -m benchmarks.bench_links [--sizes 1 10 100 1000 10000]
+"""
+import argparse
+from typing import Dict
+
+from url_manager import URLManager
+from vdo_ninja_manager import VDONinjaManager
+from benchmarks.timing import best_time
+
+SIZES = [1, 10, 100, 1000, 10000]
+
+def roster(size: int) -> Dict[str, str]:
+    """username -> character for `size` players"""
+    return {f"player{index:05d}": f"Character {index}" for index in range(size)}
+
+def run(size: int, quick: bool = False) -> Dict[str, float]:
+    """Seconds to build every player's URL with URLManager, and to generate a room's links"""
+    players = roster(size)
+    vdo_ninja = VDONinjaManager()
+    params = [{"room": "bench_room", "push": username, "label": character, "quality": "1080p",
+               "meshcast": "1", "cleanoutput": None} for username, character in players.items()]
+    repeat = 3 if quick else 5
+    min_time = 0.05 if quick else 0.2
+    return {
+        "build_url_s": best_time(lambda: [URLManager.build_url(entry) for entry in params], repeat, min_time),
+        "generate_room_links_s": best_time(
+            lambda: vdo_ninja.generate_room_links("bench_room", "secret", host_username="host",
+                                                  host_character="Director", players=players), repeat, min_time)
+    }
+
+def suite(quick: bool = False) -> Dict[str, float]:
+    """Results for the benchmark suite, keyed by name"""
+    results = {}
+    for size in SIZES[:4] if quick else SIZES:
+        for name, seconds in run(size, quick).items():
+            results[f"links.{name[:-2]}[{size}]"] = seconds
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="Roster sizes")
+    args = parser.parse_args()
+    
+    print(f"{'players':>8} {'build_url':>12} {'per player':>11} {'room links':>12} {'per player':>11}")
+    for size in args.sizes:
+        result = run(size)
+        print(f"{size:>8} {result['build_url_s'] * 1000:>10.3f}ms {result['build_url_s'] / size * 1e6:>9.2f}us "
+              f"{result['generate_room_links_s'] * 1000:>10.3f}ms "
+              f"{result['generate_room_links_s'] / size * 1e6:>9.2f}us")
+
+if __name__ == "__main__":
+    main()
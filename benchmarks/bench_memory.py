@@ -0,0 +1,209 @@
+"""Memory per player as rosters grow from 10 to 100k, and where a large room's memory goes
+    
+    python -m benchmarks.bench_memory [--sizes 10 100 1000 10000 100000] [--obs-max 1000] [--top 10] [--out memory.json]
+
+For each roster size, tracemalloc measures what each structure keeps
+allocated: parsed Player objects, OBSSource entries, generated links, the
+HTTP API's links cache, the OBS manager's state after a sync against the
+stand-in server, and (with a display) the Tk widgets and entry dicts of the
+player list. Only Python allocations are traced; for widgets the process
+RSS growth is shown too, since Tk keeps most of its memory in Tcl. Then the
+largest roster is run through load room, generate links and OBS sync with
+MemoryProfiler to list the top allocation sites of each step.
+"""
+import argparse
+import json
+import logging
+import os
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+from api_server import RoomService
+from memory_profiler import MemoryProfiler, measure
+from obs_manager import OBSManager
+from obs_standin import StandInOBSServer
+from player_manager import PlayerManager
+from settings import RoomSettings
+from vdo_ninja_manager import VDONinjaManager
+from benchmarks.bench_parsing import player_info
+
+SIZES = [10, 100, 1000, 10000, 100000]
+
+def rss() -> Optional[int]:
+    """Resident set size in bytes, where /proc is available"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+def room_data(size: int) -> Dict[str, Any]:
+    """A saved room (new format) with `size` players"""
+    return {"room": "bench_room", "password": "secret", "host_username": "host", "host_character": "Director",
+            "players": {f"player{index:05d}": f"Character {index}" for index in range(size)}}
+
+def load_room(data: Dict[str, Any]) -> RoomSettings:
+    """RoomSettings loaded from a saved room dict"""
+    room = RoomSettings()
+    room.from_dict(data)
+    return room
+
+def obs_state(server: StandInOBSServer, links: Dict[str, str]) -> int:
+    """Bytes an OBSManager keeps after syncing `links` once"""
+    manager = OBSManager()
+    manager.connect(host="127.0.0.1", port=server.port)
+    try:
+        _, retained, _ = measure(lambda: manager.update_sources(links))
+        return retained
+    finally:
+        manager.disconnect()
+
+def widgets(size: int) -> Optional[Dict[str, int]]:
+    """Python and RSS bytes for `size` player rows built the way App.add_player builds them, or None without a display"""
+    try:
+        import tkinter as tk
+        from tkinter import ttk
+        root = tk.Tk()
+    except Exception:
+        return None
+    root.withdraw()
+    rss_before = rss()
+    
+    def build() -> List[Dict[str, Any]]:
+        entries = []
+        for index in range(size):
+            frame = ttk.Frame(root)
+            ttk.Label(frame, text=f"Player {index + 1}:", width=8).pack(side="left", padx=2)
+            ttk.Label(frame, text="Name:", width=6).pack(side="left", padx=2)
+            name_entry = ttk.Entry(frame, width=20)
+            name_entry.pack(side="left", padx=2)
+            ttk.Label(frame, text="Character:", width=10).pack(side="left", padx=2)
+            char_entry = ttk.Entry(frame, width=20)
+            char_entry.pack(side="left", padx=2)
+            ttk.Button(ttk.Frame(frame), text="Delete").pack(side="left", padx=2)
+            entries.append({'frame': frame, 'name': name_entry, 'character': char_entry})
+        root.update_idletasks()
+        return entries
+    
+    entries, retained, _ = measure(build)
+    rss_after = rss()
+    result = {"python": retained, "rss": (rss_after - rss_before) if rss_before and rss_after else 0}
+    del entries
+    root.destroy()
+    return result
+
+def run(size: int, server: Optional[StandInOBSServer] = None) -> Dict[str, float]:
+    """Bytes per player each structure keeps for a roster of `size`"""
+    blob = player_info(size)
+    data = room_data(size)
+    results: Dict[str, float] = {}
+    
+    players, retained, _ = measure(lambda: PlayerManager().parse_player_info(blob))
+    results["player"] = retained / size
+    
+    links, retained, _ = measure(lambda: VDONinjaManager().generate_room_links(
+        "bench_room", "secret", host_username="host", host_character="Director", players=data["players"]))
+    results["links"] = retained / size
+    
+    for player in players:
+        player.solo_link = links.get(player.username, "")
+    manager = PlayerManager()
+    _, retained, _ = measure(lambda: manager.update_player_links(players))
+    results["obs_source"] = retained / size
+    
+    service = RoomService(VDONinjaManager())
+    service.create(data)
+    _, retained, _ = measure(lambda: service.links("bench_room"))
+    results["links_cache"] = retained / size
+    
+    room, retained, _ = measure(lambda: load_room(data))
+    results["room_settings"] = retained / size
+    
+    if server is not None:
+        results["obs_state"] = obs_state(server, links) / size
+    
+    widget_bytes = widgets(size) if size <= 1000 else None
+    if widget_bytes is not None:
+        results["widget_python"] = widget_bytes["python"] / size
+        results["widget_rss"] = widget_bytes["rss"] / size
+    return results
+
+def allocation_sites(size: int, server: Optional[StandInOBSServer], top: int) -> Dict[str, List[str]]:
+    """Top allocation sites of loading, generating links for and syncing a room of `size` players"""
+    profiler = MemoryProfiler(top=top)
+    data = room_data(size)
+    sites = {}
+    
+    with profiler.track("load_room"):
+        room = load_room(data)
+        players = PlayerManager().parse_player_info(room.player_info)
+    sites["load_room"] = [profiler.last_summary] + profiler.last_sites
+    
+    with profiler.track("generate"):
+        links = VDONinjaManager().generate_room_links(room.room_name, room.room_password,
+                                                      host_username="host", host_character="Director",
+                                                      players=room.players)
+    sites["generate"] = [profiler.last_summary] + profiler.last_sites
+    
+    if server is not None:
+        manager = OBSManager()
+        manager.connect(host="127.0.0.1", port=server.port)
+        try:
+            with profiler.track("obs_sync"):
+                manager.update_sources(links)
+            sites["obs_sync"] = [profiler.last_summary] + profiler.last_sites
+        finally:
+            manager.disconnect()
+    del players
+    return sites
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="Roster sizes")
+    parser.add_argument("--obs-max", type=int, default=1000,
+                        help="Largest roster to sync to the stand-in server (two requests per player)")
+    parser.add_argument("--top", type=int, default=10, help="Allocation sites listed per step")
+    parser.add_argument("--frames", type=int, default=1, help="Traceback frames stored per allocation")
+    parser.add_argument("--out", help="Write the results to this JSON file")
+    args = parser.parse_args()
+    
+    logging.getLogger("obs_manager").setLevel(logging.WARNING)
+    logging.getLogger("api_server").setLevel(logging.WARNING)
+    
+    server = StandInOBSServer()
+    for slot in range(min(max(args.sizes), args.obs_max) + 1):
+        server.add_input(f"p{slot}vdosolo", "browser_source", scene="VDO Assets")
+        server.add_input(f"p{slot}name", "text_gdiplus_v2", scene="VDO Assets")
+    server.start()
+    tracemalloc.start(args.frames)
+    report: Dict[str, Any] = {"sizes": {}, "sites": {}}
+    try:
+        columns = ["player", "obs_source", "links", "links_cache", "room_settings", "obs_state",
+                   "widget_python", "widget_rss"]
+        print("Bytes kept per player")
+        print(f"{'players':>8} " + " ".join(f"{column:>13}" for column in columns))
+        for size in args.sizes:
+            result = run(size, server if size <= args.obs_max else None)
+            report["sizes"][size] = result
+            cells = [f"{result[column]:>13.0f}" if column in result else f"{'-':>13}" for column in columns]
+            print(f"{size:>8} " + " ".join(cells))
+        
+        largest = max(args.sizes)
+        print(f"\nTop allocation sites for {largest} players")
+        report["sites"] = allocation_sites(largest, server if largest <= args.obs_max else None, args.top)
+        for lines in report["sites"].values():
+            print("\n".join(lines))
+            print()
+        current, peak = tracemalloc.get_traced_memory()
+        print(f"Traced now {current / 1024 / 1024:.1f} MiB, peak {peak / 1024 / 1024:.1f} MiB, "
+              f"RSS {(rss() or 0) / 1024 / 1024:.1f} MiB")
+    finally:
+        tracemalloc.stop()
+        server.stop()
+    
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
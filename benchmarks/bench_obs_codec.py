@@ -0,0 +1,92 @@
+"""Encode/decode cost and wire size of a full OBS sync in JSON and MessagePack
+    
+    python -m benchmarks.bench_obs_codec [--slots 32] [--repeat 2000]
+"""
+import argparse
+import hashlib
+import timeit
+from typing import Any, Dict, List
+
+from obs_codec import JSONCodec, MsgpackCodec, msgpack
+
+def solo_link(room: str, slot: int) -> str:
+    """A VDO.Ninja solo link of realistic length"""
+    push_id = hashlib.md5(f"{room}_player{slot}".encode()).hexdigest()[:8]
+    return (f"https://vdo.ninja/?view={push_id}&solo&room={room}&effects&password=correct-horse-battery"
+            f"&label=Player{slot}%2FCharacter{slot}&quality=1080p&meshcast=1&cleanoutput&noaudio=0")
+
+def sync_requests(slots: int) -> List[Dict[str, Any]]:
+    """Request entries for a full sync: browser and name source for the host and every player"""
+    entries = []
+    for slot in range(slots + 1):
+        entries.append({
+            "requestType": "SetInputSettings",
+            "requestData": {
+                "inputName": f"p{slot}vdosolo",
+                "inputSettings": {"url": solo_link("vidlinker_tournament_table_07", slot),
+                                  "width": 1920, "height": 1080, "fps": 30, "reroute_audio": True}
+            }
+        })
+        entries.append({
+            "requestType": "SetInputSettings",
+            "requestData": {"inputName": f"p{slot}name", "inputSettings": {"text": f"player{slot}/Character {slot}"}}
+        })
+    return entries
+
+def batch_message(entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Wrap the entries in one RequestBatch (op 8) message"""
+    return {
+        "op": 8,
+        "d": {
+            "requestId": "batch-1",
+            "haltOnFailure": False,
+            "executionType": 0,
+            "requests": [dict(entry, requestId=str(i)) for i, entry in enumerate(entries)]
+        }
+    }
+
+def single_messages(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Send each entry as its own Request (op 6) message, as the pipeline does"""
+    return [{"op": 6, "d": dict(entry, requestId=str(i))} for i, entry in enumerate(entries)]
+
+def measure(codec, messages: List[Dict[str, Any]], repeat: int) -> Dict[str, float]:
+    """Wire bytes plus per-sync encode and decode time for a list of messages"""
+    encoded = [codec.encode(message) for message in messages]
+    encode_s = timeit.timeit(lambda: [codec.encode(message) for message in messages], number=repeat) / repeat
+    decode_s = timeit.timeit(lambda: [codec.decode(data) for data in encoded], number=repeat) / repeat
+    return {
+        "bytes": sum(len(data) for data in encoded),
+        "encode_us": encode_s * 1e6,
+        "decode_us": decode_s * 1e6,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slots", type=int, default=32, help="Player slots in the full sync")
+    parser.add_argument("--repeat", type=int, default=2000, help="Iterations per timing")
+    args = parser.parse_args()
+    
+    codecs = [JSONCodec()]
+    if msgpack is not None:
+        codecs.append(MsgpackCodec())
+    else:
+        print("msgpack is not installed; only JSON is measured")
+    
+    entries = sync_requests(args.slots)
+    shapes = {
+        "RequestBatch": [batch_message(entries)],
+        "pipelined": single_messages(entries),
+    }
+    
+    print(f"{args.slots}-slot full sync ({len(entries)} requests)")
+    print(f"{'shape':<13} {'codec':<8} {'bytes':>8} {'vs json':>8} {'encode':>10} {'decode':>10}")
+    for shape, messages in shapes.items():
+        json_bytes = None
+        for codec in codecs:
+            result = measure(codec, messages, args.repeat)
+            json_bytes = json_bytes or result["bytes"]
+            print(f"{shape:<13} {codec.name:<8} {result['bytes']:>8} {result['bytes'] / json_bytes:>7.0%} "
+                  f"{result['encode_us']:>8.1f}us {result['decode_us']:>8.1f}us")
+
+if __name__ == "__main__":
+    main()
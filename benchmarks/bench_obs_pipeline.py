@@ -0,0 +1,84 @@
+"""Compare sequential OBS requests with the pipelined sender at several round-trip times
+
+    python -m benchmarks.bench_obs_pipeline [--slots 16] [--window 8] [--rtt 1 20 100]
+"""
+import argparse
+import logging
+import time
+from typing import Dict, List
+
+from obswebsocket import requests
+
+from obs_manager import OBSManager
+from obs_standin import StandInOBSServer
+
+
+def build_requests(slots: int) -> List:
+    """Browser and name source updates for a full sync of `slots` players plus the host"""
+    obs_requests = []
+    for slot in range(slots + 1):
+        obs_requests.append(requests.SetInputSettings(
+            inputName=f"p{slot}vdosolo",
+            inputSettings={"url": f"https://vdo.ninja/?view=p{slot}&solo&room=bench"}
+        ))
+        obs_requests.append(requests.SetInputSettings(
+            inputName=f"p{slot}name",
+            inputSettings={"text": f"Player {slot}"}
+        ))
+    return obs_requests
+
+
+def run(rtt_ms: float, slots: int, window: int) -> Dict[str, float]:
+    """Time one full sync sequentially and pipelined against a stand-in server"""
+    server = StandInOBSServer(rtt=rtt_ms / 1000.0)
+    for slot in range(slots + 1):
+        server.inputs[f"p{slot}vdosolo"] = {"inputKind": "browser_source", "inputSettings": {}}
+        server.inputs[f"p{slot}name"] = {"inputKind": "text_gdiplus_v2", "inputSettings": {}}
+    port = server.start()
+    manager = OBSManager(pipeline_window=window)
+    try:
+        manager.connect(host="127.0.0.1", port=port)
+        
+        # Sequential: one blocking call per request, as before pipelining
+        start = time.perf_counter()
+        for request in build_requests(slots):
+            manager.ws.call(request)
+        sequential = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        results = manager.call_pipelined(build_requests(slots))
+        pipelined = time.perf_counter() - start
+        failed = sum(1 for result in results if not result.ok)
+    finally:
+        manager.disconnect()
+        server.stop()
+    
+    return {
+        "rtt_ms": rtt_ms,
+        "requests": len(results),
+        "sequential_s": sequential,
+        "pipelined_s": pipelined,
+        "speedup": sequential / pipelined if pipelined else 0.0,
+        "failed": failed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slots", type=int, default=16, help="Player slots in the simulated sync")
+    parser.add_argument("--window", type=int, default=8, help="Requests kept in flight")
+    parser.add_argument("--rtt", type=float, nargs="+", default=[1, 20, 100], help="Round-trip times in ms")
+    args = parser.parse_args()
+    
+    logging.getLogger("obs_manager").setLevel(logging.WARNING)
+    
+    print(f"{'RTT':>8} {'requests':>9} {'sequential':>12} {'pipelined':>12} {'speedup':>8} {'failed':>7}")
+    for rtt_ms in args.rtt:
+        result = run(rtt_ms, args.slots, args.window)
+        print(f"{result['rtt_ms']:>6.0f}ms {result['requests']:>9} "
+              f"{result['sequential_s'] * 1000:>10.1f}ms {result['pipelined_s'] * 1000:>10.1f}ms "
+              f"{result['speedup']:>7.1f}x {result['failed']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Measure name-label rename latency while a large source sync is running
+    
+    python -m benchmarks.bench_obs_scheduler [--slots 100] [--renames 10] [--rtt 20]
+"""
+import argparse
+import logging
+import threading
+import time
+from typing import Dict, List
+
+from obswebsocket import requests
+
+from obs_manager import OBSManager
+from obs_scheduler import LANE_BULK, LANE_INTERACTIVE
+from obs_standin import StandInOBSServer
+from benchmarks.bench_obs_pipeline import build_requests
+
+def percentile(values: List[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+def run(rename_lane: str, rtt_ms: float, slots: int, renames: int) -> Dict[str, float]:
+    """Rename labels in `rename_lane` while a full sync runs in the bulk lane"""
+    server = StandInOBSServer(rtt=rtt_ms / 1000.0)
+    for slot in range(slots + 1):
+        server.inputs[f"p{slot}vdosolo"] = {"inputKind": "browser_source", "inputSettings": {}}
+        server.inputs[f"p{slot}name"] = {"inputKind": "text_gdiplus_v2", "inputSettings": {}}
+    port = server.start()
+    manager = OBSManager()
+    latencies = []
+    try:
+        manager.connect(host="127.0.0.1", port=port)
+        sync = threading.Thread(target=manager.call_pipelined, args=(build_requests(slots),))
+        start = time.perf_counter()
+        sync.start()
+        
+        # Renames arrive spread over the first part of the sync
+        for index in range(renames):
+            time.sleep(rtt_ms / 1000.0)
+            sent = time.perf_counter()
+            manager._call(requests.SetInputSettings(inputName=f"p{index}name", inputSettings={"text": "Renamed"}),
+                          lane=rename_lane)
+            latencies.append(time.perf_counter() - sent)
+        sync.join()
+        sync_time = time.perf_counter() - start
+        lane_stats = manager.scheduler.lane_stats()
+    finally:
+        manager.disconnect()
+        server.stop()
+    
+    return {
+        "rename_p50_ms": percentile(latencies, 0.5) * 1000,
+        "rename_max_ms": max(latencies) * 1000,
+        "rename_queue_p95_ms": lane_stats[rename_lane]["p95"] * 1000,
+        "bulk_queue_p95_ms": lane_stats[LANE_BULK]["p95"] * 1000,
+        "sync_s": sync_time,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slots", type=int, default=100, help="Player slots in the background sync")
+    parser.add_argument("--renames", type=int, default=10, help="Label renames issued during the sync")
+    parser.add_argument("--rtt", type=float, default=20, help="Round-trip time in ms")
+    args = parser.parse_args()
+    
+    logging.getLogger("obs_manager").setLevel(logging.WARNING)
+    
+    print(f"{'renames in':<12} {'rename p50':>11} {'rename max':>11} {'queued p95':>11} "
+          f"{'bulk queued p95':>16} {'sync':>8}")
+    for lane in (LANE_BULK, LANE_INTERACTIVE):
+        result = run(lane, args.rtt, args.slots, args.renames)
+        print(f"{lane:<12} {result['rename_p50_ms']:>9.1f}ms {result['rename_max_ms']:>9.1f}ms "
+              f"{result['rename_queue_p95_ms']:>9.1f}ms {result['bulk_queue_p95_ms']:>14.1f}ms "
+              f"{result['sync_s']:>7.2f}s")
+
+if __name__ == "__main__":
+    main()
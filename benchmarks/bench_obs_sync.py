@@ -0,0 +1,67 @@
+"""OBSManager.update_sources against a local stand-in server with simulated round-trip time
+    
+    python -m benchmarks.bench_obs_sync [--slots 16] [--rtt 0 5 20] [--syncs 20]
+"""
+import argparse
+import logging
+import statistics
+import time
+from typing import Dict, List
+
+from obs_manager import OBSManager
+from obs_standin import StandInOBSServer
+
+RTTS = [0, 5, 20]
+
+def links(slots: int, variant: int) -> Dict[str, str]:
+    """Host plus `slots` player links; variants differ so every sync changes every source"""
+    result = {"host": f"https://vdo.ninja/?room=bench&director=1&v={variant}"}
+    for slot in range(1, slots + 1):
+        result[f"player{slot}"] = f"https://vdo.ninja/?room=bench&view=p{slot}&solo&v={variant}"
+    return result
+
+def run(rtt_ms: float, slots: int, syncs: int) -> Dict[str, float]:
+    """Median and worst time of a full update_sources against a server `rtt_ms` away"""
+    server = StandInOBSServer(rtt=rtt_ms / 1000.0)
+    for slot in range(slots + 1):
+        server.add_input(f"p{slot}vdosolo", "browser_source", scene="VDO Assets")
+        server.add_input(f"p{slot}name", "text_gdiplus_v2", scene="VDO Assets")
+    port = server.start()
+    manager = OBSManager()
+    times: List[float] = []
+    try:
+        manager.connect(host="127.0.0.1", port=port)
+        manager.update_sources(links(slots, 0))  # Warm-up: creates the scene and caches
+        for index in range(syncs):
+            started = time.perf_counter()
+            manager.update_sources(links(slots, index + 1))
+            times.append(time.perf_counter() - started)
+    finally:
+        manager.disconnect()
+        server.stop()
+    return {"median_s": statistics.median(times), "max_s": max(times), "requests": float(server.request_count)}
+
+def suite(quick: bool = False) -> Dict[str, float]:
+    """Results for the benchmark suite, keyed by name"""
+    results = {}
+    for rtt_ms in RTTS:
+        result = run(rtt_ms, 16, 5 if quick else 20)
+        results[f"obs_sync.update_sources[16 slots, {rtt_ms}ms]"] = result["median_s"]
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slots", type=int, default=16, help="Player slots in each sync")
+    parser.add_argument("--rtt", type=float, nargs="+", default=RTTS, help="Round-trip times in ms")
+    parser.add_argument("--syncs", type=int, default=20, help="Timed syncs per RTT")
+    args = parser.parse_args()
+    
+    logging.getLogger("obs_manager").setLevel(logging.WARNING)
+    
+    print(f"{'RTT':>8} {'median':>10} {'max':>10}")
+    for rtt_ms in args.rtt:
+        result = run(rtt_ms, args.slots, args.syncs)
+        print(f"{rtt_ms:>6.0f}ms {result['median_s'] * 1000:>8.1f}ms {result['max_s'] * 1000:>8.1f}ms")
+
+if __name__ == "__main__":
+    main()
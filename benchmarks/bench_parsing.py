@@ -0,0 +1,58 @@
+"""Roster parsing cost: PlayerManager.parse_player_info and RoomSettings.from_dict on large blobs
+    
+    python -m benchmarks.bench_parsing [--players 100 10000]
+"""
+import argparse
+from typing import Dict
+
+from player_manager import PlayerManager
+from settings import RoomSettings
+from benchmarks.timing import best_time
+
+SIZES = [100, 10000]
+
+def player_info(size: int) -> str:
+    """A "username,character" blob as the roster text box holds it, with a few blank and invalid lines"""
+    lines = []
+    for index in range(size):
+        lines.append(f"player{index:05d}, Character {index}")
+        if index % 100 == 0:
+            lines.extend(["", "not a player line"])
+    return "\n".join(lines)
+
+def run(size: int, quick: bool = False) -> Dict[str, float]:
+    """Seconds to parse a roster of `size` players each way"""
+    blob = player_info(size)
+    old_format = {"room_name": "bench_room", "room_password": "secret", "player_info": blob}
+    new_format = {"room": "bench_room", "password": "secret",
+                  "players": {f"player{index:05d}": f"Character {index}" for index in range(size)}}
+    manager = PlayerManager()
+    repeat = 3 if quick else 5
+    min_time = 0.05 if quick else 0.2
+    return {
+        "parse_player_info_s": best_time(lambda: manager.parse_player_info(blob), repeat, min_time),
+        "from_dict_old_s": best_time(lambda: RoomSettings().from_dict(old_format), repeat, min_time),
+        "from_dict_new_s": best_time(lambda: RoomSettings().from_dict(new_format), repeat, min_time)
+    }
+
+def suite(quick: bool = False) -> Dict[str, float]:
+    """Results for the benchmark suite, keyed by name"""
+    results = {}
+    for size in SIZES:
+        for name, seconds in run(size, quick).items():
+            results[f"parsing.{name[:-2]}[{size}]"] = seconds
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, nargs="+", default=SIZES, help="Roster sizes")
+    args = parser.parse_args()
+    
+    print(f"{'players':>8} {'parse_player_info':>18} {'from_dict (old)':>16} {'from_dict (new)':>16}")
+    for size in args.players:
+        result = run(size)
+        print(f"{size:>8} {result['parse_player_info_s'] * 1000:>16.3f}ms {result['from_dict_old_s'] * 1000:>14.3f}ms "
+              f"{result['from_dict_new_s'] * 1000:>14.3f}ms")
+
+if __name__ == "__main__":
+    main()
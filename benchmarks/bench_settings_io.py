@@ -0,0 +1,54 @@
+"""Settings.save / Settings.load round trips, with an empty and a large room
+    
+    python -m benchmarks.bench_settings_io [--players 0 1000]
+"""
+import argparse
+import os
+import tempfile
+from typing import Dict
+
+from settings import Settings
+from benchmarks.timing import best_time
+
+SIZES = [0, 1000]
+
+def run(players: int, quick: bool = False) -> Dict[str, float]:
+    """Seconds to save and to load settings whose room has `players` players"""
+    settings = Settings()
+    settings.room.room_name = "bench_room"
+    settings.room.players = {f"player{index:05d}": f"Character {index}" for index in range(players)}
+    settings.room.player_info = "\n".join(f"{user},{character}" for user, character in settings.room.players.items())
+    
+    repeat = 3 if quick else 5
+    min_time = 0.05 if quick else 0.2
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "settings.json")
+        settings.save(path)
+        return {
+            "save_s": best_time(lambda: settings.save(path), repeat, min_time),
+            "load_s": best_time(lambda: Settings().load(path), repeat, min_time),
+            "bytes": float(os.path.getsize(path))
+        }
+
+def suite(quick: bool = False) -> Dict[str, float]:
+    """Results for the benchmark suite, keyed by name"""
+    results = {}
+    for size in SIZES:
+        result = run(size, quick)
+        results[f"settings.save[{size}]"] = result["save_s"]
+        results[f"settings.load[{size}]"] = result["load_s"]
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, nargs="+", default=SIZES, help="Players in the saved room")
+    args = parser.parse_args()
+    
+    print(f"{'players':>8} {'file':>10} {'save':>10} {'load':>10}")
+    for size in args.players:
+        result = run(size)
+        print(f"{size:>8} {result['bytes'] / 1024:>8.1f}KB {result['save_s'] * 1000:>8.3f}ms "
+              f"{result['load_s'] * 1000:>8.3f}ms")
+
+if __name__ == "__main__":
+    main()
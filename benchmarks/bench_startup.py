@@ -0,0 +1,79 @@
+"""Cold start cost: import time per module (as `python -X importtime` reports it) and time to first paint
+    
+    python -m benchmarks.bench_startup [--runs 5] [--top 15]
+
+Time to first paint starts the real window (`app.py --startup-report`) in a
+scratch directory, so it needs a display; without one only imports are measured.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def import_times(module: str = "app") -> List[Tuple[str, float, float]]:
+    """(module, self seconds, cumulative seconds) for everything importing `module` loads, in import order"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us) / 1e6, int(cumulative_us) / 1e6))
+    return rows
+
+def first_paint() -> Optional[Dict[str, float]]:
+    """Startup phase timings from one launch of the app, or None when it can't open a window"""
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            result = subprocess.run([sys.executable, os.path.join(ROOT, "app.py"), "--startup-report"],
+                                    cwd=directory, capture_output=True, text=True, timeout=60)
+        except subprocess.TimeoutExpired:
+            return None
+    lines = result.stdout.strip().splitlines()
+    if result.returncode != 0 or not lines:
+        return None
+    return json.loads(lines[-1])
+
+def run(runs: int = 5) -> Dict[str, float]:
+    """Best import time of app and, with a display, best time to each startup phase"""
+    results = {"import_app_s": min(import_times()[-1][2] for _ in range(runs))}
+    for _ in range(runs):
+        marks = first_paint()
+        if marks is None:
+            break
+        for phase, elapsed in marks.items():
+            key = phase.replace(" ", "_") + "_s"
+            results[key] = min(results.get(key, elapsed), elapsed)
+    return results
+
+def suite(quick: bool = False) -> Dict[str, float]:
+    """Results for the benchmark suite, keyed by name"""
+    return {f"startup.{name[:-2]}": seconds for name, seconds in run(2 if quick else 5).items()}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Launches to take the best of")
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules to list")
+    args = parser.parse_args()
+    
+    rows = import_times()
+    print(f"Slowest imports under app ({rows[-1][2] * 1000:.1f}ms in all):")
+    print(f"{'self':>10} {'cumulative':>12}  module")
+    for name, self_s, cumulative_s in sorted(rows, key=lambda row: row[1], reverse=True)[:args.top]:
+        print(f"{self_s * 1000:>8.1f}ms {cumulative_s * 1000:>10.1f}ms  {name}")
+    print()
+    
+    results = run(args.runs)
+    if len(results) == 1:
+        print("No display; time to first paint not measured")
+    for name, seconds in results.items():
+        print(f"{name[:-2]:<20} {seconds * 1000:>8.1f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Run every benchmark, save the results as JSON and flag regressions against a baseline
+    
+    python -m benchmarks.suite [--quick] [--out results.json]
+    python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json [--threshold 0.2]
+
+Results are seconds per operation (lower is better). With --baseline, any
+result more than --threshold slower than the baseline is reported as a
+regression and the exit status is 1. Baselines are only comparable on the
+same machine.
+"""
+import argparse
+import datetime
+import json
+import logging
+import platform
+import sys
+from typing import Any, Dict, List, Tuple
+
+from benchmarks import bench_links, bench_obs_sync, bench_parsing, bench_settings_io, bench_startup
+
+SUITES = {
+    "links": bench_links.suite,
+    "parsing": bench_parsing.suite,
+    "settings": bench_settings_io.suite,
+    "obs_sync": bench_obs_sync.suite,
+    "startup": bench_startup.suite,
+}
+
+def run_all(names: List[str], quick: bool = False) -> Dict[str, Any]:
+    """Run the named suites and return the results with details of the machine they ran on"""
+    results: Dict[str, float] = {}
+    for name in names:
+        print(f"Running {name}...", file=sys.stderr)
+        results.update(SUITES[name](quick))
+    return {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()} {platform.node()}",
+        "quick": quick,
+        "results": results
+    }
+
+def compare(results: Dict[str, float], baseline: Dict[str, float],
+            threshold: float) -> List[Tuple[str, float, float, float, str]]:
+    """(name, baseline, current, change, verdict) for every result that has a baseline"""
+    rows = []
+    for name, current in results.items():
+        before = baseline.get(name)
+        if before is None or before <= 0:
+            rows.append((name, 0.0, current, 0.0, "new"))
+            continue
+        change = current / before - 1
+        verdict = "REGRESSION" if change > threshold else "faster" if change < -threshold else "ok"
+        rows.append((name, before, current, change, verdict))
+    return rows
+
+def format_seconds(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f}s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds * 1e6:.2f}us"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", nargs="+", choices=list(SUITES), default=list(SUITES), help="Suites to run")
+    parser.add_argument("--quick", action="store_true", help="Fewer repetitions and sizes, for a fast check")
+    parser.add_argument("--out", help="Write the results to this JSON file")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Write the results as the new baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="Compare against this baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Slowdown that counts as a regression (0.2 = 20%%)")
+    args = parser.parse_args()
+    
+    logging.getLogger().setLevel(logging.WARNING)
+    report = run_all(args.only, args.quick)
+    for path in filter(None, (args.out, args.save_baseline)):
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved results to {path}", file=sys.stderr)
+    
+    if not args.baseline:
+        for name, seconds in report["results"].items():
+            print(f"{name:<52} {format_seconds(seconds):>10}")
+        return
+    
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("quick") != report["quick"]:
+        print("Warning: baseline and results differ in --quick; sizes and timings may not match", file=sys.stderr)
+    rows = compare(report["results"], baseline["results"], args.threshold)
+    print(f"{'benchmark':<52} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, before, current, change, verdict in rows:
+        before_text = format_seconds(before) if before else "-"
+        print(f"{name:<52} {before_text:>10} {format_seconds(current):>10} {change:>+7.0%}  {verdict}")
+    regressions = [row for row in rows if row[4] == "REGRESSION"]
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold:.0%} against {args.baseline}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+"""Shared timing helper for the benchmarks"""
+import timeit
+from typing import Callable
+
+def best_time(func: Callable[[], object], repeat: int = 5, min_time: float = 0.2) -> float:
+    """Seconds per call of `func`: the best of `repeat` runs of enough calls to take `min_time`"""
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9) * 1.1))
+    return min([elapsed] + timer.repeat(repeat - 1, number)) / number
@@ -0,0 +1,272 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Type
+import logging
+import threading
+import time
+
+# How a subscriber's handler is run
+DISPATCH_SYNC = "sync"  # Inline, in the publisher's thread
+DISPATCH_THREAD = "thread"  # On the bus's shared worker pool, in order per subscriber
+DISPATCH_ASYNCIO = "asyncio"  # On an asyncio event loop, in order per subscriber
+
+# What happens when a queued subscriber has `max_pending` events waiting
+POLICY_BLOCK = "block"  # The publisher waits for room
+POLICY_DROP_OLDEST = "drop_oldest"
+POLICY_DROP_NEWEST = "drop_newest"
+POLICY_LATEST = "latest"  # Only the newest event is kept; for consumers that only need the current state
+
+class Event:
+    """Base class of everything published on the bus"""
+
+@dataclass
+class RosterChanged(Event):
+    """The room name, password, host or player list was edited"""
+    room_name: str
+    players: Dict[str, str]  # username -> character
+    host_username: str = ""
+    host_character: str = ""
+
+@dataclass
+class LinksRegenerated(Event):
+    """VDO.Ninja links were generated for a roster"""
+    room_name: str
+    links: Dict[str, str]
+    obs_synced: bool = False  # The publisher pushes these links to OBS itself
+
+@dataclass
+class OBSStateChanged(Event):
+    """The OBS connection came up or went down"""
+    connected: bool
+    host: str = ""
+    port: int = 0
+    detail: str = ""
+
+@dataclass
+class SettingsApplied(Event):
+    """Settings were saved and should take effect"""
+    sections: Tuple[str, ...] = ()  # Empty when every section may have changed
+
+@dataclass
+class Subscription:
+    """One handler for one event type, with its queue and timings"""
+    name: str
+    event_type: Type[Event]
+    handler: Callable[[Event], Any]
+    dispatch: str = DISPATCH_SYNC
+    policy: str = POLICY_BLOCK
+    max_pending: int = 100
+    loop: Optional[Any] = None  # asyncio.AbstractEventLoop; only asyncio subscribers import asyncio
+    where: Optional[Callable[[Event], bool]] = None  # Only events this accepts are delivered
+    
+    pending: Deque[Tuple[float, Event]] = field(default_factory=deque)  # (published at, event)
+    draining: bool = False
+    delivered: int = 0
+    dropped: int = 0
+    failures: int = 0
+    handler_times: Deque[float] = field(default_factory=lambda: deque(maxlen=500))
+    queue_delays: Deque[float] = field(default_factory=lambda: deque(maxlen=500))
+
+class EventBus:
+    """In-process publish/subscribe between the UI, link generation, persistence and OBS.
+    
+    publish() hands an event to every subscriber of its type (or a base
+    type). Sync subscribers run before publish() returns; thread and
+    asyncio subscribers get a bounded queue drained in order, so a slow
+    consumer delays only itself. Handler time and queueing delay are kept
+    per subscriber, and publish time per event type, so the debug panel
+    shows which consumer slows an edit down.
+    """
+    
+    def __init__(self, workers: int = 4, history: int = 500):
+        self._subscriptions: List[Subscription] = []
+        self._lock = threading.Lock()
+        self._space = threading.Condition(self._lock)  # Signalled when a queue drains
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="event-bus")
+        self.history = history
+        self.publish_times: Dict[str, Deque[float]] = {}
+        self.logger = logging.getLogger(__name__)
+    
+    def subscribe(self, event_type: Type[Event], handler: Callable[[Event], Any], name: Optional[str] = None,
+                  dispatch: str = DISPATCH_SYNC, policy: str = POLICY_BLOCK, max_pending: int = 100,
+                  loop: Optional[Any] = None,
+                  where: Optional[Callable[[Event], bool]] = None) -> Subscription:
+        """Call `handler` for every published `event_type` that `where` accepts.
+        
+        asyncio dispatch needs the `loop` to run on. `where` runs in the
+        publisher's thread, before the event is queued.
+        """
+        if dispatch not in (DISPATCH_SYNC, DISPATCH_THREAD, DISPATCH_ASYNCIO):
+            raise ValueError(f"Unknown dispatch mode: {dispatch}")
+        if policy not in (POLICY_BLOCK, POLICY_DROP_OLDEST, POLICY_DROP_NEWEST, POLICY_LATEST):
+            raise ValueError(f"Unknown backpressure policy: {policy}")
+        if dispatch == DISPATCH_ASYNCIO and loop is None:
+            raise ValueError("asyncio dispatch needs an event loop")
+        
+        subscription = Subscription(
+            name=name or getattr(handler, "__qualname__", repr(handler)),
+            event_type=event_type,
+            handler=handler,
+            dispatch=dispatch,
+            policy=policy,
+            max_pending=1 if policy == POLICY_LATEST else max(1, max_pending),
+            loop=loop,
+            where=where,
+            handler_times=deque(maxlen=self.history),
+            queue_delays=deque(maxlen=self.history)
+        )
+        with self._lock:
+            self._subscriptions.append(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop delivering to a subscription; events already queued are discarded"""
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+            subscription.pending.clear()
+            self._space.notify_all()
+    
+    def publish(self, event: Event) -> None:
+        """Deliver an event to its subscribers"""
+        started = time.perf_counter()
+        with self._lock:
+            subscriptions = [sub for sub in self._subscriptions if isinstance(event, sub.event_type)]
+        subscriptions = [sub for sub in subscriptions if sub.where is None or sub.where(event)]
+        for subscription in subscriptions:
+            if subscription.dispatch == DISPATCH_SYNC:
+                self._run(subscription, event, started)
+            else:
+                self._enqueue(subscription, event, started)
+        
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            times = self.publish_times.setdefault(type(event).__name__, deque(maxlen=self.history))
+            times.append(elapsed)
+    
+    def _enqueue(self, subscription: Subscription, event: Event, published_at: float) -> None:
+        """Queue an event for a thread or asyncio subscriber, applying its backpressure policy"""
+        with self._lock:
+            if len(subscription.pending) >= subscription.max_pending:
+                if subscription.policy == POLICY_BLOCK and not self._on_bus_thread(subscription):
+                    while len(subscription.pending) >= subscription.max_pending and subscription in self._subscriptions:
+                        self._space.wait()
+                elif subscription.policy == POLICY_DROP_NEWEST:
+                    subscription.dropped += 1
+                    return
+                else:
+                    # Drop oldest, keep only the latest, or a handler publishing to its own full queue
+                    subscription.pending.popleft()
+                    subscription.dropped += 1
+            if subscription not in self._subscriptions:
+                return
+            subscription.pending.append((published_at, event))
+            if subscription.draining:
+                return
+            subscription.draining = True
+        
+        if subscription.dispatch == DISPATCH_THREAD:
+            self._executor.submit(self._drain, subscription)
+        else:
+            subscription.loop.call_soon_threadsafe(
+                lambda: subscription.loop.create_task(self._drain_async(subscription)))
+    
+    def _on_bus_thread(self, subscription: Subscription) -> bool:
+        """Whether blocking here could wait on the very thread that would make room"""
+        if subscription.dispatch == DISPATCH_THREAD:
+            return threading.current_thread().name.startswith("event-bus")
+        if subscription.loop is None:
+            return False
+        import asyncio
+        try:
+            return asyncio.get_running_loop() is subscription.loop
+        except RuntimeError:
+            return False
+    
+    def _next(self, subscription: Subscription) -> Optional[Tuple[float, Event]]:
+        """Pop a subscriber's next event, or mark it idle when its queue is empty"""
+        with self._lock:
+            if not subscription.pending:
+                subscription.draining = False
+                return None
+            item = subscription.pending.popleft()
+            self._space.notify_all()
+            return item
+    
+    def _drain(self, subscription: Subscription) -> None:
+        while True:
+            item = self._next(subscription)
+            if item is None:
+                return
+            published_at, event = item
+            subscription.queue_delays.append(time.perf_counter() - published_at)
+            self._run(subscription, event, published_at)
+    
+    async def _drain_async(self, subscription: Subscription) -> None:
+        import asyncio
+        while True:
+            item = self._next(subscription)
+            if item is None:
+                return
+            published_at, event = item
+            subscription.queue_delays.append(time.perf_counter() - published_at)
+            started = time.perf_counter()
+            try:
+                result = subscription.handler(event)
+                if asyncio.iscoroutine(result):
+                    await result
+                subscription.delivered += 1
+            except Exception as e:
+                subscription.failures += 1
+                self.logger.error(f"Event handler {subscription.name} failed on {type(event).__name__}: {str(e)}")
+            subscription.handler_times.append(time.perf_counter() - started)
+    
+    def _run(self, subscription: Subscription, event: Event, published_at: float) -> None:
+        """Call a handler, timing it; a failing handler does not affect the others"""
+        started = time.perf_counter()
+        try:
+            subscription.handler(event)
+            subscription.delivered += 1
+        except Exception as e:
+            subscription.failures += 1
+            self.logger.error(f"Event handler {subscription.name} failed on {type(event).__name__}: {str(e)}")
+        subscription.handler_times.append(time.perf_counter() - started)
+    
+    def shutdown(self) -> None:
+        """Stop the worker pool once queued events are handled"""
+        self._executor.shutdown(wait=True)
+    
+    def subscriber_stats(self) -> List[Dict[str, Any]]:
+        """Handler time and queueing delay percentiles (seconds) per subscriber, slowest first"""
+        def percentile(values, fraction):
+            values = sorted(values)
+            return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+        
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        stats = [{
+            "name": sub.name,
+            "event": sub.event_type.__name__,
+            "dispatch": sub.dispatch,
+            "delivered": sub.delivered,
+            "dropped": sub.dropped,
+            "failures": sub.failures,
+            "pending": len(sub.pending),
+            "p50": percentile(sub.handler_times, 0.5),
+            "p95": percentile(sub.handler_times, 0.95),
+            "queued_p95": percentile(sub.queue_delays, 0.95)
+        } for sub in subscriptions]
+        return sorted(stats, key=lambda entry: entry["p95"], reverse=True)
+    
+    def describe(self) -> List[str]:
+        """Summarize subscribers for the debug panel"""
+        lines = [f"Event bus: {len(self._subscriptions)} subscribers"]
+        for name, times in sorted(self.publish_times.items()):
+            lines.append(f"  publish {name}: {len(times)} recent, max {max(times) * 1000:.1f}ms")
+        for entry in self.subscriber_stats():
+            queued = f", queued p95 {entry['queued_p95'] * 1000:.1f}ms" if entry["dispatch"] != DISPATCH_SYNC else ""
+            lines.append(f"  {entry['name']} ({entry['event']}, {entry['dispatch']}): {entry['delivered']} handled, "
+                         f"p50 {entry['p50'] * 1000:.1f}ms, p95 {entry['p95'] * 1000:.1f}ms{queued}, "
+                         f"{entry['dropped']} dropped, {entry['pending']} pending")
+        return lines
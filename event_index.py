@@ -0,0 +1,251 @@
+"""Index and search the structured event log (obs_events.jsonl and its rotated backups)
+    
+    python event_index.py index
+    python event_index.py query --type SetInputSettings --source p4vdosolo --outcome failed --since "2026-10-18 18:00"
+    python event_index.py query --slot 4 --room table1 --since 12h --limit 50
+
+The index is an sqlite file next to the log holding, for every event, its
+time, type, room, slot, source and outcome plus where its line is. It is
+brought up to date incrementally before each query (only lines written
+since the last run are read), so queries over large logs only read the
+matching lines.
+"""
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import argparse
+import datetime
+import glob
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    inode INTEGER UNIQUE,
+    path TEXT,
+    offset INTEGER,
+    fingerprint BLOB
+);
+CREATE TABLE IF NOT EXISTS events (
+    file_id INTEGER,
+    offset INTEGER,
+    length INTEGER,
+    ts REAL,
+    type TEXT,
+    room TEXT,
+    slot INTEGER,
+    source TEXT,
+    outcome TEXT
+);
+CREATE INDEX IF NOT EXISTS events_ts ON events (ts);
+CREATE INDEX IF NOT EXISTS events_type ON events (type, ts);
+CREATE INDEX IF NOT EXISTS events_slot ON events (slot, ts);
+CREATE INDEX IF NOT EXISTS events_source ON events (source, ts);
+"""
+
+# Indexed columns a query can filter on (same names as the query options)
+FILTERS = ("type", "room", "slot", "source", "outcome")
+
+# Leading bytes kept per file; they start with the first event's timestamp, so a new file reusing a
+# deleted backup's inode is told apart from it
+FINGERPRINT_BYTES = 64
+
+class EventIndex:
+    """An sqlite index over a JSON-lines event log and its rotated backups"""
+    
+    def __init__(self, log_path: str = "obs_events.jsonl", index_path: Optional[str] = None):
+        self.log_path = os.path.abspath(log_path)
+        self.index_path = index_path or self.log_path + ".idx"
+        self.db = sqlite3.connect(self.index_path)
+        self.db.executescript(SCHEMA)
+        if "fingerprint" not in [column[1] for column in self.db.execute("PRAGMA table_info(files)")]:
+            # Index written before fingerprints; its files are indexed again on the next update
+            self.db.execute("ALTER TABLE files ADD COLUMN fingerprint BLOB")
+        self.unreadable = 0  # Events the last query() could not read back from the log
+    
+    def close(self) -> None:
+        self.db.close()
+    
+    def log_files(self) -> List[str]:
+        """The log and its backups, oldest first"""
+        backups = [path for path in glob.glob(glob.escape(self.log_path) + ".*")
+                   if re.fullmatch(r"\d+", path[len(self.log_path) + 1:])]
+        backups.sort(key=lambda path: int(path[len(self.log_path) + 1:]), reverse=True)
+        return [path for path in backups + [self.log_path] if os.path.exists(path)]
+    
+    def update(self) -> int:
+        """Index lines written since the last update and forget deleted backups; returns new events.
+        
+        Files are tracked by inode, so a rotated file keeps its entries under its new name. The
+        filesystem may hand a deleted backup's inode to the next log file, so each file's first
+        bytes are kept too and a file whose first bytes changed is indexed again from the start.
+        """
+        added = 0
+        seen = set()
+        with self.db:
+            for path in self.log_files():
+                stat = os.stat(path)
+                seen.add(stat.st_ino)
+                fingerprint = self._fingerprint(path)
+                row = self.db.execute("SELECT id, offset, fingerprint FROM files WHERE inode = ?",
+                                      (stat.st_ino,)).fetchone()
+                if row is not None and (stat.st_size < row[1] or not self._same_file(row[2], fingerprint)):
+                    # Truncated, or another file on the same inode: index it again from the start
+                    self.db.execute("DELETE FROM events WHERE file_id = ?", (row[0],))
+                    row = (row[0], 0)
+                if row is None:
+                    file_id = self.db.execute(
+                        "INSERT INTO files (inode, path, offset, fingerprint) VALUES (?, ?, 0, ?)",
+                        (stat.st_ino, path, fingerprint)).lastrowid
+                    offset = 0
+                else:
+                    file_id, offset = row[:2]
+                    self.db.execute("UPDATE files SET path = ?, fingerprint = ? WHERE id = ?",
+                                    (path, fingerprint, file_id))
+                if offset < stat.st_size:
+                    offset, count = self._index_file(file_id, path, offset)
+                    self.db.execute("UPDATE files SET offset = ? WHERE id = ?", (offset, file_id))
+                    added += count
+            
+            for file_id, inode in self.db.execute("SELECT id, inode FROM files").fetchall():
+                if inode not in seen:
+                    self.db.execute("DELETE FROM events WHERE file_id = ?", (file_id,))
+                    self.db.execute("DELETE FROM files WHERE id = ?", (file_id,))
+        return added
+    
+    @staticmethod
+    def _fingerprint(path: str) -> bytes:
+        with open(path, 'rb') as f:
+            return f.read(FINGERPRINT_BYTES)
+    
+    @staticmethod
+    def _same_file(indexed: Optional[bytes], current: bytes) -> bool:
+        """Whether a file whose first bytes were `indexed` can be the one now starting with `current`"""
+        if indexed is None:
+            return False
+        # A file indexed while shorter than FINGERPRINT_BYTES may have grown since
+        return current.startswith(indexed) if len(indexed) <= len(current) else indexed.startswith(current)
+    
+    def _index_file(self, file_id: int, path: str, offset: int) -> Tuple[int, int]:
+        """Index complete lines from `offset`; returns the offset after the last one and the count"""
+        rows = []
+        count = 0
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Still being written
+                try:
+                    event = json.loads(line)
+                    rows.append((file_id, offset, len(line), event["ts"], event.get("type"), event.get("room"),
+                                 event.get("slot"), event.get("source"), event.get("outcome")))
+                except (ValueError, KeyError, TypeError):
+                    pass  # Not an event line
+                offset += len(line)
+                if len(rows) >= 10000:
+                    self.db.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                    count += len(rows)
+                    rows = []
+        self.db.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        return offset, count + len(rows)
+    
+    def query(self, since: Optional[float] = None, until: Optional[float] = None, limit: Optional[int] = None,
+              **filters: Any) -> Iterator[Dict[str, Any]]:
+        """Yield matching events in time order, read from the log lines the index points at.
+        
+        Lines that can no longer be read back (the log rotated since the last update) are
+        skipped and counted in `unreadable`.
+        """
+        clauses, params = [], []
+        if since is not None:
+            clauses.append("e.ts >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("e.ts < ?")
+            params.append(until)
+        for column in FILTERS:
+            if filters.get(column) is not None:
+                clauses.append(f"e.{column} = ?")
+                params.append(filters[column])
+        sql = "SELECT f.path, f.inode, e.offset, e.length FROM events e JOIN files f ON f.id = e.file_id"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY e.ts"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        
+        self.unreadable = 0
+        handles = {}
+        try:
+            for path, inode, offset, length in self.db.execute(sql, params):
+                if path not in handles:
+                    try:
+                        f = open(path, 'rb')
+                    except OSError:
+                        f = None
+                    if f is not None and os.fstat(f.fileno()).st_ino != inode:
+                        f.close()
+                        f = None
+                    handles[path] = f
+                f = handles[path]
+                if f is None:
+                    self.unreadable += 1
+                    continue
+                f.seek(offset)
+                try:
+                    event = json.loads(f.read(length))
+                except ValueError:
+                    self.unreadable += 1
+                    continue
+                yield event
+        finally:
+            for f in handles.values():
+                if f is not None:
+                    f.close()
+
+def parse_time(value: str) -> float:
+    """A timestamp from "YYYY-MM-DD[ HH:MM[:SS]]" (local time) or an age like "30m", "12h", "2d" """
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([smhd])", value)
+    if match:
+        seconds = float(match.group(1)) * {"s": 1, "m": 60, "h": 3600, "d": 86400}[match.group(2)]
+        return time.time() - seconds
+    return datetime.datetime.fromisoformat(value).timestamp()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--log", default="obs_events.jsonl", help="Event log (default: obs_events.jsonl)")
+    parser.add_argument("--index", help="Index file (default: <log>.idx)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("index", help="Bring the index up to date")
+    query = commands.add_parser("query", help="Print matching events as JSON lines")
+    query.add_argument("--since", type=parse_time, help="From this time or age")
+    query.add_argument("--until", type=parse_time, help="Up to this time or age")
+    query.add_argument("--type", help="Event type, e.g. SetInputSettings, sync, generate_links")
+    query.add_argument("--room", help="Room name")
+    query.add_argument("--slot", type=int, help="Slot number (0 is the host)")
+    query.add_argument("--source", help="OBS source name, e.g. p4vdosolo")
+    query.add_argument("--outcome", choices=("ok", "failed", "timeout"))
+    query.add_argument("--limit", type=int, help="Print at most this many events")
+    args = parser.parse_args()
+    
+    index = EventIndex(args.log, args.index)
+    try:
+        started = time.perf_counter()
+        added = index.update()
+        if args.command == "index":
+            print(f"Indexed {added} new events in {time.perf_counter() - started:.2f}s")
+            return
+        for event in index.query(since=args.since, until=args.until, limit=args.limit,
+                                 **{column: getattr(args, column) for column in FILTERS}):
+            sys.stdout.write(json.dumps(event) + "\n")
+        if index.unreadable:
+            print(f"Skipped {index.unreadable} events the log no longer holds; run the query again",
+                  file=sys.stderr)
+    finally:
+        index.close()
+
+if __name__ == "__main__":
+    main()
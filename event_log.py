@@ -0,0 +1,50 @@
+from typing import Any, Optional
+import datetime
+import json
+import logging
+
+# Structured events are records on this logger carrying an `event` dict; log_setup writes them as JSON lines
+EVENT_LOGGER = "vidlinker.events"
+
+# Outcomes
+OUTCOME_OK = "ok"
+OUTCOME_FAILED = "failed"
+OUTCOME_TIMEOUT = "timeout"
+
+_logger = logging.getLogger(EVENT_LOGGER)
+
+def log_event(event_type: str, outcome: str = OUTCOME_OK, room: str = "", slot: Optional[int] = None,
+              source: str = "", latency: Optional[float] = None, **fields: Any) -> None:
+    """Record one structured event, e.g. an OBS request or a link generation.
+    
+    `latency` is in seconds and written in milliseconds; extra keyword
+    fields are written as they are (None values are left out).
+    """
+    if not _logger.isEnabledFor(logging.INFO):
+        return
+    event = {"type": event_type, "outcome": outcome}
+    if room:
+        event["room"] = room
+    if slot is not None:
+        event["slot"] = slot
+    if source:
+        event["source"] = source
+    if latency is not None:
+        event["latency_ms"] = round(latency * 1000, 3)
+    event.update((key, value) for key, value in fields.items() if value is not None)
+    _logger.info(f"{event_type} {outcome}", extra={"event": event})
+
+def is_event(record: logging.LogRecord) -> bool:
+    """Whether a log record is a structured event"""
+    return hasattr(record, "event")
+
+class JSONLinesFormatter(logging.Formatter):
+    """Formats structured events as one JSON object per line, time first"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 6),
+            "time": datetime.datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds")
+        }
+        entry.update(record.event)
+        return json.dumps(entry, separators=(",", ":"), default=str)
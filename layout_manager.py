@@ -0,0 +1,193 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+import math
+
+# What every browser source rendered at before layouts: full HD at 30 fps
+FULL_HD_WIDTH = 1920
+FULL_HD_HEIGHT = 1080
+FULL_HD_FPS = 30
+
+@dataclass
+class TileSize:
+    """On-screen size and frame rate of one player tile"""
+    width: int
+    height: int
+    fps: int
+    
+    @property
+    def pixel_rate(self) -> int:
+        """Pixels per second the browser source has to render"""
+        return self.width * self.height * self.fps
+
+@dataclass
+class TileRect:
+    """Where a player's video sits on the canvas, in canvas pixels"""
+    x: int
+    y: int
+    width: int
+    height: int
+
+def parse_ratio(ratio: str) -> float:
+    """Turn an aspect ratio like "16:9" (or "1.78") into width / height"""
+    if ":" in str(ratio):
+        width, height = str(ratio).split(":", 1)
+        return float(width) / float(height)
+    return float(ratio)
+
+def _even(value: float) -> int:
+    return max(2, int(value) // 2 * 2)
+
+class LayoutManager:
+    """Lays player slots out in a grid and sizes each browser source to its tile.
+    
+    Each grid cell holds one slot (0 is the host): the video tile, the
+    largest `aspect_ratio` rectangle that fits inside the cell's padding,
+    with the slot's name label underneath it. Browser sources render at the
+    stream's `source_aspect`; with fit "cover" they are rendered large enough
+    to fill the tile and cropped, with "contain" they render at the tile size
+    and VDO.Ninja letterboxes the video.
+    """
+    
+    def __init__(self, layout_settings, video_settings=None):
+        self.layout = layout_settings
+        self.video = video_settings
+    
+    def grid(self, slot_count: int) -> Tuple[int, int]:
+        """Get (columns, rows) for a roster, picking a near-square grid when not configured"""
+        slot_count = max(1, slot_count)
+        columns = self.layout.columns or math.ceil(math.sqrt(slot_count))
+        rows = self.layout.rows or math.ceil(slot_count / columns)
+        return columns, rows
+    
+    def tile_rect(self, slot: int, slot_count: int) -> TileRect:
+        """Get the canvas rectangle of a slot's video (0 is the host) in a roster of `slot_count` slots"""
+        columns, rows = self.grid(slot_count)
+        cell_width = self.layout.canvas_width / columns
+        cell_height = self.layout.canvas_height / rows
+        cell_x = (slot % columns) * cell_width
+        cell_y = (slot // columns % rows) * cell_height
+        
+        override = self.layout.slot_sizes.get(str(slot))
+        if override:
+            width, height = override
+        else:
+            # Largest tile of the configured aspect that leaves room for padding and the label
+            aspect = parse_ratio(self.layout.aspect_ratio)
+            area_width = max(2, cell_width - 2 * self.layout.padding)
+            area_height = max(2, cell_height - 2 * self.layout.padding - self.layout.label_height)
+            width = min(area_width, area_height * aspect)
+            height = width / aspect
+        width, height = _even(width), _even(height)
+        
+        # Center the video and its label in the cell
+        block_height = height + self.layout.label_height
+        return TileRect(int(cell_x + (cell_width - width) / 2), int(cell_y + (cell_height - block_height) / 2),
+                        width, height)
+    
+    def tile_size(self, slot: int, slot_count: int) -> TileSize:
+        """Get the on-screen size of a slot's video tile"""
+        rect = self.tile_rect(slot, slot_count)
+        return TileSize(rect.width, rect.height, self.layout.fps)
+    
+    def render_size(self, slot: int, slot_count: int) -> TileSize:
+        """Get the size a slot's browser source renders at, never above full HD"""
+        tile = self.tile_size(slot, slot_count)
+        width, height = float(tile.width), float(tile.height)
+        if self.layout.fit == "cover":
+            # Grow one side so a source_aspect video covers the whole tile
+            source_aspect = parse_ratio(self.layout.source_aspect)
+            if source_aspect > width / height:
+                width = height * source_aspect
+            else:
+                height = width / source_aspect
+        
+        shrink = min(1.0, FULL_HD_WIDTH / width, FULL_HD_HEIGHT / height)
+        return TileSize(_even(width * shrink), _even(height * shrink), tile.fps)
+    
+    def browser_settings(self, slot: int, slot_count: int) -> Dict[str, int]:
+        """OBS browser source settings for a slot's tile"""
+        tile = self.render_size(slot, slot_count)
+        return {
+            "width": tile.width,
+            "height": tile.height,
+            "fps_custom": True,
+            "fps": tile.fps
+        }
+    
+    def view_hints(self, slot: int, slot_count: int) -> Dict[str, int]:
+        """VDO.Ninja viewer-side parameters asking the sender for a stream sized to the tile"""
+        tile = self.render_size(slot, slot_count)
+        return {
+            "viewwidth": tile.width,
+            "viewheight": tile.height,
+            "videobitrate": self.bitrate_for(tile),
+            "maxframerate": tile.fps
+        }
+    
+    def bitrate_for(self, tile: TileSize) -> int:
+        """Scale the full-HD video bitrate (kbps) down to the tile's pixel rate"""
+        base = 2500
+        if self.video is not None and str(self.video.bitrate).strip().isdigit():
+            base = int(self.video.bitrate)
+        full_rate = FULL_HD_WIDTH * FULL_HD_HEIGHT * FULL_HD_FPS
+        return max(self.layout.min_bitrate, int(base * tile.pixel_rate / full_rate))
+    
+    def pixel_throughput(self, slot_count: int) -> Tuple[int, int]:
+        """Get (full-HD, layout) pixels per second rendered by all browser sources"""
+        full = FULL_HD_WIDTH * FULL_HD_HEIGHT * FULL_HD_FPS * slot_count
+        sized = sum(self.render_size(slot, slot_count).pixel_rate for slot in range(slot_count))
+        return full, sized
+    
+    def video_transform(self, slot: int, slot_count: int) -> Dict[str, Any]:
+        """OBS scene item transform placing a slot's browser source on its tile"""
+        rect = self.tile_rect(slot, slot_count)
+        render = self.render_size(slot, slot_count)
+        
+        # Scale the render to cover the tile, then crop what overflows it (in source pixels)
+        scale = max(rect.width / render.width, rect.height / render.height)
+        crop_x = max(0, round(render.width - rect.width / scale))
+        crop_y = max(0, round(render.height - rect.height / scale))
+        return {
+            "positionX": rect.x,
+            "positionY": rect.y,
+            "alignment": 5,  # Top left
+            "rotation": 0.0,
+            "scaleX": round(scale, 4),
+            "scaleY": round(scale, 4),
+            "cropLeft": crop_x // 2,
+            "cropRight": crop_x - crop_x // 2,
+            "cropTop": crop_y // 2,
+            "cropBottom": crop_y - crop_y // 2,
+            "boundsType": "OBS_BOUNDS_NONE"
+        }
+    
+    def label_transform(self, slot: int, slot_count: int) -> Dict[str, Any]:
+        """OBS scene item transform fitting a slot's name label into the strip under its video"""
+        rect = self.tile_rect(slot, slot_count)
+        return {
+            "positionX": rect.x,
+            "positionY": rect.y + rect.height,
+            "alignment": 5,  # Top left
+            "rotation": 0.0,
+            "boundsType": "OBS_BOUNDS_SCALE_INNER",
+            "boundsAlignment": 0,  # Centered in the strip
+            "boundsWidth": rect.width,
+            "boundsHeight": self.layout.label_height
+        }
+    
+    def scene_transforms(self, slot_count: int) -> Dict[str, Dict[str, Any]]:
+        """Transforms for every player source and label in a roster, keyed by source name"""
+        transforms = {}
+        for slot in range(slot_count):
+            transforms[f"p{slot}vdosolo"] = self.video_transform(slot, slot_count)
+            if self.layout.label_height > 0:
+                transforms[f"p{slot}name"] = self.label_transform(slot, slot_count)
+        return transforms
+    
+    def describe_savings(self, slot_count: int) -> str:
+        """Summarize the render throughput saved for a roster"""
+        full, sized = self.pixel_throughput(slot_count)
+        saved = 1 - sized / full if full else 0.0
+        columns, rows = self.grid(slot_count)
+        return (f"Layout {columns}x{rows}: browser sources render {sized / 1e6:.0f} Mpx/s "
+                f"instead of {full / 1e6:.0f} Mpx/s ({saved:.0%} saved)")
@@ -0,0 +1,77 @@
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional, Tuple
+import atexit
+import logging
+import os
+import queue
+
+from event_log import JSONLinesFormatter, is_event
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+_path: Optional[Tuple[str, Optional[str]]] = None
+
+def setup_logging(path: str = "obs_debug.log", max_bytes: int = 1024 * 1024, backups: int = 3,
+                  level: int = logging.INFO, events_path: Optional[str] = None,
+                  events_max_bytes: int = 10 * 1024 * 1024) -> QueueListener:
+    """Send every log record through a queue to one rotating file handler on a background thread.
+    
+    Logging calls only put the record on an unbounded queue, so they never
+    wait on the disk. Calling this again reuses the running listener for the
+    same file (or replaces it for another one), so the root logger always has
+    exactly one handler writing the log.
+    
+    Structured events (see event_log) go to `events_path` as JSON lines,
+    rotated with the same number of backups, and stay out of the text log.
+    """
+    global _listener, _queue_handler, _path
+    root = logging.getLogger()
+    root.setLevel(level)
+    path = os.path.abspath(path)
+    if events_path:
+        events_path = os.path.abspath(events_path)
+    if _listener is not None:
+        if (path, events_path) == _path:
+            return _listener
+        shutdown_logging()
+    
+    # Drop file handlers left on the root logger for the same file, e.g. by an earlier basicConfig
+    for handler in list(root.handlers):
+        if isinstance(handler, logging.FileHandler) and handler.baseFilename == path:
+            root.removeHandler(handler)
+            handler.close()
+    
+    file_handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding='utf-8')
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT, DATE_FORMAT))
+    file_handler.addFilter(lambda record: not is_event(record))
+    handlers = [file_handler]
+    if events_path:
+        events_handler = RotatingFileHandler(events_path, maxBytes=events_max_bytes, backupCount=backups,
+                                             encoding='utf-8')
+        events_handler.setFormatter(JSONLinesFormatter())
+        events_handler.addFilter(is_event)
+        handlers.append(events_handler)
+    
+    records = queue.SimpleQueue()
+    _queue_handler = QueueHandler(records)
+    _listener = QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+    _path = (path, events_path)
+    root.addHandler(_queue_handler)
+    return _listener
+
+def shutdown_logging() -> None:
+    """Write out queued records and close the log file"""
+    global _listener, _queue_handler, _path
+    if _listener is None:
+        return
+    logging.getLogger().removeHandler(_queue_handler)
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = _queue_handler = _path = None
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,62 @@
+from collections import deque
+from typing import Deque, List
+import os
+
+class LogTail:
+    """Follows a log file by offset, keeping only its last lines in memory.
+    
+    The first read loads at most `initial_bytes` from the end of the file;
+    later reads return only what was appended since. A partial last line is
+    held back until its newline arrives. If the file shrinks (cleared or
+    rotated) it is followed again from the start.
+    """
+    
+    def __init__(self, path: str, initial_bytes: int = 64 * 1024, max_lines: int = 2000):
+        self.path = path
+        self.initial_bytes = initial_bytes
+        self.lines: Deque[str] = deque(maxlen=max_lines)
+        self.offset = None  # None until the first read
+        self._inode = None
+        self._partial = ""
+    
+    def read_new(self) -> List[str]:
+        """Read the lines appended since the last call (the tail of the file on the first call)"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return []
+        size = stat.st_size
+        rotated = self._inode is not None and stat.st_ino != self._inode
+        self._inode = stat.st_ino
+        
+        if self.offset is None:
+            start = max(0, size - self.initial_bytes)
+        elif rotated or size < self.offset:
+            start = 0  # Truncated or rotated
+            self._partial = ""
+        else:
+            start = self.offset
+        if size == start:
+            self.offset = size
+            return []
+        
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            data = f.read(size - start)
+        text = data.decode('utf-8', errors='replace')
+        if self.offset is None and start > 0:
+            # Started mid-file; drop the cut-off first line
+            text = text.split("\n", 1)[1] if "\n" in text else ""
+        self.offset = start + len(data)
+        
+        text = self._partial + text
+        lines = text.split("\n")
+        self._partial = lines.pop()
+        self.lines.extend(lines)
+        return lines
+    
+    def reset(self) -> None:
+        """Forget what was read, e.g. after the file was cleared"""
+        self.lines.clear()
+        self.offset = 0
+        self._partial = ""
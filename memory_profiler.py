@@ -0,0 +1,104 @@
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+import gc
+import logging
+import threading
+import tracemalloc
+
+# Allocations made by tracemalloc, this module and imports are noise in an action's report
+_IGNORE = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+def measure(func: Callable[[], Any]) -> Tuple[Any, int, int]:
+    """Call `func` and return (its result, bytes still allocated while the result is held, peak bytes above the start).
+    
+    tracemalloc must already be tracing.
+    """
+    gc.collect()
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    result = func()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    return result, current - before, peak - before
+
+class MemoryProfiler:
+    """tracemalloc snapshots around user actions (Generate, Update OBS, Load Room, Copy All) while memory profiling is on.
+    
+    After each action the memory it left allocated, its peak above the
+    starting point and the `top` source lines that grew the most are
+    written to the debug log. tracemalloc makes every allocation slower,
+    so this has its own setting rather than riding on debug mode.
+    Tracing is process-wide: an OBS sync running on the event bus while a
+    UI action is tracked shows up in that action's report too.
+    """
+    
+    def __init__(self, top: int = 10, frames: int = 1, enabled: bool = False):
+        self.top = top
+        self.frames = frames
+        self.last_summary: Optional[str] = None
+        self.last_sites: List[str] = []
+        self._started_tracing = False
+        self._local = threading.local()  # Whether this thread is inside a tracked action
+        self.logger = logging.getLogger(__name__)
+        self.enabled = enabled
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether tracemalloc is tracing, whoever started it (e.g. python -X tracemalloc)"""
+        return tracemalloc.is_tracing()
+    
+    @enabled.setter
+    def enabled(self, enabled: bool) -> None:
+        """Start tracing when turned on; only stop tracing this profiler started"""
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+            self.logger.info(f"Memory profiling on (tracemalloc, {self.frames} frame(s) per allocation)")
+        elif not enabled and self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+            self.logger.info("Memory profiling off")
+    
+    @contextmanager
+    def track(self, action: str) -> Iterator[None]:
+        """Snapshot memory before and after the body of the with-block when enabled"""
+        if not tracemalloc.is_tracing() or getattr(self._local, "active", False):
+            yield
+            return
+        self._local.active = True
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        start = tracemalloc.get_traced_memory()[0]
+        try:
+            yield
+        finally:
+            self._local.active = False
+            try:
+                self._report(action, before, start)
+            except Exception as e:
+                self.logger.error(f"Failed to report memory for {action}: {str(e)}")
+    
+    def _report(self, action: str, before: tracemalloc.Snapshot, start: int) -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        self.last_sites = self.top_sites(before, after)
+        self.last_summary = (f"Memory {action}: {(current - start) / 1024:+.1f} KiB kept, "
+                             f"peak {(peak - start) / 1024:+.1f} KiB, {current / 1024 / 1024:.1f} MiB traced")
+        self.logger.info(f"{self.last_summary}\n" + "\n".join(self.last_sites))
+    
+    def top_sites(self, before: tracemalloc.Snapshot, after: tracemalloc.Snapshot) -> List[str]:
+        """The `top` source lines whose allocations grew the most between two snapshots"""
+        stats = after.filter_traces(_IGNORE).compare_to(before.filter_traces(_IGNORE), "lineno")
+        return [str(stat) for stat in stats[:self.top] if stat.size_diff > 0]
+    
+    def describe(self) -> str:
+        """The last report for the debug panel"""
+        if not self.enabled:
+            return "Memory profiling off"
+        return self.last_summary or "Memory profiling on; no actions tracked yet"
@@ -0,0 +1,194 @@
+from typing import Any, Dict, Optional
+import json
+import logging
+import socket
+import websocket
+from obswebsocket import obsws, exceptions
+from obswebsocket.core import RecvThread
+
+try:
+    import msgpack
+except ImportError:  # Optional: only needed for the msgpack subprotocol
+    msgpack = None
+
+LOG = logging.getLogger(__name__)
+
+class JSONCodec:
+    """obs-websocket default encoding: JSON in text frames"""
+    name = "json"
+    subprotocol = "obswebsocket.json"
+    binary = False
+    
+    def encode(self, payload: Dict[str, Any]) -> str:
+        return json.dumps(payload)
+    
+    def decode(self, message) -> Dict[str, Any]:
+        return json.loads(message)
+
+class MsgpackCodec:
+    """obs-websocket v5 MessagePack encoding: msgpack in binary frames"""
+    name = "msgpack"
+    subprotocol = "obswebsocket.msgpack"
+    binary = True
+    
+    def encode(self, payload: Dict[str, Any]) -> bytes:
+        return msgpack.packb(payload, use_bin_type=True)
+    
+    def decode(self, message) -> Dict[str, Any]:
+        return msgpack.unpackb(message, raw=False)
+
+CODECS = {
+    JSONCodec.subprotocol: JSONCodec(),
+    MsgpackCodec.subprotocol: MsgpackCodec(),
+}
+
+def get_codec(encoding: str) -> Any:
+    """Get the codec for an OBSSettings.encoding value, falling back to JSON"""
+    if encoding == MsgpackCodec.name:
+        if msgpack is not None:
+            return CODECS[MsgpackCodec.subprotocol]
+        LOG.warning("msgpack encoding requested but the msgpack package is not installed; using JSON")
+    return CODECS[JSONCodec.subprotocol]
+
+class CodecObsws(obsws):
+    """obsws client that negotiates its wire encoding with the server.
+    
+    The preferred codec is offered as a websocket subprotocol during the
+    handshake. If the server does not accept it, the connection falls back to
+    plain JSON, which every obs-websocket v5 server speaks. Legacy (v4)
+    servers only understand JSON.
+    
+    v5 connections use CodecRecvThread, which also understands request batch
+    responses.
+    """
+    
+    def __init__(self, *args, codec: Optional[Any] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.preferred_codec = codec or CODECS[JSONCodec.subprotocol]
+        self.codec = CODECS[JSONCodec.subprotocol]
+        self.message_hook = None  # Called with (direction, payload, size) for every request, answer and event
+    
+    def connect(self):
+        """Connect to the websocket server, negotiating the encoding"""
+        if self.legacy:
+            self.codec = CODECS[JSONCodec.subprotocol]
+            super().connect()
+            return
+        
+        try:
+            self.ws = websocket.WebSocket()
+            url = "ws://{}:{}".format(self.host, self.port)
+            LOG.info("Connecting to %s with %s..." % (url, self.preferred_codec.subprotocol))
+            subprotocols = [self.preferred_codec.subprotocol]
+            if self.preferred_codec.binary:
+                subprotocols.append(JSONCodec.subprotocol)
+            self.ws.connect(url, subprotocols=subprotocols)
+            
+            # Fall back to JSON when the server did not pick the preferred encoding
+            self.codec = CODECS.get(self.ws.getsubprotocol(), CODECS[JSONCodec.subprotocol])
+            LOG.info("Connected using %s encoding" % (self.codec.name))
+            self._auth()
+            
+            if self.thread_recv is not None:
+                self.thread_recv.running = False
+            self.thread_recv = CodecRecvThread(self)
+            self.thread_recv.daemon = True
+            self.thread_recv.start()
+            if self.on_connect:
+                self.on_connect(self)
+        except socket.error as e:
+            raise exceptions.ConnectionFailure(str(e))
+    
+    def send_payload(self, payload: Dict[str, Any]) -> int:
+        """Encode and write one protocol message, returning its size on the wire"""
+        data = self.codec.encode(payload)
+        if self.codec.binary:
+            self.ws.send_binary(data)
+        else:
+            self.ws.send(data)
+        if self.message_hook:
+            self.message_hook("send", payload, len(data))
+        return len(data)
+    
+    def _auth(self):
+        if not self.codec.binary:
+            return super()._auth()
+        
+        result = self.codec.decode(self.ws.recv())
+        LOG.debug("Got Hello message: {}".format(result))
+        if result.get('op') != 0:
+            raise exceptions.ConnectionFailure(result.get('error', "Invalid Hello message."))
+        self.server_version = result['d'].get('obsWebSocketVersion')
+        
+        if result['d'].get('authentication'):
+            auth = self._build_auth_string(result['d']['authentication']['salt'], result['d']['authentication']['challenge'])
+        else:
+            auth = ''
+        
+        payload = {
+            "op": 1,
+            "d": {
+                "rpcVersion": 1,
+                "authentication": auth,
+                "eventSubscriptions": 1023  # EventSubscription::All
+            }
+        }
+        self.send_payload(payload)
+        
+        message = self.ws.recv()
+        if not message:
+            raise exceptions.ConnectionFailure("Empty response to Identify, password may be incorrect.")
+        result = self.codec.decode(message)
+        LOG.debug("Got Identified message: {}".format(result))
+        if result.get('op') != 2:
+            raise exceptions.ConnectionFailure(result.get('error', "Invalid Identified message."))
+        if result['d'].get('negotiatedRpcVersion') != 1:
+            raise exceptions.ConnectionFailure(result.get('error', "Invalid RPC version negotiated."))
+
+class CodecRecvThread(RecvThread):
+    """obsws receive loop for v5 connections in any encoding, including request batches"""
+    
+    def run(self):
+        while self.running:
+            message = b""
+            try:
+                message = self.ws.recv()
+                
+                if not message:
+                    continue
+                
+                result = self.core.codec.decode(message)
+                if self.core.message_hook:
+                    self.core.message_hook("recv", result, len(message))
+                if result['op'] == 5:  # Event
+                    LOG.debug("Got event: {}".format(result))
+                    obj = self.build_event(result['d'])
+                    self.core.eventmanager.trigger(obj)
+                elif result['op'] == 7:  # RequestResponse
+                    LOG.debug("Got answer for id {}: {}".format(result['d']['requestId'], result))
+                    if result['d']['requestId'] in self.core.events:
+                        self.core.answers[result['d']['requestId']] = result['d']
+                        self.core.events[result['d']['requestId']].set()
+                elif result['op'] == 9:  # RequestBatchResponse
+                    LOG.debug("Got batch answer for id {}: {}".format(result['d']['requestId'], result))
+                    if result['d']['requestId'] in self.core.events:
+                        self.core.answers[result['d']['requestId']] = result['d']
+                        self.core.events[result['d']['requestId']].set()
+                else:
+                    LOG.warning("Unknown message: {}".format(result))
+            
+            except websocket.WebSocketConnectionClosedException:
+                if self.running:
+                    if self.core.authreconnect:
+                        LOG.warning("Connection lost, attempting to reconnect...")
+                        self.core.reconnect()
+                    else:
+                        LOG.warning("Connection lost!")
+                        self.core.disconnect()
+                    break
+            except OSError as e:
+                if self.running:
+                    raise e
+            except (ValueError, KeyError, exceptions.ObjectError) as e:
+                LOG.warning("Invalid message: {} ({})".format(message, e))
+        LOG.debug("RecvThread ended.")
@@ -1,48 +1,248 @@
-from typing import Optional, Dict, Any
-from obswebsocket import obsws, requests, exceptions
+from typing import Optional, Dict, Any, List, Callable, Tuple
+from concurrent.futures import CancelledError
+from functools import partial
+from dataclasses import dataclass, asdict
+from collections import deque
+from obswebsocket import requests
+from obs_codec import CodecObsws, get_codec
+from url_manager import URLManager
+from obs_scheduler import OBSScheduler, LANE_INTERACTIVE, LANE_LIVE, LANE_BULK, LANE_TELEMETRY
+from obs_trace import TraceWriter
+from event_log import log_event, OUTCOME_OK, OUTCOME_FAILED, OUTCOME_TIMEOUT
+from metrics import REGISTRY
 import logging
+import queue
 import re
+import threading
+import time
+
+# Suffix of the hidden browser sources a room is pre-loaded into; see warm_shadow_bank()
+SHADOW_SUFFIX = "_next"
+
+# Room sources: optional room prefix, slot number, kind and optional shadow suffix
+SOURCE_NAME = re.compile(r"^(.*?)p(\d+)(vdosolo|name)(?:_next)?$")
+
+OBS_REQUESTS = REGISTRY.counter("vidlinker_obs_requests_total", "OBS requests by type and outcome",
+                                ("type", "outcome"))
+OBS_REQUEST_SECONDS = REGISTRY.histogram("vidlinker_obs_request_seconds", "OBS request latency by type", ("type",))
+OBS_CONNECTS = REGISTRY.counter("vidlinker_obs_connects_total", "Connection attempts to OBS by outcome", ("outcome",))
+CACHE_LOOKUPS = REGISTRY.counter("vidlinker_cache_lookups_total", "Cache lookups by cache and result",
+                                 ("cache", "result"))
+SCENE_ITEM_HIT = CACHE_LOOKUPS.labels("scene_item_ids", "hit")
+SCENE_ITEM_MISS = CACHE_LOOKUPS.labels("scene_item_ids", "miss")
+
+class OBSRequestError(Exception):
+    """OBS answered a request with a failure status"""
+
+class OBSTimeoutError(Exception):
+    """An OBS operation did not finish within its timeout or deadline"""
+
+class Deadline:
+    """Absolute deadline shared by a high-level operation and every request it makes"""
+    
+    def __init__(self, seconds: Optional[float] = None):
+        self.expires_at = None if seconds is None else time.monotonic() + seconds
+    
+    def remaining(self) -> Optional[float]:
+        """Seconds left, or None for an unbounded deadline"""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+    
+    def expired(self) -> bool:
+        """Check if the deadline has passed"""
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+    
+    def cap(self, timeout: float) -> float:
+        """Shorten a per-operation timeout so it never outlives the deadline"""
+        remaining = self.remaining()
+        return timeout if remaining is None else min(timeout, remaining)
+
+@dataclass
+class OBSRequestResult:
+    """Outcome of a single request sent through the pipeline"""
+    request: Any
+    ok: bool
+    error: Optional[str] = None
+    latency: float = 0.0
+    timed_out: bool = False
+
+@dataclass
+class OBSStatsSample:
+    """One GetStats reading"""
+    timestamp: float
+    cpu_usage: float
+    memory_usage: float
+    active_fps: float
+    average_frame_render_time: float
+    render_skipped_frames: int
+    render_total_frames: int
+    output_skipped_frames: int
+    output_total_frames: int
+    
+    @property
+    def skipped_frames(self) -> int:
+        """Render and output frames skipped since OBS started"""
+        return self.render_skipped_frames + self.output_skipped_frames
+
+class _PipelineSlot:
+    """Stands in for the threading.Event obsws keeps per request id.
+    
+    The obsws receive thread calls set() when the answer for this request id
+    arrives, which lets the pipeline collect answers in arrival order.
+    """
+    
+    def __init__(self, message_id: str, done: queue.Queue):
+        self.message_id = message_id
+        self.done = done
+    
+    def set(self):
+        self.done.put(self.message_id)
 
 class OBSManager:
     """Manages OBS WebSocket connection and source updates"""
     
-    def __init__(self):
+    def __init__(self, pipeline_window: int = 8, request_timeout: float = 5.0,
+                 connect_timeout: float = 3.0, sync_deadline: float = 15.0, encoding: str = "json",
+                 stats_history: int = 300, skipped_frames_threshold: int = 30, stats_watch_window: float = 10.0,
+                 lane_rates: Optional[Dict[str, float]] = None, lane_max_wait: float = 2.0):
         self.ws = None
         self.connected = False
         
-        # Set up logging
-        self.logger = logging.getLogger(__name__)
-        self.logger.setLevel(logging.INFO)
+        # Pipelining: how many requests may be in flight and how long each may take
+        self.pipeline_window = pipeline_window
+        self.request_timeout = request_timeout
+        self._send_lock = threading.Lock()
+        
+        # Bounds for connecting and for a whole update_sources/provisioning run
+        self.connect_timeout = connect_timeout
+        self.sync_deadline = sync_deadline
+        
+        # Prioritized lanes for requests while connected; see obs_scheduler
+        self.scheduler = OBSScheduler(workers=pipeline_window, lane_rates=lane_rates, max_wait=lane_max_wait)
+        
+        # Preferred wire encoding ("json" or "msgpack"), negotiated on connect
+        self.encoding = encoding
+        
+        # Request outcome counters, shown in the debug panel
+        self.metrics = {
+            "requests": 0,
+            "failures": 0,
+            "timeouts": 0,
+            "connect_timeouts": 0
+        }
+        self._metrics_lock = threading.Lock()  # Results are recorded on every scheduler worker
         
-        # Add file handler
-        handler = logging.FileHandler('obs_debug.log')
-        handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-        self.logger.addHandler(handler)
+        # GetStats sampler: ring buffer of readings, and the source update it is watching
+        self.stats_history = deque(maxlen=stats_history)
+        self.skipped_frames_threshold = skipped_frames_threshold
+        self.stats_watch_window = stats_watch_window
+        self._stats_thread = None
+        self._stats_stop = threading.Event()
+        self._watched_update = None  # (update time, skipped frames before the update)
+        
+        # Input settings the room wants, by input name; the drift reconciler checks OBS against them
+        self.desired_inputs: Dict[str, Dict[str, Any]] = {}
+        self._desired_lock = threading.Lock()
+        self._live_updates = 0
+        self._last_live_update = 0.0
+        
+        # Slots the last update or room switch filled, so the next switch can blank leftovers
+        self.slot_count = 0
+        
+        # Layout: scene item ids by (scene, source) and the transforms OBS last accepted
+        self._scene_item_ids: Dict[Tuple[str, str], int] = {}
+        self._applied_transforms: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        
+        # Capture of requests, answers and events for replay; see start_capture()
+        self._trace: Optional[TraceWriter] = None
+        
+        # Room name by source name prefix ("" for the main room), for the structured event log
+        self.room_prefixes: Dict[str, str] = {}
+        
+        # Records go to whatever the application configured; see log_setup.setup_logging()
+        self.logger = logging.getLogger(__name__)
     
-    def connect(self, host: str = "localhost", port: int = 4444, password: Optional[str] = None) -> bool:
-        """Connect to OBS WebSocket"""
+    def connect(self, host: str = "localhost", port: int = 4444, password: Optional[str] = None,
+                timeout: Optional[float] = None) -> bool:
+        """Connect to OBS WebSocket, giving up after `timeout` seconds"""
+        deadline = Deadline(self.connect_timeout if timeout is None else timeout)
         try:
             self.logger.info(f"Attempting to connect to OBS at {host}:{port}")
             
-            # Create WebSocket client and connect
-            self.ws = obsws(host=host, port=port, password=password)
-            self.ws.connect()
+            # Create WebSocket client and connect; the handshake has no timeout of its
+            # own, so it runs on a worker thread that is abandoned at the deadline
+            ws = CodecObsws(host=host, port=port, password=password, timeout=self.request_timeout,
+                            codec=get_codec(self.encoding))
+            if self._trace is not None:
+                ws.message_hook = self._trace.message
+            self._run_with_deadline(ws.connect, deadline, f"connecting to {host}:{port}",
+                                    on_late_success=ws.disconnect)
+            self.ws = ws
+            self.connected = True
+            self._scene_item_ids.clear()
+            self._applied_transforms.clear()
             
             # Test connection by getting version
-            version = self.ws.call(requests.GetVersion())
-            self.logger.info(f"Connected to OBS {version.getObsVersion()}")
+            version = self._call(requests.GetVersion(), deadline)
+            self.logger.info(f"Connected to OBS {version.getObsVersion()} using {ws.codec.name} encoding")
+            self.scheduler.start()
+            log_event("connect", host=host, port=port, encoding=ws.codec.name)
+            OBS_CONNECTS.labels(OUTCOME_OK).inc()
             
-            self.connected = True
             return True
             
+        except OBSTimeoutError as e:
+            with self._metrics_lock:
+                self.metrics["connect_timeouts"] += 1
+            self.logger.error(f"Timed out connecting to OBS: {str(e)}")
+            log_event("connect", OUTCOME_TIMEOUT, host=host, port=port, error=str(e))
+            OBS_CONNECTS.labels(OUTCOME_TIMEOUT).inc()
+            self.disconnect()
+            raise
         except Exception as e:
             self.logger.error(f"Failed to connect to OBS: {str(e)}")
-            self.connected = False
-            self.ws = None
+            log_event("connect", OUTCOME_FAILED, host=host, port=port, error=str(e))
+            OBS_CONNECTS.labels(OUTCOME_FAILED).inc()
+            # The handshake may have succeeded; close the socket and its receive thread
+            self.disconnect()
             raise
     
+    def _run_with_deadline(self, func: Callable[[], Any], deadline: Deadline, operation: str,
+                           on_late_success: Optional[Callable[[], Any]] = None) -> None:
+        """Run a blocking call on a worker thread and stop waiting for it at the deadline"""
+        lock = threading.Lock()
+        state = {"finished": False, "abandoned": False, "error": None}
+        
+        def worker():
+            try:
+                func()
+            except Exception as e:
+                state["error"] = e
+            with lock:
+                state["finished"] = True
+                late = state["abandoned"]
+            # Nobody is waiting any more; clean up whatever the call set up
+            if late and state["error"] is None and on_late_success:
+                try:
+                    on_late_success()
+                except Exception:
+                    pass
+        
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+        thread.join(deadline.remaining())
+        
+        with lock:
+            if not state["finished"]:
+                state["abandoned"] = True
+                raise OBSTimeoutError(f"{operation} did not finish in time")
+        if state["error"] is not None:
+            raise state["error"]
+    
     def disconnect(self):
         """Disconnect from OBS WebSocket"""
+        self.scheduler.stop()
         try:
             if self.ws:
                 self.ws.disconnect()
@@ -62,7 +262,7 @@ class OBSManager:
                 
             # Test connection by getting version
             try:
-                version = self.ws.call(requests.GetVersion())
+                version = self._call(requests.GetVersion(), lane=LANE_INTERACTIVE)
                 self.connected = True
                 return True
             except:
@@ -82,7 +282,7 @@ class OBSManager:
             return False
             
         try:
-            self.ws.call(requests.SetTextGDIPlusProperties(source=source_name, text=text))
+            self._call(requests.SetTextGDIPlusProperties(source=source_name, text=text), lane=LANE_INTERACTIVE)
             return True
         except Exception as e:
             self.logger.error(f"Failed to update text source {source_name}: {str(e)}")
@@ -95,48 +295,791 @@ class OBSManager:
             
         try:
             settings = {"url": url}
-            self.ws.call(requests.SetSourceSettings(sourceName=source_name, sourceSettings=settings))
+            self._call(requests.SetSourceSettings(sourceName=source_name, sourceSettings=settings), lane=LANE_LIVE)
             return True
         except Exception as e:
             self.logger.error(f"Failed to update browser source {source_name}: {str(e)}")
             return False
     
-    def update_sources(self, links: Dict[str, str]) -> None:
-        """Update OBS sources with current links"""
+    def _call(self, request: Any, deadline: Optional[Deadline] = None, lane: str = LANE_BULK) -> Any:
+        """Send one request and wait for its answer, bounded by the request timeout and deadline"""
+        result = self.call_pipelined([request], window=1, deadline=deadline, lane=lane)[0]
+        if result.timed_out:
+            raise OBSTimeoutError(f"{request.name}: {result.error}")
+        if not result.ok:
+            raise OBSRequestError(f"{request.name}: {result.error}")
+        return result.request
+    
+    def call_pipelined(self, obs_requests: List[Any], window: Optional[int] = None,
+                       timeout: Optional[float] = None, deadline: Optional[Deadline] = None,
+                       lane: str = LANE_BULK) -> List[OBSRequestResult]:
+        """Send requests concurrently and collect their answers.
+        
+        While connected, each request is queued in a scheduler `lane` and the
+        scheduler's workers keep up to pipeline_window requests in flight,
+        most urgent lane first; `window` further caps how many of these
+        requests are queued or in flight at once. Without the scheduler they
+        are sent on this thread, `window` (pipeline_window by default) at a
+        time. Each request has its own deadline of `timeout` seconds from
+        when it was sent, cut short by the overall `deadline`; a failure or
+        timeout only affects its own request.
+        """
+        if self.scheduler.running:
+            return self._schedule(obs_requests, window, timeout, deadline, lane)
+        return self._pipeline(obs_requests, window, timeout, deadline)
+    
+    def _schedule(self, obs_requests: List[Any], window: Optional[int], timeout: Optional[float],
+                  deadline: Optional[Deadline], lane: str) -> List[OBSRequestResult]:
+        """Queue each request on the scheduler, holding back all but `window` of them"""
+        slots = threading.Semaphore(window) if window else None
+        futures = []
+        for request in obs_requests:
+            if slots is not None:
+                # Past the deadline the rest are queued anyway; they fail fast in _send_one
+                slots.acquire(timeout=deadline.remaining() if deadline is not None else None)
+            future = self.scheduler.submit(lane, partial(self._send_one, request, timeout, deadline))
+            if slots is not None:
+                future.add_done_callback(lambda _: slots.release())
+            futures.append(future)
+        return [self._scheduled_result(request, future) for request, future in zip(obs_requests, futures)]
+    
+    def _send_one(self, request: Any, timeout: Optional[float], deadline: Optional[Deadline]) -> OBSRequestResult:
+        """Run one request on a scheduler worker"""
+        return self._pipeline([request], 1, timeout, deadline)[0]
+    
+    def _scheduled_result(self, request: Any, future: Any) -> OBSRequestResult:
+        """Wait for a scheduled request, turning cancellation by disconnect into a failed result"""
+        try:
+            return future.result()
+        except CancelledError:
+            return self._record(OBSRequestResult(request, False, "Cancelled: disconnected from OBS"))
+    
+    def _pipeline(self, obs_requests: List[Any], window: Optional[int] = None, timeout: Optional[float] = None,
+                  deadline: Optional[Deadline] = None) -> List[OBSRequestResult]:
+        """Send requests back-to-back and collect the answers as they arrive.
+        
+        Up to `window` requests are in flight at once. Answers are matched by
+        requestId.
+        """
+        window = max(1, window or self.pipeline_window)
+        timeout = self.request_timeout if timeout is None else timeout
+        deadline = deadline or Deadline()
+        results: List[Optional[OBSRequestResult]] = [None] * len(obs_requests)
+        
+        if not self.connected or not self.ws:
+            return [OBSRequestResult(request, False, "Not connected to OBS") for request in obs_requests]
+        
+        done = queue.Queue()
+        in_flight = {}  # message id -> (index, request, sent at, expires at)
+        next_index = 0
+        
+        while next_index < len(obs_requests) or in_flight:
+            # Top up the window; once the overall deadline passes nothing new is sent
+            while next_index < len(obs_requests) and len(in_flight) < window:
+                request = obs_requests[next_index]
+                if deadline.expired():
+                    results[next_index] = self._record(OBSRequestResult(request, False, "Deadline exceeded",
+                                                                        timed_out=True))
+                else:
+                    try:
+                        message_id = self._send_request(request, done)
+                        sent_at = time.monotonic()
+                        in_flight[message_id] = (next_index, request, sent_at, sent_at + deadline.cap(timeout))
+                    except Exception as e:
+                        self.logger.error(f"Failed to send {request.name}: {str(e)}")
+                        results[next_index] = self._record(OBSRequestResult(request, False, str(e)))
+                next_index += 1
+            
+            if not in_flight:
+                continue
+            
+            # Wait for the next answer, but no longer than the nearest expiry
+            nearest = min(expires_at for _, _, _, expires_at in in_flight.values())
+            try:
+                message_id = done.get(timeout=max(0.0, nearest - time.monotonic()))
+            except queue.Empty:
+                now = time.monotonic()
+                for message_id, (index, request, sent_at, expires_at) in list(in_flight.items()):
+                    if now >= expires_at:
+                        del in_flight[message_id]
+                        self.ws.events.pop(message_id, None)
+                        self.logger.error(f"No answer for {request.name} (id {message_id}) "
+                                          f"after {now - sent_at:.2f}s")
+                        results[index] = self._record(OBSRequestResult(request, False, "Timed out",
+                                                                       now - sent_at, timed_out=True))
+                continue
+            
+            if message_id not in in_flight:
+                continue
+            index, request, sent_at, _ = in_flight.pop(message_id)
+            self.ws.events.pop(message_id, None)
+            results[index] = self._record(self._read_answer(request, message_id, time.monotonic() - sent_at))
+        
+        return results
+    
+    def _record(self, result: OBSRequestResult) -> OBSRequestResult:
+        """Count a request outcome in the metrics and the structured event log"""
+        if result.timed_out:
+            outcome = OUTCOME_TIMEOUT
+        elif not result.ok:
+            outcome = OUTCOME_FAILED
+        else:
+            outcome = OUTCOME_OK
+        with self._metrics_lock:
+            self.metrics["requests"] += 1
+            if outcome == OUTCOME_TIMEOUT:
+                self.metrics["timeouts"] += 1
+            elif outcome == OUTCOME_FAILED:
+                self.metrics["failures"] += 1
+        
+        request = result.request
+        OBS_REQUESTS.labels(request.name, outcome).inc()
+        if result.latency:
+            OBS_REQUEST_SECONDS.labels(request.name).observe(result.latency)
+        data = request.data()
+        source = data.get("inputName") or data.get("sourceName") or ""
+        match = SOURCE_NAME.match(source)
+        if match:
+            log_event(request.name, outcome, room=self.room_prefixes.get(match.group(1), ""),
+                      slot=int(match.group(2)), source=source, latency=result.latency, error=result.error)
+        else:
+            log_event(request.name, outcome, source=source, latency=result.latency, error=result.error)
+        return result
+    
+    def _send_request(self, request: Any, done: queue.Queue) -> str:
+        """Write a request to the socket without waiting for its answer"""
+        def build(message_id):
+            data = request.data()
+            if self.ws.legacy:
+                payload = {"message-id": message_id, "request-type": request.name}
+                payload.update(data)
+                return payload
+            return {
+                "op": 6,
+                "d": {
+                    "requestId": message_id,
+                    "requestType": request.name,
+                    "requestData": data
+                }
+            }
+        return self._send_message(build, done)
+    
+    def _send_message(self, build: Callable[[str], Dict[str, Any]], done: queue.Queue) -> str:
+        """Allocate a message id, register its answer slot and write the payload built for it"""
+        with self._send_lock:
+            message_id = str(self.ws.id)
+            self.ws.id += 1
+            self.ws.events[message_id] = _PipelineSlot(message_id, done)
+            
+            try:
+                self.ws.send_payload(build(message_id))
+            except Exception:
+                self.ws.events.pop(message_id, None)
+                raise
+        
+        return message_id
+    
+    def _read_answer(self, request: Any, message_id: str, latency: float) -> OBSRequestResult:
+        """Feed the stored answer for a message id into its request object"""
+        answer = self.ws.answers.pop(message_id, {})
+        if self.ws.legacy:
+            ok = answer.get('status') == 'ok'
+            request.input(answer, ok)
+            error = None if ok else answer.get('error', "Request failed")
+            return OBSRequestResult(request, ok, error, latency)
+        return self._read_response(request, answer, latency)
+    
+    def _read_response(self, request: Any, response: Dict[str, Any], latency: float) -> OBSRequestResult:
+        """Feed a v5 RequestResponse (or one batch result) into its request object"""
+        status = response.get('requestStatus', {})
+        ok = bool(status.get('result'))
+        request.input(response.get('responseData', {}), ok)
+        error = None if ok else status.get('comment', f"Request failed with code {status.get('code')}")
+        return OBSRequestResult(request, ok, error, latency)
+    
+    def call_batch(self, obs_requests: List[Any], timeout: Optional[float] = None,
+                   deadline: Optional[Deadline] = None, halt_on_failure: bool = False,
+                   lane: str = LANE_BULK) -> List[OBSRequestResult]:
+        """Send requests as one RequestBatch and wait for its single answer.
+        
+        OBS runs the batch serially in one go, so a layout lands on the same
+        frame. The batch is one command in the scheduler `lane`. Legacy (v4)
+        servers have no batches and get the requests pipelined instead.
+        """
+        if not obs_requests:
+            return []
+        if self.scheduler.running:
+            future = self.scheduler.submit(lane, partial(self._batch, obs_requests, timeout, deadline, halt_on_failure))
+            try:
+                return future.result()
+            except CancelledError:
+                return [self._record(OBSRequestResult(request, False, "Cancelled: disconnected from OBS"))
+                        for request in obs_requests]
+        return self._batch(obs_requests, timeout, deadline, halt_on_failure)
+    
+    def _batch(self, obs_requests: List[Any], timeout: Optional[float] = None,
+               deadline: Optional[Deadline] = None, halt_on_failure: bool = False) -> List[OBSRequestResult]:
+        """Send one RequestBatch and split its answer into per-request results"""
+        if not self.connected or not self.ws:
+            return [OBSRequestResult(request, False, "Not connected to OBS") for request in obs_requests]
+        if self.ws.legacy:
+            return self._pipeline(obs_requests, timeout=timeout, deadline=deadline)
+        
+        timeout = self.request_timeout if timeout is None else timeout
+        deadline = deadline or Deadline()
+        if deadline.expired():
+            return [self._record(OBSRequestResult(request, False, "Deadline exceeded", timed_out=True))
+                    for request in obs_requests]
+        
+        def build(message_id):
+            return {
+                "op": 8,
+                "d": {
+                    "requestId": message_id,
+                    "haltOnFailure": halt_on_failure,
+                    "executionType": 0,  # SerialRealtime
+                    "requests": [
+                        {"requestType": request.name, "requestId": str(index), "requestData": request.data()}
+                        for index, request in enumerate(obs_requests)
+                    ]
+                }
+            }
+        
+        done = queue.Queue()
+        try:
+            message_id = self._send_message(build, done)
+        except Exception as e:
+            self.logger.error(f"Failed to send batch of {len(obs_requests)} requests: {str(e)}")
+            return [self._record(OBSRequestResult(request, False, str(e))) for request in obs_requests]
+        sent_at = time.monotonic()
+        
+        try:
+            done.get(timeout=deadline.cap(timeout))
+        except queue.Empty:
+            self.ws.events.pop(message_id, None)
+            latency = time.monotonic() - sent_at
+            self.logger.error(f"No answer for batch of {len(obs_requests)} requests (id {message_id}) "
+                              f"after {latency:.2f}s")
+            return [self._record(OBSRequestResult(request, False, "Timed out", latency, timed_out=True))
+                    for request in obs_requests]
+        
+        self.ws.events.pop(message_id, None)
+        latency = time.monotonic() - sent_at
+        answer = self.ws.answers.pop(message_id, {})
+        responses = {response.get('requestId'): response for response in answer.get('results', [])}
+        results = []
+        for index, request in enumerate(obs_requests):
+            response = responses.get(str(index))
+            if response is None:
+                results.append(self._record(OBSRequestResult(request, False, "Not run: batch halted", latency)))
+            else:
+                results.append(self._record(self._read_response(request, response, latency)))
+        return results
+    
+    def start_stats_sampler(self, interval: float = 2.0) -> None:
+        """Poll GetStats every `interval` seconds on a background thread"""
+        if self._stats_thread and self._stats_thread.is_alive():
+            return
+        
+        self._stats_stop.clear()
+        self._stats_thread = threading.Thread(target=self._stats_loop, args=(interval,),
+                                              name="obs-stats-sampler", daemon=True)
+        self._stats_thread.start()
+        self.logger.info(f"Started OBS stats sampler ({interval}s interval)")
+    
+    def stop_stats_sampler(self) -> None:
+        """Stop the GetStats sampler"""
+        self._stats_stop.set()
+        if self._stats_thread:
+            self._stats_thread.join()
+            self._stats_thread = None
+    
+    def _stats_loop(self, interval: float) -> None:
+        while not self._stats_stop.wait(interval):
+            if self.connected and self.ws:
+                try:
+                    self.sample_stats()
+                except Exception as e:
+                    self.logger.debug(f"Stats sample failed: {str(e)}")
+    
+    def sample_stats(self) -> OBSStatsSample:
+        """Take one GetStats reading and add it to the history"""
+        # Never wait longer than one interval's worth for telemetry
+        stats = self._call(requests.GetStats(), Deadline(min(self.request_timeout, 1.0)), lane=LANE_TELEMETRY)
+        sample = OBSStatsSample(
+            timestamp=time.time(),
+            cpu_usage=stats.getCpuUsage(),
+            memory_usage=stats.getMemoryUsage(),
+            active_fps=stats.getActiveFps(),
+            average_frame_render_time=stats.getAverageFrameRenderTime(),
+            render_skipped_frames=stats.getRenderSkippedFrames(),
+            render_total_frames=stats.getRenderTotalFrames(),
+            output_skipped_frames=stats.getOutputSkippedFrames(),
+            output_total_frames=stats.getOutputTotalFrames()
+        )
+        self.stats_history.append(sample)
+        self._check_skipped_frames(sample)
+        return sample
+    
+    def _watch_skipped_frames(self) -> None:
+        """Start watching skipped frames after a source update"""
+        baseline = self.stats_history[-1].skipped_frames if self.stats_history else None
+        self._watched_update = (time.time(), baseline)
+    
+    def _check_skipped_frames(self, sample: OBSStatsSample) -> None:
+        """Warn if frames skipped since the last source update pass the threshold"""
+        if not self._watched_update:
+            return
+        
+        updated_at, baseline = self._watched_update
+        if baseline is None:
+            # No reading before the update; this one becomes the baseline
+            self._watched_update = (updated_at, sample.skipped_frames)
+            return
+        
+        skipped = sample.skipped_frames - baseline
+        if skipped > self.skipped_frames_threshold:
+            self.logger.warning(f"OBS skipped {skipped} frames in the {sample.timestamp - updated_at:.1f}s "
+                                f"after the last source update (render: {sample.render_skipped_frames}, "
+                                f"output: {sample.output_skipped_frames} total)")
+            self._watched_update = None
+        elif sample.timestamp - updated_at > self.stats_watch_window:
+            self._watched_update = None
+    
+    def get_stats_summary(self) -> List[str]:
+        """Summarize the stats history for the debug panel"""
+        samples = list(self.stats_history)
+        if not samples:
+            return ["OBS Stats: no samples"]
+        
+        first, last = samples[0], samples[-1]
+        span = last.timestamp - first.timestamp
+        return [
+            f"OBS Stats: {len(samples)} samples over {span:.0f}s",
+            f"  CPU: {last.cpu_usage:.1f}% (avg {sum(s.cpu_usage for s in samples) / len(samples):.1f}%, "
+            f"max {max(s.cpu_usage for s in samples):.1f}%)",
+            f"  Memory: {last.memory_usage:.0f} MB",
+            f"  FPS: {last.active_fps:.1f} (min {min(s.active_fps for s in samples):.1f})",
+            f"  Frame render time: {last.average_frame_render_time:.2f} ms "
+            f"(max {max(s.average_frame_render_time for s in samples):.2f} ms)",
+            f"  Skipped frames in window: render {last.render_skipped_frames - first.render_skipped_frames}, "
+            f"output {last.output_skipped_frames - first.output_skipped_frames}"
+        ]
+    
+    def update_sources(self, links: Dict[str, str], deadline: Optional[Deadline] = None,
+                       layout: Optional[Any] = None, host_label: str = "Host") -> List[OBSRequestResult]:
+        """Update OBS sources with current links, within `deadline` (sync_deadline by default).
+        
+        With a LayoutManager, each browser source is sized to its on-screen tile,
+        its link asks VDO.Ninja for a matching stream, and the sources and
+        their name labels are positioned on the grid. p0name shows `host_label`.
+        Returns the result of every request sent.
+        """
+        deadline = deadline or Deadline(self.sync_deadline)
+        self._live_updates += 1
+        started = time.monotonic()
+        trace_started = self._trace.now() if self._trace is not None else 0.0
         try:
             if not self.ws or not self.connected:
                 self.logger.error("Not connected to OBS")
-                return
+                return []
                 
             self.logger.info("Checking if VDO Assets scene exists...")
             
             # Get or create VDO Assets scene
             scene_name = "VDO Assets"
-            self._get_or_create_scene(scene_name)
+            self._get_or_create_scene(scene_name, deadline)
             
-            # Process host source
-            self.logger.info("Processing host source...")
-            self._update_host_source(links['director'])
+            # Queue host and player sources; they are sent pipelined below
+            slots = self.roster_slots(links, host_label)
+            slot_count = self._slot_count(slots)
+            self.logger.info(f"Processing host source and {slot_count - 1} player sources...")
+            source_requests = []
+            for slot, link, label in slots:
+                source_requests += self._source_requests(slot, link, label, layout, slot_count)
             
-            # Process player sources
-            player_num = 1
-            for username, link in links.items():
-                if username != "director":
-                    self.logger.info(f"Processing player {player_num}...")
-                    self._update_player_source(player_num, link)
-                    player_num += 1
+            self._set_desired(source_requests)
+            self.slot_count = slot_count
+            results = self.call_pipelined(source_requests, deadline=deadline)
+            if layout is not None and layout.layout.arrange:
+                results += self.apply_layout(layout, slot_count, deadline=deadline)
+            self._watch_skipped_frames()
+            failed = [result for result in results if not result.ok]
+            for result in failed:
+                self.logger.error(f"Failed to update {result.request.name} {result.request.data()}: {result.error}")
             
-            self.logger.info(f"Successfully updated {player_num - 1} player sources")
+            self.logger.info(f"Updated {slot_count - 1} player sources "
+                             f"({len(results) - len(failed)}/{len(results)} requests succeeded)")
+            if layout is not None:
+                self.logger.info(layout.describe_savings(slot_count))
             
+            timed_out = sum(1 for result in failed if result.timed_out)
+            if timed_out:
+                raise OBSTimeoutError(f"{timed_out} of {len(results)} source updates timed out")
+            return results
+        
+        except OBSTimeoutError as e:
+            self.logger.error(f"Timed out updating sources: {str(e)}")
+            raise
         except Exception as e:
             self.logger.error(f"Error updating sources: {str(e)}")
             raise
+        finally:
+            self._live_updates -= 1
+            self._last_live_update = time.monotonic()
+            if self._trace is not None:
+                self._trace.call("update_sources", {
+                    "links": links,
+                    "host_label": host_label,
+                    "layout": asdict(layout.layout) if layout is not None else None,
+                    "video": asdict(layout.video) if layout is not None and layout.video is not None else None
+                }, trace_started, self._last_live_update - started)
+    
+    def start_capture(self, path: str) -> None:
+        """Record every request, answer and event (and the calls behind them) to a JSONL trace"""
+        self.stop_capture()
+        self._trace = TraceWriter(path, encoding=self.encoding, pipeline_window=self.pipeline_window)
+        if self.ws is not None:
+            self.ws.message_hook = self._trace.message
+        self.logger.info(f"Capturing OBS traffic to {path}")
     
-    def _get_or_create_scene(self, scene_name: str) -> str:
+    def stop_capture(self) -> None:
+        """Stop recording and close the trace file"""
+        if self._trace is None:
+            return
+        if self.ws is not None:
+            self.ws.message_hook = None
+        self.logger.info(f"Stopped OBS capture after {self._trace.records} records ({self._trace.path})")
+        self._trace.close()
+        self._trace = None
+    
+    def _set_desired(self, source_requests: List[Any]) -> None:
+        """Remember the input settings a source update asks for"""
+        with self._desired_lock:
+            for request in source_requests:
+                if request.name == "SetInputSettings":
+                    data = request.data()
+                    self.desired_inputs.setdefault(data["inputName"], {}).update(data["inputSettings"])
+    
+    def get_desired_inputs(self) -> Dict[str, Dict[str, Any]]:
+        """Get a copy of the desired input settings"""
+        with self._desired_lock:
+            return {name: dict(settings) for name, settings in self.desired_inputs.items()}
+    
+    def live_update_idle_for(self) -> float:
+        """Seconds since the last source update finished; 0 while one is running"""
+        if self._live_updates:
+            return 0.0
+        return time.monotonic() - self._last_live_update
+    
+    def apply_layout(self, layout: Any, slot_count: int, scene_name: Optional[str] = None,
+                     deadline: Optional[Deadline] = None, prefix: str = "") -> List[OBSRequestResult]:
+        """Position a roster's sources with one RequestBatch, sending only transforms that changed.
+        
+        `prefix` is prepended to the pNvdosolo/pNname source names, for rooms
+        that share an OBS instance (see room_manager).
+        """
+        scene_name = scene_name or layout.layout.scene
+        if self.ws.legacy:
+            self.logger.warning("Automatic layout needs obs-websocket 5; sources were not arranged")
+            return []
+        
+        desired = {f"{prefix}{name}": transform for name, transform in layout.scene_transforms(slot_count).items()}
+        changed = {name: transform for name, transform in desired.items()
+                   if self._applied_transforms.get((scene_name, name)) != transform}
+        if not changed:
+            self.logger.info(f"Layout for {slot_count} slots already applied in {scene_name}")
+            return []
+        
+        item_ids = self._get_scene_item_ids(scene_name, list(changed), deadline)
+        names = [name for name in changed if name in item_ids]
+        results = self.call_batch([
+            requests.SetSceneItemTransform(sceneName=scene_name, sceneItemId=item_ids[name],
+                                           sceneItemTransform=changed[name])
+            for name in names
+        ], deadline=deadline)
+        
+        for name, result in zip(names, results):
+            if result.ok:
+                self._applied_transforms[(scene_name, name)] = changed[name]
+            else:
+                # The item may have been deleted; look it up again next time
+                self._scene_item_ids.pop((scene_name, name), None)
+                self._applied_transforms.pop((scene_name, name), None)
+                self.logger.error(f"Failed to position {name} in {scene_name}: {result.error}")
+        
+        self.logger.info(f"Arranged {slot_count} slots in {scene_name}: sent {len(names)} of "
+                         f"{len(desired)} transforms in one batch")
+        return results
+    
+    def _get_scene_item_ids(self, scene_name: str, source_names: List[str],
+                            deadline: Optional[Deadline] = None, lane: str = LANE_BULK) -> Dict[str, int]:
+        """Look up scene item ids, fetching the ones not cached yet in one batch"""
+        missing = [name for name in source_names if (scene_name, name) not in self._scene_item_ids]
+        SCENE_ITEM_HIT.inc(len(source_names) - len(missing))
+        SCENE_ITEM_MISS.inc(len(missing))
+        results = self.call_batch([requests.GetSceneItemId(sceneName=scene_name, sourceName=name)
+                                   for name in missing], deadline=deadline, lane=lane)
+        for name, result in zip(missing, results):
+            if result.ok:
+                self._scene_item_ids[(scene_name, name)] = result.request.getSceneItemId()
+            else:
+                self.logger.warning(f"{name} is not in {scene_name}")
+        return {name: self._scene_item_ids[(scene_name, name)] for name in source_names
+                if (scene_name, name) in self._scene_item_ids}
+    
+    def roster_slots(self, links: Dict[str, str], host_label: str = "Host") -> List[Tuple[int, str, str]]:
+        """Get (slot, link, label) for the host (slot 0) and each player in a links dict"""
+        # Host link is keyed "director" by older callers and "host" by App
+        host_link = links.get('director', links.get('host'))
+        player_links = [link for username, link in links.items() if username not in ("director", "host")]
+        
+        slots = []
+        if host_link is not None:
+            slots.append((0, host_link, host_label))
+        for player_num, link in enumerate(player_links, 1):
+            slots.append((player_num, link, f"Player {player_num}"))
+        return slots
+    
+    def _slot_count(self, slots: List[Tuple[int, str, str]]) -> int:
+        """Slots a roster occupies; the host slot always counts"""
+        return slots[-1][0] + 1 if slots else 1
+    
+    def roster_size(self, links: Dict[str, str]) -> int:
+        """Number of slots (host included) a links dict fills"""
+        return self._slot_count(self.roster_slots(links))
+    
+    def _browser_settings(self, slot: int, link: str, layout: Optional[Any] = None,
+                          slot_count: int = 1) -> Dict[str, Any]:
+        """Browser source settings for one slot, sized to its tile when there is a layout"""
+        browser_settings = {"url": link}
+        if layout is not None:
+            browser_settings["url"] = URLManager.append_params(link, layout.view_hints(slot, slot_count))
+            browser_settings.update(layout.browser_settings(slot, slot_count))
+        return browser_settings
+    
+    def room_inputs(self, links: Dict[str, str], layout: Optional[Any] = None) -> Dict[str, Dict[str, Any]]:
+        """Input settings for every browser and name source of a room, keyed by input name"""
+        slots = self.roster_slots(links)
+        slot_count = self._slot_count(slots)
+        inputs = {}
+        for slot, link, label in slots:
+            inputs[f"p{slot}vdosolo"] = self._browser_settings(slot, link, layout, slot_count)
+            inputs[f"p{slot}name"] = {"text": label}
+        return inputs
+    
+    def prepare_room(self, slot_count: int, layout: Optional[Any] = None,
+                     deadline: Optional[Deadline] = None) -> None:
+        """Look up the scene items a roster needs so switch_room() can position them without waiting"""
+        if layout is None or not self.connected or not self.ws or self.ws.legacy:
+            return
+        self._get_scene_item_ids(layout.layout.scene, list(layout.scene_transforms(slot_count)), deadline)
+    
+    def switch_room(self, inputs: Dict[str, Dict[str, Any]], slot_count: int, layout: Optional[Any] = None,
+                    deadline: Optional[Deadline] = None) -> List[OBSRequestResult]:
+        """Switch every source to another room's settings in one RequestBatch on the live lane.
+        
+        Slots the previous roster used but this one does not are blanked, and
+        when the roster size changes the moved tiles are repositioned in the
+        same batch (for scene items prepare_room() has looked up).
+        """
+        deadline = deadline or Deadline(self.sync_deadline)
+        inputs = dict(inputs)
+        for slot in range(slot_count, self.slot_count):
+            inputs.setdefault(f"p{slot}vdosolo", {"url": "about:blank"})
+            inputs.setdefault(f"p{slot}name", {"text": ""})
+        
+        batch = [requests.SetInputSettings(inputName=name, inputSettings=settings) for name, settings in inputs.items()]
+        moved = []  # ((scene, source), transform) in batch order
+        if layout is not None and layout.layout.arrange:
+            scene_name = layout.layout.scene
+            for name, transform in layout.scene_transforms(slot_count).items():
+                item_id = self._scene_item_ids.get((scene_name, name))
+                if item_id is not None and self._applied_transforms.get((scene_name, name)) != transform:
+                    moved.append(((scene_name, name), transform))
+                    batch.append(requests.SetSceneItemTransform(sceneName=scene_name, sceneItemId=item_id,
+                                                                sceneItemTransform=transform))
+        
+        self._live_updates += 1
+        try:
+            self._set_desired(batch[:len(inputs)])
+            results = self.call_batch(batch, deadline=deadline, lane=LANE_LIVE)
+        finally:
+            self._live_updates -= 1
+            self._last_live_update = time.monotonic()
+        
+        for (key, transform), result in zip(moved, results[len(inputs):]):
+            if result.ok:
+                self._applied_transforms[key] = transform
+        failed = [result for result in results if not result.ok]
+        for result in failed:
+            self.logger.error(f"Failed to switch {result.request.name} {result.request.data()}: {result.error}")
+        self.slot_count = slot_count
+        self._watch_skipped_frames()
+        return results
+    
+    def warm_shadow_bank(self, inputs: Dict[str, Dict[str, Any]], slot_count: int, layout: Optional[Any] = None,
+                         deadline: Optional[Deadline] = None) -> List[OBSRequestResult]:
+        """Load another room into hidden pNvdosolo_next sources so flip_shadow_bank() can put it on air.
+        
+        Missing shadow sources are created, disabled, in the layout scene
+        (VDO Assets without a layout). They keep loading while hidden, so
+        VDO.Ninja has connected by the time they are shown; with a layout they
+        are also moved onto the tiles they will occupy.
+        """
+        deadline = deadline or Deadline(self.sync_deadline)
+        scene_name = layout.layout.scene if layout is not None else "VDO Assets"
+        existing = {entry["inputName"] for entry in
+                    self._call(requests.GetInputList(inputKind="browser_source"), deadline).getInputs()}
+        
+        shadows = {}
+        for slot in range(slot_count):
+            settings = inputs.get(f"p{slot}vdosolo")
+            if settings is not None:
+                shadows[f"p{slot}vdosolo{SHADOW_SUFFIX}"] = (slot, settings)
+        batch = []
+        for name, (slot, settings) in shadows.items():
+            if name in existing:
+                batch.append(requests.SetInputSettings(inputName=name, inputSettings=settings))
+            else:
+                batch.append(requests.CreateInput(sceneName=scene_name, inputName=name, inputKind="browser_source",
+                                                  inputSettings=settings, sceneItemEnabled=False))
+        results = self.call_batch(batch, deadline=deadline)
+        
+        # Shadows that already existed may have been left visible or elsewhere on the canvas
+        item_ids = self._get_scene_item_ids(scene_name, list(shadows), deadline)
+        batch, moved = [], []
+        for name, item_id in item_ids.items():
+            batch.append(requests.SetSceneItemEnabled(sceneName=scene_name, sceneItemId=item_id,
+                                                      sceneItemEnabled=False))
+            if layout is not None and layout.layout.arrange:
+                transform = layout.video_transform(shadows[name][0], slot_count)
+                moved.append(((scene_name, name), transform, len(batch)))
+                batch.append(requests.SetSceneItemTransform(sceneName=scene_name, sceneItemId=item_id,
+                                                            sceneItemTransform=transform))
+        placed = self.call_batch(batch, deadline=deadline)
+        results += placed
+        
+        for key, transform, index in moved:
+            if placed[index].ok:
+                self._applied_transforms[key] = transform
+        for result in results:
+            if not result.ok:
+                self.logger.error(f"Failed to warm {result.request.name} {result.request.data()}: {result.error}")
+        return results
+    
+    def flip_shadow_bank(self, inputs: Dict[str, Dict[str, Any]], slot_count: int, layout: Optional[Any] = None,
+                         deadline: Optional[Deadline] = None) -> List[OBSRequestResult]:
+        """Put the room warm_shadow_bank() loaded on air in one RequestBatch on the live lane.
+        
+        Each shadow is shown and its live counterpart hidden, then the two
+        swap names, so pNvdosolo is always the source on air and the old room
+        becomes the next shadow (blanked until the next warm-up). Labels are
+        set and leftover slots blanked in the same batch. Slots without a
+        warm shadow get their settings sent cold instead.
+        """
+        deadline = deadline or Deadline(self.sync_deadline)
+        scene_name = layout.layout.scene if layout is not None else "VDO Assets"
+        names = [f"p{slot}vdosolo{suffix}" for slot in range(slot_count) for suffix in ("", SHADOW_SUFFIX)]
+        item_ids = self._get_scene_item_ids(scene_name, names, deadline, lane=LANE_LIVE)
+        
+        batch, renames, settings = [], [], {}
+        for slot in range(max(slot_count, self.slot_count)):
+            live, shadow = f"p{slot}vdosolo", f"p{slot}vdosolo{SHADOW_SUFFIX}"
+            if slot >= slot_count:
+                settings[live] = {"url": "about:blank"}
+                settings[f"p{slot}name"] = {"text": ""}
+                continue
+            settings[f"p{slot}name"] = inputs.get(f"p{slot}name", {"text": ""})
+            if shadow not in item_ids:
+                settings[live] = inputs.get(live, {"url": "about:blank"})
+                continue
+            
+            batch.append(requests.SetSceneItemEnabled(sceneName=scene_name, sceneItemId=item_ids[shadow],
+                                                      sceneItemEnabled=True))
+            if live in item_ids:
+                batch.append(requests.SetSceneItemEnabled(sceneName=scene_name, sceneItemId=item_ids[live],
+                                                          sceneItemEnabled=False))
+                batch += [
+                    requests.SetInputName(inputName=live, newInputName=f"{live}{SHADOW_SUFFIX}_swap"),
+                    requests.SetInputName(inputName=shadow, newInputName=live),
+                    requests.SetInputName(inputName=f"{live}{SHADOW_SUFFIX}_swap", newInputName=shadow)
+                ]
+                # The old room stops rendering once it is off air
+                settings[shadow] = {"url": "about:blank"}
+            else:
+                batch.append(requests.SetInputName(inputName=shadow, newInputName=live))
+            renames.append((live, shadow))
+        batch += [requests.SetInputSettings(inputName=name, inputSettings=value) for name, value in settings.items()]
+        
+        # Labels, and sources that had no shadow, move in the same batch; shadows were placed when warmed
+        moved = []  # ((scene, source), transform) at the end of the batch
+        if layout is not None and layout.layout.arrange:
+            renamed = {live for live, _ in renames}
+            for name, transform in layout.scene_transforms(slot_count).items():
+                item_id = self._scene_item_ids.get((scene_name, name))
+                if (name not in renamed and item_id is not None
+                        and self._applied_transforms.get((scene_name, name)) != transform):
+                    moved.append(((scene_name, name), transform))
+                    batch.append(requests.SetSceneItemTransform(sceneName=scene_name, sceneItemId=item_id,
+                                                                sceneItemTransform=transform))
+        
+        desired = dict(settings)
+        desired.update({live: inputs[live] for live, _ in renames if live in inputs})
+        self._live_updates += 1
+        try:
+            self._set_desired([requests.SetInputSettings(inputName=name, inputSettings=value)
+                               for name, value in desired.items() if not name.endswith(SHADOW_SUFFIX)])
+            results = self.call_batch(batch, deadline=deadline, lane=LANE_LIVE)
+        finally:
+            self._live_updates -= 1
+            self._last_live_update = time.monotonic()
+        
+        for (key, transform), result in zip(moved, results[len(results) - len(moved):]):
+            if result.ok:
+                self._applied_transforms[key] = transform
+        failed = [result for result in results if not result.ok]
+        if failed:
+            # Names may now be half swapped; look every item up again next time
+            for name in names:
+                self._scene_item_ids.pop((scene_name, name), None)
+                self._applied_transforms.pop((scene_name, name), None)
+        else:
+            # The scene items kept their ids and transforms but changed names
+            for live, shadow in renames:
+                for cache in (self._scene_item_ids, self._applied_transforms):
+                    live_value = cache.pop((scene_name, live), None)
+                    shadow_value = cache.pop((scene_name, shadow), None)
+                    if shadow_value is not None:
+                        cache[(scene_name, live)] = shadow_value
+                    if live_value is not None:
+                        cache[(scene_name, shadow)] = live_value
+        for result in failed:
+            self.logger.error(f"Failed to flip {result.request.name} {result.request.data()}: {result.error}")
+        self.slot_count = slot_count
+        self._watch_skipped_frames()
+        return results
+    
+    def _source_requests(self, slot: int, link: str, label: str, layout: Optional[Any] = None,
+                         slot_count: int = 1) -> List[Any]:
+        """Build the browser and name source requests for one slot"""
+        browser_settings = self._browser_settings(slot, link, layout, slot_count)
+        
+        if self.ws.legacy:
+            return [
+                requests.SetSourceSettings(sourceName=f"p{slot}vdosolo", sourceSettings=browser_settings),
+                requests.SetTextGDIPlusProperties(source=f"p{slot}name", text=label)
+            ]
+        return [
+            requests.SetInputSettings(inputName=f"p{slot}vdosolo", inputSettings=browser_settings),
+            requests.SetInputSettings(inputName=f"p{slot}name", inputSettings={"text": label})
+        ]
+    
+    def _get_or_create_scene(self, scene_name: str, deadline: Optional[Deadline] = None) -> str:
         """Get or create a scene"""
         try:
             # Get scene list
-            scene_list = self.ws.call(requests.GetSceneList())
+            scene_list = self._call(requests.GetSceneList(), deadline)
             scenes = scene_list.getScenes()
             
             # Check if scene exists
@@ -145,7 +1088,7 @@ class OBSManager:
                 return scene_name
             
             # Create scene if it doesn't exist
-            self.ws.call(requests.CreateScene(sceneName=scene_name))
+            self._call(requests.CreateScene(sceneName=scene_name), deadline)
             self.logger.info(f"Created {scene_name} scene")
             return scene_name
             
@@ -153,42 +1096,16 @@ class OBSManager:
             self.logger.error(f"Failed to get or create scene {scene_name}: {str(e)}")
             raise
     
-    def _update_host_source(self, link: str) -> None:
-        """Update host source"""
-        try:
-            # Update browser source for host video
-            self.update_browser_source("p0vdosolo", link)
-            
-            # Update text source for host name
-            self.update_text_source("p0name", "Host")
-            
-        except Exception as e:
-            self.logger.error(f"Failed to update host source: {str(e)}")
-            raise
-    
-    def _update_player_source(self, player_num: int, link: str) -> None:
-        """Update player source"""
-        try:
-            # Update browser source for player video
-            self.update_browser_source(f"p{player_num}vdosolo", link)
-            
-            # Update text source for player name
-            self.update_text_source(f"p{player_num}name", f"Player {player_num}")
-            
-        except Exception as e:
-            self.logger.error(f"Failed to update player {player_num} source: {str(e)}")
-            raise
-    
-    def ensure_scene_exists(self, scene_name: str) -> str:
+    def ensure_scene_exists(self, scene_name: str, deadline: Optional[Deadline] = None) -> str:
         """Ensure the specified scene exists, creating it if necessary"""
         try:
             self.logger.info(f"Checking if {scene_name} scene exists...")
-            scenes = self.ws.call(requests.GetSceneList())
+            scenes = self._call(requests.GetSceneList(), deadline)
             scene_exists = any(scene['sceneName'] == scene_name for scene in scenes.getScenes())
             
             if not scene_exists:
                 self.logger.info(f"Creating {scene_name} scene...")
-                self.ws.call(requests.CreateScene(sceneName=scene_name))
+                self._call(requests.CreateScene(sceneName=scene_name), deadline)
                 self.logger.info(f"Successfully created {scene_name} scene")
             else:
                 self.logger.debug(f"{scene_name} scene already exists")
@@ -198,26 +1115,27 @@ class OBSManager:
         except Exception as e:
             self.logger.error(f"Failed to ensure {scene_name} scene exists: {str(e)}")
             raise
-
-    def ensure_source_in_scene(self, source_name: str, scene_name: str) -> None:
+    
+    def ensure_source_in_scene(self, source_name: str, scene_name: str,
+                               deadline: Optional[Deadline] = None) -> None:
         """Ensure a source exists in the specified scene"""
         try:
             self.logger.info(f"Ensuring source {source_name} exists in scene {scene_name}")
             
             # Get scene items
-            scene_items = self.ws.call(requests.GetSceneItemList(sceneName=scene_name)).getSceneItems()
+            scene_items = self._call(requests.GetSceneItemList(sceneName=scene_name), deadline).getSceneItems()
             source_in_scene = any(item['sourceName'] == source_name for item in scene_items)
             
             if not source_in_scene:
                 self.logger.info(f"Adding source {source_name} to scene {scene_name}")
                 # Create a reference to the source in the scene
-                self.ws.call(requests.CreateInput(
+                self._call(requests.CreateInput(
                     sceneName=scene_name,
                     inputName=source_name,
                     inputKind='browser_source',
                     inputSettings={},
                     sceneItemEnabled=True
-                ))
+                ), deadline)
                 self.logger.info(f"Successfully added source {source_name} to scene {scene_name}")
             else:
                 self.logger.debug(f"Source {source_name} already exists in scene {scene_name}")
@@ -225,37 +1143,41 @@ class OBSManager:
         except Exception as e:
             self.logger.error(f"Failed to ensure source {source_name} exists in scene {scene_name}: {str(e)}")
             raise
-
-    def ensure_browser_source(self, source_name: str, url: str) -> None:
-        """Ensure a browser source exists with the given URL"""
+    
+    def ensure_browser_source(self, source_name: str, url: str, deadline: Optional[Deadline] = None,
+                              width: int = 1920, height: int = 1080, fps: Optional[int] = None) -> None:
+        """Ensure a browser source exists with the given URL, rendered at the given size"""
         try:
             settings = {
                 "url": url,
-                "width": 1920,
-                "height": 1080,
+                "width": width,
+                "height": height,
                 "reroute_audio": True
             }
+            if fps:
+                settings["fps_custom"] = True
+                settings["fps"] = fps
             
             # Try to get existing source
             try:
-                self.ws.call(requests.GetInputSettings(inputName=source_name))
+                self._call(requests.GetInputSettings(inputName=source_name), deadline)
                 # Source exists, update it
-                self.ws.call(requests.SetInputSettings(inputName=source_name, inputSettings=settings))
-            except:
+                self._call(requests.SetInputSettings(inputName=source_name, inputSettings=settings), deadline)
+            except OBSRequestError:
                 # Source doesn't exist, create it
-                self.ws.call(requests.CreateInput(
+                self._call(requests.CreateInput(
                     sceneName="VDO Assets",
                     inputName=source_name,
                     inputKind="browser_source",
                     inputSettings=settings,
                     sceneItemEnabled=True
-                ))
+                ), deadline)
             
         except Exception as e:
             self.logger.error(f"Failed to ensure browser source {source_name}: {str(e)}")
             raise
-
-    def ensure_text_source(self, source_name: str, text: str) -> None:
+    
+    def ensure_text_source(self, source_name: str, text: str, deadline: Optional[Deadline] = None) -> None:
         """Ensure a text source exists with the given text"""
         try:
             settings = {
@@ -273,24 +1195,24 @@ class OBSManager:
             
             # Try to get existing source
             try:
-                self.ws.call(requests.GetInputSettings(inputName=source_name))
+                self._call(requests.GetInputSettings(inputName=source_name), deadline)
                 # Source exists, update it
-                self.ws.call(requests.SetInputSettings(inputName=source_name, inputSettings=settings))
-            except:
+                self._call(requests.SetInputSettings(inputName=source_name, inputSettings=settings), deadline)
+            except OBSRequestError:
                 # Source doesn't exist, create it
-                self.ws.call(requests.CreateInput(
+                self._call(requests.CreateInput(
                     sceneName="VDO Assets",
                     inputName=source_name,
                     inputKind="text_gdi_plus",
                     inputSettings=settings,
                     sceneItemEnabled=True
-                ))
+                ), deadline)
             
         except Exception as e:
             self.logger.error(f"Failed to ensure text source {source_name}: {str(e)}")
             raise
-
-    def update_source(self, source_name: str, settings: dict):
+    
+    def update_source(self, source_name: str, settings: dict, deadline: Optional[Deadline] = None):
         """Update an OBS source with new settings"""
         if not self.connected:
             self.logger.error(f"Cannot update source {source_name}: Not connected to OBS")
@@ -298,7 +1220,7 @@ class OBSManager:
         
         try:
             self.logger.debug(f"Attempting to update source '{source_name}' with settings {settings}")
-            response = self.ws.call(requests.SetInputSettings(inputName=source_name, inputSettings=settings))
+            response = self._call(requests.SetInputSettings(inputName=source_name, inputSettings=settings), deadline)
             self.logger.debug(f"Response from OBS for {source_name}: {response}")
         except Exception as e:
             self.logger.error(f"Failed to update source {source_name}: {str(e)}")
@@ -0,0 +1,196 @@
+"""Replay a captured OBS trace against the stand-in server and compare it with a baseline
+    
+    python obs_replay.py show.jsonl [--baseline baseline.json] [--save-baseline baseline.json]
+                                    [--rtt MS] [--tolerance 0.05] [--time-tolerance 0.25]
+
+Traces come from OBSManager.start_capture() (OBSSettings.capture_path).
+Recorded update_sources() calls are run again through the current code, so
+changes to the sync path show up as different request counts, bytes and
+time; traces without calls have their raw requests resent instead. Without
+--baseline, the counts and bytes recorded in the trace itself are the
+baseline. Exits with status 1 when a metric regressed.
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import statistics
+import sys
+import tempfile
+from typing import Any, Dict, List, Optional
+
+from obswebsocket import requests
+
+from obs_manager import OBSManager
+from obs_standin import StandInOBSServer
+from obs_trace import load_trace, response_latencies, summarize, trace_header
+from layout_manager import LayoutManager
+from settings import LayoutSettings, VideoSettings
+
+# Metrics compared against the baseline; timing is only compared between replays
+COUNT_METRICS = ("requests", "messages_sent", "bytes_sent", "bytes_received")
+TIME_METRICS = ("call_time_s",)
+
+MANAGED_INPUT = re.compile(r"^p\d+(vdosolo|name)$")
+
+def _requests_in(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Every request sent in the trace, with batches flattened"""
+    found = []
+    for entry in entries:
+        if entry.get("dir") == "send" and entry.get("op") == 6:
+            found.append(entry["d"])
+        elif entry.get("dir") == "send" and entry.get("op") == 8:
+            found.extend(entry["d"].get("requests", []))
+    return found
+
+def build_server(entries: List[Dict[str, Any]], rtt: Optional[float] = None) -> StandInOBSServer:
+    """Stand-in with the scenes and inputs the trace touches, answering at the trace's median latency"""
+    if rtt is None:
+        latencies = response_latencies(entries)
+        rtt = statistics.median(latencies) if latencies else 0.0
+    server = StandInOBSServer(rtt=rtt)
+    server.scenes["VDO Assets"] = []
+    
+    names = set()
+    for request in _requests_in(entries):
+        data = request.get("requestData") or {}
+        names.update(data[key] for key in ("inputName", "sourceName") if key in data)
+        if data.get("sceneName"):
+            server.scenes.setdefault(data["sceneName"], [])
+    for entry in entries:
+        if entry.get("call") == "update_sources":
+            for slot in range(len(entry["args"]["links"])):
+                names.update((f"p{slot}vdosolo", f"p{slot}name"))
+    
+    for name in sorted(names):
+        if MANAGED_INPUT.match(name):
+            kind = "browser_source" if name.endswith("vdosolo") else "text_gdiplus_v2"
+            server.add_input(name, kind, {}, "VDO Assets")
+    return server
+
+def replay(entries: List[Dict[str, Any]], rtt: Optional[float] = None) -> Dict[str, Any]:
+    """Run a trace through the current code against a stand-in and summarize the new traffic"""
+    header = trace_header(entries) or {}
+    server = build_server(entries, rtt)
+    port = server.start()
+    manager = OBSManager(encoding=header.get("encoding", "json"), pipeline_window=header.get("pipeline_window", 8))
+    fd, capture_path = tempfile.mkstemp(suffix=".jsonl")
+    os.close(fd)
+    try:
+        manager.start_capture(capture_path)
+        manager.connect(host="127.0.0.1", port=port)
+        calls = [entry for entry in entries if "call" in entry]
+        if calls:
+            for entry in calls:
+                _replay_call(manager, entry)
+        else:
+            _replay_requests(manager, entries)
+    finally:
+        manager.stop_capture()
+        manager.disconnect()
+        server.stop()
+    
+    summary = summarize(load_trace(capture_path))
+    os.remove(capture_path)
+    summary["rtt_s"] = server.rtt
+    return summary
+
+def _replay_call(manager: OBSManager, entry: Dict[str, Any]) -> None:
+    """Run one recorded OBSManager call again"""
+    if entry["call"] != "update_sources":
+        logging.warning(f"Skipping unknown call {entry['call']}")
+        return
+    args = entry["args"]
+    layout = None
+    if args.get("layout") is not None:
+        video = VideoSettings(**args["video"]) if args.get("video") else None
+        layout = LayoutManager(LayoutSettings(**args["layout"]), video)
+    try:
+        manager.update_sources(args["links"], layout=layout, host_label=args.get("host_label", "Host"))
+    except Exception as e:
+        logging.warning(f"Replayed update_sources failed: {str(e)}")
+
+def _replay_requests(manager: OBSManager, entries: List[Dict[str, Any]], gap: float = 0.05) -> None:
+    """Resend recorded requests, keeping together the ones that were sent in one burst"""
+    burst, last_sent = [], None
+    
+    def flush():
+        if burst:
+            manager.call_pipelined([getattr(requests, request["requestType"])(**(request.get("requestData") or {}))
+                                    for request in burst])
+            burst.clear()
+    
+    for entry in entries:
+        if entry.get("dir") != "send" or entry.get("op") not in (6, 8):
+            continue
+        if last_sent is not None and entry["t"] - last_sent > gap:
+            flush()
+        last_sent = entry["t"]
+        if entry["op"] == 6:
+            burst.append(entry["d"])
+        else:
+            flush()
+            manager.call_batch([getattr(requests, request["requestType"])(**(request.get("requestData") or {}))
+                                for request in entry["d"].get("requests", [])])
+    flush()
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float,
+            time_tolerance: Optional[float]) -> List[str]:
+    """Print current vs baseline metrics; returns the names of metrics that regressed"""
+    regressions = []
+    metrics = [(name, tolerance) for name in COUNT_METRICS]
+    if time_tolerance is not None:
+        metrics += [(name, time_tolerance) for name in TIME_METRICS]
+    
+    print(f"{'metric':<16} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, allowed in metrics:
+        if name not in baseline:
+            continue
+        before, after = baseline[name], current.get(name, 0)
+        change = (after - before) / before if before else 0.0
+        regressed = after > before * (1 + allowed) and after > before
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<16} {before:>12} {after:>12} {change:>+7.1%}{'  REGRESSED' if regressed else ''}")
+    
+    for request_type in sorted(set(baseline.get("by_type", {})) | set(current.get("by_type", {}))):
+        before = baseline.get("by_type", {}).get(request_type, 0)
+        after = current.get("by_type", {}).get(request_type, 0)
+        if before != after:
+            print(f"  {request_type}: {before} -> {after}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("trace", help="JSONL trace recorded by OBSManager.start_capture()")
+    parser.add_argument("--baseline", help="Baseline JSON saved by an earlier replay")
+    parser.add_argument("--save-baseline", help="Write this replay's metrics as a baseline")
+    parser.add_argument("--rtt", type=float, help="Stand-in round-trip time in ms (default: the trace's median)")
+    parser.add_argument("--tolerance", type=float, default=0.05, help="Allowed growth of counts and bytes")
+    parser.add_argument("--time-tolerance", type=float, default=0.25, help="Allowed growth of call time")
+    args = parser.parse_args()
+    
+    logging.getLogger("obs_manager").setLevel(logging.WARNING)
+    entries = load_trace(args.trace)
+    current = replay(entries, None if args.rtt is None else args.rtt / 1000.0)
+    
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        time_tolerance = args.time_tolerance
+    else:
+        # A trace from a real OBS has comparable traffic but not comparable timing
+        baseline = summarize(entries)
+        time_tolerance = None
+    regressions = compare(current, baseline, args.tolerance, time_tolerance)
+    
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(current, f, indent=4)
+    if regressions:
+        print(f"Regressed: {', '.join(regressions)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+import logging
+import threading
+import time
+
+# Lanes from highest to lowest priority
+LANE_INTERACTIVE = "interactive"  # Operator edits such as renaming a pNname label
+LANE_LIVE = "live"  # Swaps that change what is on air
+LANE_BULK = "bulk"  # Provisioning and full source syncs
+LANE_RECONCILE = "reconcile"  # Drift checks and repairs
+LANE_TELEMETRY = "telemetry"  # GetStats sampling
+LANES = (LANE_INTERACTIVE, LANE_LIVE, LANE_BULK, LANE_RECONCILE, LANE_TELEMETRY)
+
+# Lanes that may not take the workers kept free for interactive and live commands
+BACKGROUND_LANES = (LANE_BULK, LANE_RECONCILE, LANE_TELEMETRY)
+
+@dataclass
+class _Command:
+    """One unit of OBS work waiting in a lane"""
+    lane: str
+    run: Callable[[], Any]
+    future: Future
+    queued_at: float = field(default_factory=time.monotonic)
+
+class _TokenBucket:
+    """Allows `rate` commands per second on average, with bursts of up to `burst`"""
+    
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.tokens = self.burst
+        self.updated_at = time.monotonic()
+    
+    def wait_time(self, now: float) -> float:
+        """Seconds until a token is available (0 if one is available now)"""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+    
+    def take(self) -> None:
+        self.tokens -= 1
+
+class OBSScheduler:
+    """Runs OBS commands from prioritized lanes on a pool of worker threads.
+    
+    Workers always take the oldest command of the highest-priority lane that
+    is allowed to run, so an interactive edit only waits for a worker to free
+    up, never behind a queue of bulk updates. On top of that:
+    
+    - `lane_rates` caps lanes at a number of commands per second;
+    - `reserved_workers` workers are kept free for interactive and live
+      commands, so background lanes cannot occupy the whole pool;
+    - a command that has waited `max_wait` seconds is served before newer,
+      higher-priority ones, so low lanes are never starved.
+    
+    Queueing delay (submit to start) is recorded per lane.
+    """
+    
+    def __init__(self, workers: int = 8, lane_rates: Optional[Dict[str, float]] = None,
+                 max_wait: float = 2.0, reserved_workers: int = 1, history: int = 1000):
+        self.workers = max(1, workers)
+        self.reserved_workers = min(reserved_workers, self.workers - 1)
+        self.max_wait = max_wait
+        
+        self._queues: Dict[str, Deque[_Command]] = {lane: deque() for lane in LANES}
+        self._buckets: Dict[str, _TokenBucket] = {
+            lane: _TokenBucket(rate) for lane, rate in (lane_rates or {}).items() if lane in LANES and rate > 0
+        }
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._busy_background = 0
+        self.running = False
+        
+        # Per-lane queueing delays (seconds) of recent commands, and totals
+        self.delays: Dict[str, Deque[float]] = {lane: deque(maxlen=history) for lane in LANES}
+        self.counts: Dict[str, int] = {lane: 0 for lane in LANES}
+        self.starvation_promotions = 0
+        
+        self.logger = logging.getLogger(__name__)
+    
+    def start(self) -> None:
+        """Start the worker threads"""
+        with self._cond:
+            if self.running:
+                return
+            self.running = True
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"obs-scheduler-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+    
+    def stop(self) -> None:
+        """Stop the workers and cancel commands that have not started"""
+        with self._cond:
+            self.running = False
+            for queue in self._queues.values():
+                while queue:
+                    queue.popleft().future.cancel()
+            self._cond.notify_all()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join()
+        self._threads = []
+    
+    def submit(self, lane: str, run: Callable[[], Any]) -> Future:
+        """Queue `run` in a lane; the returned future holds its result"""
+        if lane not in self._queues:
+            raise ValueError(f"Unknown OBS scheduler lane: {lane}")
+        command = _Command(lane, run, Future())
+        with self._cond:
+            if not self.running:
+                command.future.cancel()
+                return command.future
+            self._queues[lane].append(command)
+            self._cond.notify()
+        return command.future
+    
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if not self.running:
+                        return
+                    command, wait = self._next_command()
+                    if command is not None:
+                        break
+                    self._cond.wait(wait)
+                
+                delay = time.monotonic() - command.queued_at
+                self.delays[command.lane].append(delay)
+                self.counts[command.lane] += 1
+                background = command.lane in BACKGROUND_LANES
+                if background:
+                    self._busy_background += 1
+            
+            try:
+                if command.future.set_running_or_notify_cancel():
+                    try:
+                        command.future.set_result(command.run())
+                    except Exception as e:
+                        command.future.set_exception(e)
+            finally:
+                if background:
+                    with self._cond:
+                        self._busy_background -= 1
+                        self._cond.notify_all()
+    
+    def _next_command(self) -> Tuple[Optional[_Command], Optional[float]]:
+        """Pop the command to run next, or say how long to wait (called with the lock held)"""
+        now = time.monotonic()
+        wait = None
+        eligible = []
+        for lane in LANES:
+            queue = self._queues[lane]
+            if not queue:
+                continue
+            if lane in BACKGROUND_LANES and self._busy_background >= self.workers - self.reserved_workers:
+                continue
+            bucket = self._buckets.get(lane)
+            if bucket is not None:
+                lane_wait = bucket.wait_time(now)
+                if lane_wait > 0:
+                    wait = lane_wait if wait is None else min(wait, lane_wait)
+                    continue
+            eligible.append(lane)
+        
+        if not eligible:
+            return None, wait
+        
+        # Starvation protection: anything that waited too long goes first, oldest first
+        lane = eligible[0]
+        starved = [name for name in eligible if now - self._queues[name][0].queued_at >= self.max_wait]
+        if starved:
+            oldest = min(starved, key=lambda name: self._queues[name][0].queued_at)
+            if oldest != lane:
+                self.starvation_promotions += 1
+            lane = oldest
+        
+        if lane in self._buckets:
+            self._buckets[lane].take()
+        return self._queues[lane].popleft(), None
+    
+    def queue_lengths(self) -> Dict[str, int]:
+        """Commands waiting in each lane"""
+        with self._cond:
+            return {lane: len(queue) for lane, queue in self._queues.items()}
+    
+    def lane_stats(self) -> Dict[str, Dict[str, float]]:
+        """Queueing delay percentiles (seconds) of recent commands per lane"""
+        stats = {}
+        for lane in LANES:
+            delays = sorted(self.delays[lane])
+            if not delays:
+                continue
+            stats[lane] = {
+                "count": self.counts[lane],
+                "p50": delays[len(delays) // 2],
+                "p95": delays[min(len(delays) - 1, int(len(delays) * 0.95))],
+                "max": delays[-1]
+            }
+        return stats
+    
+    def describe(self) -> List[str]:
+        """Summarize per-lane queueing delay for the debug panel"""
+        lines = [f"OBS scheduler: {self.workers} workers, {self.starvation_promotions} starvation promotions"]
+        waiting = self.queue_lengths()
+        for lane, stats in self.lane_stats().items():
+            lines.append(f"  {lane}: {stats['count']} commands, queued p50 {stats['p50'] * 1000:.1f}ms, "
+                         f"p95 {stats['p95'] * 1000:.1f}ms, max {stats['max'] * 1000:.1f}ms, "
+                         f"{waiting[lane]} waiting")
+        return lines
@@ -0,0 +1,396 @@
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import websockets
+
+from obs_codec import CODECS, JSONCodec, MsgpackCodec, msgpack
+
+class StandInOBSServer:
+    """Local stand-in for an obs-websocket v5 server with simulated round-trip time
+    
+    Answers enough of the protocol (Hello/Identify, Request/RequestResponse and
+    RequestBatch/RequestBatchResponse) for OBSManager to run against it, and keeps a small in-memory model of
+    scenes and inputs. Every response is delayed by `rtt` seconds without
+    blocking the requests behind it, so several requests can be in flight.
+    Like OBS, it accepts the obswebsocket.json and obswebsocket.msgpack
+    subprotocols.
+    """
+    
+    # Defaults OBS reports for the input kinds vidLinker manages
+    DEFAULT_SETTINGS = {
+        "browser_source": {"url": "https://obsproject.com/browser-source", "width": 800, "height": 600,
+                           "fps_custom": False, "fps": 30, "shutdown": False, "restart_when_active": False},
+        "text_gdiplus_v2": {"text": ""},
+        "text_ft2_source_v2": {"text": ""},
+    }
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, rtt: float = 0.0,
+                 processing_time: float = 0.0):
+        self.host = host
+        self.port = port
+        self.rtt = rtt
+        self.processing_time = processing_time
+        
+        # scene name -> scene items; inputs by name; what is on program/preview
+        self.scenes: Dict[str, List[Dict[str, Any]]] = {"Scene": []}
+        self.inputs: Dict[str, Dict[str, Any]] = {}
+        self.program_scene = "Scene"
+        self.preview_scene: Optional[str] = None  # None while studio mode is off
+        self._next_item_id = 1
+        self.request_count = 0
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        
+        # requestType -> handler(requestData) -> (ok, responseData)
+        self.handlers: Dict[str, Callable[[Dict[str, Any]], Tuple[bool, Dict[str, Any]]]] = {
+            "GetVersion": self._get_version,
+            "GetSceneList": self._get_scene_list,
+            "CreateScene": self._create_scene,
+            "GetCurrentProgramScene": self._get_current_program_scene,
+            "SetCurrentProgramScene": self._set_current_program_scene,
+            "GetCurrentPreviewScene": self._get_current_preview_scene,
+            "SetCurrentPreviewScene": self._set_current_preview_scene,
+            "GetSceneItemList": self._get_scene_item_list,
+            "GetSceneItemId": self._get_scene_item_id,
+            "SetSceneItemEnabled": self._set_scene_item_enabled,
+            "GetSceneItemTransform": self._get_scene_item_transform,
+            "SetSceneItemTransform": self._set_scene_item_transform,
+            "GetInputList": self._get_input_list,
+            "GetInputSettings": self._get_input_settings,
+            "GetInputDefaultSettings": self._get_input_default_settings,
+            "SetInputSettings": self._set_input_settings,
+            "CreateInput": self._create_input,
+            "SetInputName": self._set_input_name,
+            "GetStats": self._get_stats,
+        }
+        self._clients = set()  # (websocket, codec) pairs that receive events
+        self._started_at = time.monotonic()
+        self._skipped_frames = 0.0
+        self._last_stats_at = self._started_at
+        
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._server = None
+        self._started = threading.Event()
+        self._processing_lock: Optional[asyncio.Lock] = None
+    
+    def start(self) -> int:
+        """Start serving in a background thread and return the bound port"""
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._started.wait()
+        return self.port
+    
+    def stop(self) -> None:
+        """Stop the server and its event loop"""
+        if self._loop and self._server:
+            async def shutdown():
+                self._server.close()
+                await self._server.wait_closed()
+            asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread:
+            self._thread.join()
+    
+    def _run(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._processing_lock = asyncio.Lock()
+        subprotocols = [JSONCodec.subprotocol]
+        if msgpack is not None:
+            subprotocols.append(MsgpackCodec.subprotocol)
+        self._server = self._loop.run_until_complete(
+            websockets.serve(self._handle_client, self.host, self.port, subprotocols=subprotocols)
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._started.set()
+        self._loop.run_forever()
+    
+    async def _handle_client(self, websocket) -> None:
+        """Run the handshake, then answer requests as they arrive"""
+        codec = CODECS.get(websocket.subprotocol, CODECS[JSONCodec.subprotocol])
+        await self._send(websocket, codec, {"op": 0, "d": {"obsWebSocketVersion": "5.0.0", "rpcVersion": 1}})
+        identify = self._decode(codec, await websocket.recv())
+        if identify.get("op") != 1:
+            return
+        await self._send(websocket, codec, {"op": 2, "d": {"negotiatedRpcVersion": 1}})
+        
+        client = (websocket, codec)
+        self._clients.add(client)
+        try:
+            async for message in websocket:
+                payload = self._decode(codec, message)
+                if payload.get("op") == 6:
+                    asyncio.ensure_future(self._answer(websocket, codec, payload["d"]))
+                elif payload.get("op") == 8:
+                    asyncio.ensure_future(self._answer_batch(websocket, codec, payload["d"]))
+        finally:
+            self._clients.discard(client)
+    
+    def emit(self, event_type: str, data: Dict[str, Any]) -> None:
+        """Send an event (op 5) to every identified client"""
+        for websocket, codec in list(self._clients):
+            message = {"op": 5, "d": {"eventType": event_type, "eventIntent": 0, "eventData": data}}
+            asyncio.ensure_future(self._send(websocket, codec, message), loop=self._loop)
+    
+    async def _answer(self, websocket, codec, request: Dict[str, Any]) -> None:
+        """Answer one request after the simulated round trip"""
+        if self.rtt:
+            await asyncio.sleep(self.rtt)
+        async with self._processing_lock:
+            if self.processing_time:
+                await asyncio.sleep(self.processing_time)
+            response = self._response(request)
+        try:
+            await self._send(websocket, codec, {"op": 7, "d": response})
+        except websockets.ConnectionClosed:
+            pass
+    
+    async def _answer_batch(self, websocket, codec, batch: Dict[str, Any]) -> None:
+        """Run a request batch serially and answer it in one message after the round trip"""
+        if self.rtt:
+            await asyncio.sleep(self.rtt)
+        results = []
+        async with self._processing_lock:
+            for request in batch.get("requests", []):
+                if self.processing_time:
+                    await asyncio.sleep(self.processing_time)
+                results.append(self._response(request))
+                if batch.get("haltOnFailure") and not results[-1]["requestStatus"]["result"]:
+                    break
+        try:
+            await self._send(websocket, codec, {"op": 9, "d": {"requestId": batch["requestId"], "results": results}})
+        except websockets.ConnectionClosed:
+            pass
+    
+    def _response(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle one request and build its RequestResponse data"""
+        ok, data = self.handle_request(request["requestType"], request.get("requestData") or {})
+        response = {
+            "requestType": request["requestType"],
+            "requestStatus": {"result": ok, "code": 100 if ok else 600},
+            "responseData": data,
+        }
+        if "requestId" in request:
+            response["requestId"] = request["requestId"]
+        if not ok:
+            response["requestStatus"]["comment"] = data.pop("comment", "Request failed")
+        return response
+    
+    def handle_request(self, request_type: str, data: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
+        """Dispatch a request to its handler; unknown requests succeed with no data"""
+        self.request_count += 1
+        handler = self.handlers.get(request_type)
+        if handler is None:
+            return True, {}
+        return handler(data)
+    
+    async def _send(self, websocket, codec, payload: Dict[str, Any]) -> None:
+        message = codec.encode(payload)
+        self.bytes_sent += len(message)
+        await websocket.send(message)
+    
+    def _decode(self, codec, message) -> Dict[str, Any]:
+        self.bytes_received += len(message)
+        return codec.decode(message)
+    
+    def _get_version(self, data):
+        return True, {"obsVersion": "30.0.0-standin", "obsWebSocketVersion": "5.0.0", "rpcVersion": 1}
+    
+    def add_input(self, name: str, kind: str = "browser_source", settings: Optional[Dict[str, Any]] = None,
+                  scene: Optional[str] = None, enabled: bool = True) -> int:
+        """Create an input, optionally placing it in a scene; returns the scene item id"""
+        self.inputs[name] = {"inputKind": kind, "inputSettings": dict(settings or {}), "sceneName": scene}
+        return self.add_scene_item(scene, name, enabled=enabled) if scene else 0
+    
+    def add_scene_item(self, scene: str, source_name: str, enabled: bool = True) -> int:
+        """Place an existing input or scene into a scene; returns the scene item id"""
+        item_id = self._next_item_id
+        self._next_item_id += 1
+        is_scene = source_name in self.scenes
+        self.scenes.setdefault(scene, []).append({
+            "sceneItemId": item_id,
+            "sourceName": source_name,
+            "sourceType": "OBS_SOURCE_TYPE_SCENE" if is_scene else "OBS_SOURCE_TYPE_INPUT",
+            "inputKind": None if is_scene else self.inputs[source_name]["inputKind"],
+            "isGroup": False if is_scene else None,
+            "sceneItemEnabled": enabled,
+            "sceneItemTransform": {},
+        })
+        return item_id
+    
+    def _find_item(self, data):
+        for item in self.scenes.get(data.get("sceneName"), []):
+            if item["sceneItemId"] == data.get("sceneItemId") or item["sourceName"] == data.get("sourceName"):
+                return item
+        return None
+    
+    def _get_scene_list(self, data):
+        return True, {
+            "currentProgramSceneName": self.program_scene,
+            "currentPreviewSceneName": self.preview_scene,
+            "scenes": [{"sceneName": name, "sceneIndex": i} for i, name in enumerate(self.scenes)]
+        }
+    
+    def _create_scene(self, data):
+        if data.get("sceneName") in self.scenes:
+            return False, {"comment": "A scene already exists by that scene name."}
+        self.scenes[data.get("sceneName")] = []
+        return True, {}
+    
+    def _get_current_program_scene(self, data):
+        return True, {"currentProgramSceneName": self.program_scene, "sceneName": self.program_scene}
+    
+    def _set_current_program_scene(self, data):
+        if data.get("sceneName") not in self.scenes:
+            return False, {"comment": "No source was found by the name of `sceneName`."}
+        self.program_scene = data["sceneName"]
+        self.emit("CurrentProgramSceneChanged", {"sceneName": self.program_scene})
+        return True, {}
+    
+    def _get_current_preview_scene(self, data):
+        if self.preview_scene is None:
+            return False, {"comment": "Studio mode is not active."}
+        return True, {"currentPreviewSceneName": self.preview_scene, "sceneName": self.preview_scene}
+    
+    def _set_current_preview_scene(self, data):
+        if data.get("sceneName") not in self.scenes:
+            return False, {"comment": "No source was found by the name of `sceneName`."}
+        self.preview_scene = data["sceneName"]
+        self.emit("CurrentPreviewSceneChanged", {"sceneName": self.preview_scene})
+        return True, {}
+    
+    def _get_scene_item_list(self, data):
+        if data.get("sceneName") not in self.scenes:
+            return False, {"comment": "No source was found by the name of `sceneName`."}
+        return True, {"sceneItems": [dict(item) for item in self.scenes[data["sceneName"]]]}
+    
+    def _get_scene_item_id(self, data):
+        item = self._find_item(data)
+        if item is None:
+            return False, {"comment": "No scene items were found in the specified scene by that name."}
+        return True, {"sceneItemId": item["sceneItemId"]}
+    
+    def _set_scene_item_enabled(self, data):
+        item = self._find_item(data)
+        if item is None:
+            return False, {"comment": "No scene item was found by that id."}
+        item["sceneItemEnabled"] = bool(data.get("sceneItemEnabled"))
+        return True, {}
+    
+    def _get_scene_item_transform(self, data):
+        item = self._find_item(data)
+        if item is None:
+            return False, {"comment": "No scene item was found by that id."}
+        return True, {"sceneItemTransform": dict(item["sceneItemTransform"])}
+    
+    def _set_scene_item_transform(self, data):
+        item = self._find_item(data)
+        if item is None:
+            return False, {"comment": "No scene item was found by that id."}
+        item["sceneItemTransform"].update(data.get("sceneItemTransform") or {})
+        return True, {}
+    
+    def _get_input_list(self, data):
+        kind = data.get("inputKind")
+        return True, {"inputs": [
+            {"inputName": name, "inputKind": entry["inputKind"], "unversionedInputKind": entry["inputKind"]}
+            for name, entry in self.inputs.items() if not kind or entry["inputKind"] == kind
+        ]}
+    
+    def _get_input_settings(self, data):
+        entry = self.inputs.get(data.get("inputName"))
+        if entry is None:
+            return False, {"comment": "No source was found by the name of `inputName`."}
+        return True, {"inputKind": entry["inputKind"], "inputSettings": dict(entry["inputSettings"])}
+    
+    def _get_input_default_settings(self, data):
+        return True, {"defaultInputSettings": dict(self.DEFAULT_SETTINGS.get(data.get("inputKind"), {}))}
+    
+    def _set_input_settings(self, data):
+        entry = self.inputs.get(data.get("inputName"))
+        if entry is None:
+            return False, {"comment": "No source was found by the name of `inputName`."}
+        entry["inputSettings"].update(data.get("inputSettings") or {})
+        return True, {}
+    
+    def _create_input(self, data):
+        name = data.get("inputName")
+        if name in self.inputs:
+            return False, {"comment": "A source already exists by that input name."}
+        if data.get("sceneName") not in self.scenes:
+            return False, {"comment": "No source was found by the name of `sceneName`."}
+        item_id = self.add_input(name, data.get("inputKind"), data.get("inputSettings"), data.get("sceneName"),
+                                 data.get("sceneItemEnabled", True))
+        return True, {"sceneItemId": item_id}
+    
+    def _set_input_name(self, data):
+        name, new_name = data.get("inputName"), data.get("newInputName")
+        if name not in self.inputs:
+            return False, {"comment": "No source was found by the name of `inputName`."}
+        if new_name in self.inputs:
+            return False, {"comment": "A source already exists by that new input name."}
+        self.inputs[new_name] = self.inputs.pop(name)
+        for scene in self.scenes.values():
+            for item in scene:
+                if item["sourceName"] == name:
+                    item["sourceName"] = new_name
+        self.emit("InputNameChanged", {"oldInputName": name, "inputName": new_name})
+        return True, {}
+    
+    def browser_load(self) -> float:
+        """Rendering load of live browser sources, in full-HD 30 fps equivalents"""
+        load = 0.0
+        for name, entry in self.inputs.items():
+            settings = entry["inputSettings"]
+            if entry["inputKind"] != "browser_source" or settings.get("shutdown"):
+                continue
+            pixels = settings.get("width", 800) * settings.get("height", 600) * settings.get("fps", 30)
+            
+            # A source hidden in every scene keeps its page running but is not composited
+            items = [item for scene in self.scenes.values() for item in scene if item["sourceName"] == name]
+            weight = 0.5 if items and not any(item["sceneItemEnabled"] for item in items) else 1.0
+            load += weight * pixels / (1920 * 1080 * 30)
+        return load
+    
+    def _get_stats(self, data):
+        # Crude model: each full-HD browser source costs ~4% CPU, and past eight
+        # of them the compositor starts skipping a share of its frames
+        now = time.monotonic()
+        load = self.browser_load()
+        self._skipped_frames += max(0.0, load - 8) / load * 60 * (now - self._last_stats_at) if load else 0.0
+        self._last_stats_at = now
+        rendered = int((now - self._started_at) * 60)
+        return True, {
+            "cpuUsage": 1.5 + 4.0 * load,
+            "memoryUsage": 300.0 + 90.0 * len(self.inputs),
+            "availableDiskSpace": 100000.0,
+            "activeFps": 60.0 - min(59.0, max(0.0, load - 8) * 4),
+            "averageFrameRenderTime": 0.8 + 0.6 * load,
+            "renderSkippedFrames": int(self._skipped_frames),
+            "renderTotalFrames": rendered,
+            "outputSkippedFrames": 0,
+            "outputTotalFrames": rendered,
+            "webSocketSessionIncomingMessages": self.request_count,
+            "webSocketSessionOutgoingMessages": self.request_count,
+        }
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Run a local stand-in obs-websocket v5 server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4455)
+    parser.add_argument("--rtt", type=float, default=0.0, help="Simulated round-trip time in seconds")
+    args = parser.parse_args()
+    
+    server = StandInOBSServer(args.host, args.port, args.rtt)
+    port = server.start()
+    print(f"Stand-in OBS server listening on ws://{args.host}:{port} (rtt={args.rtt * 1000:.0f} ms)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
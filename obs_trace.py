@@ -0,0 +1,112 @@
+from typing import Any, Dict, List, Optional
+from collections import Counter
+import json
+import threading
+import time
+
+TRACE_VERSION = 1
+
+class TraceWriter:
+    """Appends OBS websocket traffic to a JSONL trace file.
+    
+    The first line is a header; every other line is one message or call:
+        
+        {"t": 0.0123, "dir": "send", "op": 6, "n": 141, "d": {...}}
+        {"t": 0.0348, "dir": "recv", "op": 7, "n": 118, "d": {...}}
+        {"t": 0.0001, "call": "update_sources", "args": {...}, "dur": 0.41}
+    
+    `t` is seconds since the capture started and `n` the message size on the
+    wire. Calls record the OBSManager entry point that produced the traffic,
+    so a replay can run the same operation through the current code.
+    """
+    
+    def __init__(self, path: str, **header: Any):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self.records = 0
+        self._write({"trace": TRACE_VERSION, "started": time.strftime("%Y-%m-%dT%H:%M:%S"), **header})
+    
+    def now(self) -> float:
+        return round(time.monotonic() - self._started, 6)
+    
+    def message(self, direction: str, payload: Dict[str, Any], size: int) -> None:
+        """Record one protocol message sent or received"""
+        self._write({"t": self.now(), "dir": direction, "op": payload.get("op"), "n": size, "d": payload.get("d")})
+    
+    def call(self, method: str, args: Dict[str, Any], started: float, duration: float) -> None:
+        """Record an OBSManager call and how long it took"""
+        self._write({"t": started, "call": method, "args": args, "dur": round(duration, 6)})
+    
+    def _write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, separators=(",", ":"), default=str)
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.records += 1
+    
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+def load_trace(path: str) -> List[Dict[str, Any]]:
+    """Read a trace file; the header is the first entry"""
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def response_latencies(entries: List[Dict[str, Any]]) -> List[float]:
+    """Seconds between each request (or batch) and its answer"""
+    sent = {}
+    latencies = []
+    for entry in entries:
+        if entry.get("op") in (6, 8) and entry.get("dir") == "send":
+            sent[entry["d"]["requestId"]] = entry["t"]
+        elif entry.get("op") in (7, 9) and entry.get("dir") == "recv":
+            started = sent.pop(entry["d"].get("requestId"), None)
+            if started is not None:
+                latencies.append(entry["t"] - started)
+    return latencies
+
+def summarize(entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Count requests, messages and bytes in a trace, and total the recorded call time"""
+    by_type = Counter()
+    summary = {
+        "requests": 0,
+        "messages_sent": 0,
+        "messages_received": 0,
+        "bytes_sent": 0,
+        "bytes_received": 0,
+        "events": 0,
+        "calls": 0,
+        "call_time_s": 0.0
+    }
+    for entry in entries:
+        if "call" in entry:
+            summary["calls"] += 1
+            summary["call_time_s"] += entry.get("dur", 0.0)
+            continue
+        op = entry.get("op")
+        if entry.get("dir") == "send" and op in (6, 8):
+            summary["messages_sent"] += 1
+            summary["bytes_sent"] += entry.get("n", 0)
+            batch = entry["d"].get("requests") if op == 8 else [entry["d"]]
+            for request in batch:
+                by_type[request["requestType"]] += 1
+            summary["requests"] += len(batch)
+        elif entry.get("dir") == "recv" and op in (7, 9):
+            summary["messages_received"] += 1
+            summary["bytes_received"] += entry.get("n", 0)
+        elif entry.get("dir") == "recv" and op == 5:
+            summary["events"] += 1
+    summary["call_time_s"] = round(summary["call_time_s"], 6)
+    summary["by_type"] = dict(sorted(by_type.items()))
+    return summary
+
+def trace_header(entries: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Get the trace header, if the file has one"""
+    return entries[0] if entries and "trace" in entries[0] else None
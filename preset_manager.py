@@ -0,0 +1,112 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+import json
+import logging
+import os
+import time
+
+from obs_manager import OBSManager, Deadline
+from settings import RoomSettings
+from vdo_ninja_manager import VDONinjaManager
+
+@dataclass
+class RoomPreset:
+    """A room loaded ahead of time, with its links and OBS input settings worked out"""
+    name: str
+    path: str
+    room: RoomSettings
+    links: Dict[str, str]
+    inputs: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    slot_count: int = 1
+
+class PresetManager:
+    """Keeps several room configurations in memory and hot-swaps OBS between them.
+    
+    Loading a preset parses its room file, generates every link and the
+    input settings for each pNvdosolo/pNname source up front, and looks up
+    the scene items its layout needs. Activating it then only has to send
+    one RequestBatch on the scheduler's live lane.
+    """
+    
+    def __init__(self, obs_manager: OBSManager, vdo_ninja: VDONinjaManager, layout_manager: Optional[Any] = None):
+        self.obs = obs_manager
+        self.vdo_ninja = vdo_ninja
+        self.layout = layout_manager
+        self.presets: List[RoomPreset] = []
+        self.active: Optional[RoomPreset] = None
+        self.last_switch_ms: Optional[float] = None
+        self.logger = logging.getLogger(__name__)
+    
+    def load(self, path: str) -> RoomPreset:
+        """Parse a room configuration file and precompute everything a switch sends"""
+        with open(path, 'r') as f:
+            room_data = json.load(f)
+        room = RoomSettings()
+        room.from_dict(room_data)
+        
+        preset = RoomPreset(
+            name=room.room_name or os.path.splitext(os.path.basename(path))[0],
+            path=path,
+            room=room,
+            links=self.vdo_ninja.generate_room_links(room.room_name, room.room_password,
+                                                     host_username=room.host_username,
+                                                     host_character=room.host_character,
+                                                     players=room.players)
+        )
+        self._prepare(preset)
+        self.presets.append(preset)
+        self.logger.info(f"Preloaded room preset {preset.name} ({len(preset.links) - 1} players) from {path}")
+        return preset
+    
+    def load_all(self, paths: List[str]) -> List[RoomPreset]:
+        """Preload several room files, skipping ones that fail"""
+        loaded = []
+        for path in paths:
+            try:
+                loaded.append(self.load(path))
+            except Exception as e:
+                self.logger.error(f"Failed to preload room preset {path}: {str(e)}")
+        return loaded
+    
+    def _prepare(self, preset: RoomPreset) -> None:
+        """Work out input settings and warm the scene item cache for a preset"""
+        preset.inputs = self.obs.room_inputs(preset.links, self.layout)
+        preset.slot_count = self.obs.roster_size(preset.links)
+        try:
+            self.obs.prepare_room(preset.slot_count, self.layout)
+        except Exception as e:
+            self.logger.warning(f"Could not look up scene items for {preset.name}: {str(e)}")
+    
+    def refresh(self) -> None:
+        """Recompute every preset, e.g. after the layout changed or OBS reconnected"""
+        for preset in self.presets:
+            self._prepare(preset)
+    
+    def activate(self, index: int) -> RoomPreset:
+        """Switch OBS to a preset; the time from call to OBS acknowledgement is logged"""
+        preset = self.presets[index]
+        started = time.perf_counter()
+        if not self.obs.connected or not self.obs.ws:
+            raise ConnectionError("Not connected to OBS")
+        
+        if self.obs.ws.legacy:
+            # No request batches on obs-websocket 4; fall back to a full sync
+            self.obs.update_sources(preset.links, layout=self.layout)
+            results = []
+        else:
+            results = self.obs.switch_room(preset.inputs, preset.slot_count, self.layout,
+                                           Deadline(self.obs.request_timeout))
+        self.last_switch_ms = (time.perf_counter() - started) * 1000
+        self.active = preset
+        
+        failed = sum(1 for result in results if not result.ok)
+        self.logger.info(f"Switched to room {preset.name} in {self.last_switch_ms:.1f}ms "
+                         f"({len(results)} changes in one batch, {failed} failed)")
+        return preset
+    
+    def describe(self) -> str:
+        """Summarize presets for the debug panel"""
+        names = ", ".join(f"{index + 1}:{preset.name}" for index, preset in enumerate(self.presets)) or "none"
+        active = self.active.name if self.active else "none"
+        last = f", last switch {self.last_switch_ms:.1f}ms" if self.last_switch_ms is not None else ""
+        return f"Room presets: {names} (active: {active}{last})"
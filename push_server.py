@@ -0,0 +1,243 @@
+from dataclasses import dataclass, field
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+import asyncio
+import json
+import logging
+import threading
+import time
+
+import websockets
+
+from event_bus import EventBus, LinksRegenerated, RosterChanged, DISPATCH_ASYNCIO
+
+# Delta kinds: links by username (plus "host"), player characters by username, and host fields
+KIND_LINKS = "links"
+KIND_PLAYERS = "players"
+KIND_HOST = "host"
+
+def diff(before: Dict[str, Any], after: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+    """Entries that changed or were added, and keys that were removed"""
+    changed = {key: value for key, value in after.items() if before.get(key) != value}
+    removed = [key for key in before if key not in after]
+    return changed, removed
+
+@dataclass
+class _Delta:
+    """Changes to one (kind, room) not yet sent to a client; later deltas merge into it"""
+    changed: Dict[str, Any] = field(default_factory=dict)
+    removed: Set[str] = field(default_factory=set)
+    encoded: Optional[str] = None  # Shared serialized message while nothing was merged in
+    created_at: float = field(default_factory=time.perf_counter)
+    
+    def merge(self, changed: Dict[str, Any], removed: List[str]) -> None:
+        for key in removed:
+            self.changed.pop(key, None)
+            self.removed.add(key)
+        for key, value in changed.items():
+            self.removed.discard(key)
+            self.changed[key] = value
+        self.encoded = None
+
+class _Client:
+    """A connected dashboard and the deltas waiting for it"""
+    
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self.pending: Dict[Tuple[str, str], _Delta] = {}
+        self.wakeup = asyncio.Event()
+        self.needs_snapshot = True
+        self.sending = False
+    
+    def idle(self, write_limit: int) -> bool:
+        """Whether a message can be written straight away without reordering or piling up"""
+        if self.sending or self.pending or self.needs_snapshot:
+            return False
+        transport = self.websocket.transport
+        return transport is not None and transport.get_write_buffer_size() < write_limit
+
+class PushServer:
+    """Streams roster and link changes to dashboards over WebSocket.
+    
+    Each client first gets a snapshot of every room, then deltas as
+    generate_links (or the HTTP API) publishes them on the event bus:
+        
+        {"type": "delta", "kind": "links", "room": "table1", "changed": {...}, "removed": [...]}
+    
+    A delta is serialized once and written in one pass to every client that
+    is keeping up (nothing queued, less than `write_limit` bytes unsent).
+    Other clients get it queued; later deltas for the same room merge into
+    the one waiting, so a client never holds more than one message per
+    (kind, room). When a client falls `max_pending` rooms behind, its
+    pending deltas are dropped and it gets a fresh snapshot once it catches
+    up. Fan-out latency (delta to written) is recorded.
+    """
+    
+    def __init__(self, events: EventBus, host: str = "127.0.0.1", port: int = 8765, max_pending: int = 64,
+                 write_limit: int = 64 * 1024, history: int = 2000):
+        self.events = events
+        self.host = host
+        self.port = port
+        self.max_pending = max_pending
+        self.write_limit = write_limit
+        
+        # Last known state per room, for diffs and snapshots
+        self.state: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.clients: Set[_Client] = set()
+        self.latencies: Deque[float] = deque(maxlen=history)
+        self.stats = {"deltas": 0, "messages": 0, "coalesced": 0, "resyncs": 0}
+        
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+        self._subscriptions = []
+        self.logger = logging.getLogger(__name__)
+    
+    def start(self) -> int:
+        """Serve on a background thread and return the bound port"""
+        self._thread = threading.Thread(target=self._run, name="push-server", daemon=True)
+        self._thread.start()
+        self._started.wait()
+        if self._server is None:
+            raise OSError(f"Could not listen on {self.host}:{self.port}")
+        self._subscriptions = [
+            self.events.subscribe(LinksRegenerated, self._on_links, name="push-links", dispatch=DISPATCH_ASYNCIO,
+                                  loop=self._loop),
+            self.events.subscribe(RosterChanged, self._on_roster, name="push-roster", dispatch=DISPATCH_ASYNCIO,
+                                  loop=self._loop)
+        ]
+        self.logger.info(f"Push server listening on ws://{self.host}:{self.port}")
+        return self.port
+    
+    def stop(self) -> None:
+        """Close every connection and stop the loop"""
+        for subscription in self._subscriptions:
+            self.events.unsubscribe(subscription)
+        if self._loop and self._server:
+            async def shutdown():
+                self._server.close()
+                await self._server.wait_closed()
+            asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread:
+            self._thread.join()
+    
+    def _run(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        # Deltas are small; compressing them per connection would cost more fan-out time than it saves
+        try:
+            self._server = self._loop.run_until_complete(
+                websockets.serve(self._handle_client, self.host, self.port, compression=None)
+            )
+        except OSError as e:
+            self.logger.error(f"Push server failed to listen on {self.host}:{self.port}: {str(e)}")
+            self._started.set()
+            return
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._started.set()
+        self._loop.run_forever()
+    
+    async def _handle_client(self, websocket) -> None:
+        client = _Client(websocket)
+        self.clients.add(client)
+        sender = asyncio.ensure_future(self._send_loop(client))
+        client.wakeup.set()  # Sends the snapshot
+        try:
+            async for _ in websocket:
+                pass  # Dashboards only listen
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self.clients.discard(client)
+            sender.cancel()
+    
+    def _on_links(self, event: LinksRegenerated) -> None:
+        self._update(KIND_LINKS, event.room_name, dict(event.links))
+    
+    def _on_roster(self, event: RosterChanged) -> None:
+        self._update(KIND_PLAYERS, event.room_name, dict(event.players))
+        self._update(KIND_HOST, event.room_name, {"username": event.host_username,
+                                                  "character": event.host_character})
+    
+    def _update(self, kind: str, room: str, entries: Dict[str, Any]) -> None:
+        """Diff a room's new state against the last one and queue the delta for every client (on the loop)"""
+        key = (kind, room)
+        changed, removed = diff(self.state.get(key, {}), entries)
+        self.state[key] = entries
+        if not changed and not removed:
+            return
+        self.stats["deltas"] += 1
+        
+        shared = _Delta(changed, set(removed))
+        shared.encoded = self._encode(key, shared)
+        ready = []
+        for client in self.clients:
+            if client.needs_snapshot:
+                continue  # The snapshot will include this change
+            if client.idle(self.write_limit):
+                ready.append(client.websocket)
+                continue
+            waiting = client.pending.get(key)
+            if waiting is not None:
+                if waiting.encoded is not None:
+                    # Still the shared delta; give this client its own copy to merge into
+                    waiting = client.pending[key] = _Delta(dict(waiting.changed), set(waiting.removed),
+                                                           created_at=waiting.created_at)
+                waiting.merge(changed, removed)
+                self.stats["coalesced"] += 1
+            elif len(client.pending) >= self.max_pending:
+                # Too far behind; resync from a snapshot instead of queueing more
+                client.pending.clear()
+                client.needs_snapshot = True
+                self.stats["resyncs"] += 1
+            else:
+                client.pending[key] = shared
+            client.wakeup.set()
+        
+        if ready:
+            websockets.broadcast(ready, shared.encoded)
+            self.stats["messages"] += len(ready)
+            self.latencies.append(time.perf_counter() - shared.created_at)
+    
+    def _encode(self, key: Tuple[str, str], delta: _Delta) -> str:
+        return json.dumps({"type": "delta", "kind": key[0], "room": key[1], "changed": delta.changed,
+                           "removed": sorted(delta.removed)}, separators=(",", ":"))
+    
+    def snapshot(self) -> str:
+        """Every room's current state as one message"""
+        rooms: Dict[str, Dict[str, Any]] = {}
+        for (kind, room), entries in self.state.items():
+            rooms.setdefault(room, {})[kind] = entries
+        return json.dumps({"type": "snapshot", "rooms": rooms}, separators=(",", ":"))
+    
+    async def _send_loop(self, client: _Client) -> None:
+        """Send a client's backlog; while a send waits on the network, new deltas merge into it"""
+        try:
+            while True:
+                await client.wakeup.wait()
+                client.wakeup.clear()
+                client.sending = True
+                if client.needs_snapshot:
+                    client.needs_snapshot = False
+                    client.pending.clear()
+                    await client.websocket.send(self.snapshot())
+                    self.stats["messages"] += 1
+                while client.pending and not client.needs_snapshot:
+                    key = next(iter(client.pending))
+                    delta = client.pending.pop(key)
+                    await client.websocket.send(delta.encoded or self._encode(key, delta))
+                    self.stats["messages"] += 1
+                    self.latencies.append(time.perf_counter() - delta.created_at)
+                client.sending = False
+        except websockets.ConnectionClosed:
+            pass
+    
+    def describe(self) -> str:
+        """Summarize clients and fan-out latency for the debug panel"""
+        latencies = sorted(self.latencies)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000 if latencies else 0.0
+        return (f"Push server: {len(self.clients)} dashboards, {self.stats['deltas']} deltas, "
+                f"{self.stats['messages']} messages ({self.stats['coalesced']} coalesced, "
+                f"{self.stats['resyncs']} resyncs), fan-out p95 {p95:.1f}ms")
@@ -0,0 +1,185 @@
+from typing import Any, Dict, List, Optional
+from obswebsocket import requests
+import logging
+import random
+import threading
+import time
+
+from obs_manager import OBSManager, Deadline
+from obs_scheduler import LANE_RECONCILE
+
+class DriftReconciler:
+    """Repairs managed OBS inputs whose settings drifted from the room's desired state.
+    
+    OBSManager records the settings every update_sources() call asks for. A
+    background sweep reads the actual settings of those inputs back with a
+    single GetInputSettings batch and rewrites only the keys that no longer
+    match, e.g. a pNvdosolo URL edited by hand in OBS.
+    
+    Sweeps run every `interval` seconds (with jitter) and stay out of the way
+    of live work: a sweep is skipped while a source update is running or
+    finished less than `quiet_period` seconds ago, and at most
+    `max_repairs_per_minute` inputs are rewritten per minute.
+    """
+    
+    def __init__(self, obs_manager: OBSManager, interval: float = 30.0, quiet_period: float = 5.0,
+                 max_repairs_per_minute: int = 10):
+        self.obs = obs_manager
+        self.interval = interval
+        self.quiet_period = quiet_period
+        self.max_repairs_per_minute = max_repairs_per_minute
+        
+        # Repair budget, refilled continuously up to one minute's worth
+        self._repair_tokens = float(max_repairs_per_minute)
+        self._refilled_at = time.monotonic()
+        
+        self.stats = {
+            "sweeps": 0,
+            "skipped": 0,
+            "checked": 0,
+            "drifted": 0,
+            "repaired": 0,
+            "deferred": 0,
+            "missing": 0
+        }
+        self.last_sweep_at: Optional[float] = None
+        self._default_settings: Dict[str, Dict[str, Any]] = {}  # input kind -> OBS defaults
+        
+        self._thread = None
+        self._stop = threading.Event()
+        self.logger = logging.getLogger(__name__)
+    
+    def start(self) -> None:
+        """Run sweeps on a background thread"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="obs-reconciler", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Drift reconciler started (every {self.interval:.0f}s, "
+                         f"at most {self.max_repairs_per_minute} repairs/min)")
+    
+    def stop(self) -> None:
+        """Stop the sweep thread"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+    
+    def _run(self) -> None:
+        # Jitter keeps sweeps from lining up with periodic live work
+        while not self._stop.wait(self.interval * random.uniform(0.8, 1.2)):
+            try:
+                self.sweep()
+            except Exception as e:
+                self.logger.error(f"Drift sweep failed: {str(e)}")
+    
+    def sweep(self, force: bool = False) -> Dict[str, int]:
+        """Check every managed input once and repair what drifted; returns this sweep's counts"""
+        counts = {"checked": 0, "drifted": 0, "repaired": 0, "deferred": 0, "missing": 0}
+        if not self.obs.connected or not self.obs.ws or self.obs.ws.legacy:
+            return counts
+        if not force and self.obs.live_update_idle_for() < self.quiet_period:
+            self.stats["skipped"] += 1
+            self.logger.debug("Drift sweep skipped: a source update is running or just finished")
+            return counts
+        
+        desired = self.obs.get_desired_inputs()
+        if not desired:
+            return counts
+        
+        # One batch reads back every managed input
+        deadline = Deadline(self.obs.sync_deadline)
+        names = sorted(desired)
+        results = self.obs.call_batch([requests.GetInputSettings(inputName=name) for name in names],
+                                      deadline=deadline, lane=LANE_RECONCILE)
+        
+        drifted: Dict[str, Dict[str, Any]] = {}
+        for name, result in zip(names, results):
+            if not result.ok:
+                counts["missing"] += 1
+                self.logger.warning(f"Drift check could not read {name}: {result.error}")
+                continue
+            counts["checked"] += 1
+            
+            # OBS leaves settings that equal the kind's defaults out of GetInputSettings
+            actual = dict(self._defaults_for(result.request.getInputKind(), deadline))
+            actual.update(result.request.getInputSettings() or {})
+            diff = self.diff(desired[name], actual)
+            if diff:
+                drifted[name] = diff
+        counts["drifted"] = len(drifted)
+        
+        # Repair within the rate limit; the rest waits for a later sweep
+        repairs = []
+        for name in sorted(drifted):
+            if not self._take_repair_token():
+                counts["deferred"] += 1
+                continue
+            keys = ", ".join(sorted(drifted[name]))
+            self.logger.warning(f"{name} drifted from the room state ({keys}); repairing")
+            repairs.append(requests.SetInputSettings(inputName=name, inputSettings=drifted[name]))
+        for result in self.obs.call_batch(repairs, deadline=deadline, lane=LANE_RECONCILE):
+            if result.ok:
+                counts["repaired"] += 1
+            else:
+                self.logger.error(f"Failed to repair {result.request.data()['inputName']}: {result.error}")
+        
+        self.stats["sweeps"] += 1
+        for key, value in counts.items():
+            self.stats[key] += value
+        self.last_sweep_at = time.time()
+        
+        if counts["drifted"] or counts["missing"]:
+            self.logger.warning(f"Drift sweep: {counts['checked']} checked, {counts['drifted']} drifted, "
+                                f"{counts['repaired']} repaired, {counts['deferred']} deferred, "
+                                f"{counts['missing']} missing")
+        else:
+            self.logger.info(f"Drift sweep: {counts['checked']} inputs match the room state")
+        return counts
+    
+    def _defaults_for(self, input_kind: Optional[str], deadline: Deadline) -> Dict[str, Any]:
+        """Get (and cache) the default settings of an input kind"""
+        if not input_kind:
+            return {}
+        if input_kind not in self._default_settings:
+            try:
+                response = self.obs._call(requests.GetInputDefaultSettings(inputKind=input_kind), deadline,
+                                          lane=LANE_RECONCILE)
+                self._default_settings[input_kind] = response.getDefaultInputSettings() or {}
+            except Exception as e:
+                self.logger.warning(f"Could not read default settings for {input_kind}: {str(e)}")
+                return {}
+        return self._default_settings[input_kind]
+    
+    def diff(self, desired: Dict[str, Any], actual: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the desired settings whose live values differ"""
+        return {key: value for key, value in desired.items() if not self._same(value, actual.get(key))}
+    
+    def _same(self, desired: Any, actual: Any) -> bool:
+        # OBS may hand whole numbers back as floats
+        if isinstance(desired, (int, float)) and not isinstance(desired, bool) \
+                and isinstance(actual, (int, float)) and not isinstance(actual, bool):
+            return abs(desired - actual) < 1e-6
+        return desired == actual
+    
+    def _take_repair_token(self) -> bool:
+        """Spend one repair from the per-minute budget"""
+        now = time.monotonic()
+        rate = self.max_repairs_per_minute / 60.0
+        self._repair_tokens = min(float(self.max_repairs_per_minute),
+                                  self._repair_tokens + (now - self._refilled_at) * rate)
+        self._refilled_at = now
+        if self._repair_tokens < 1:
+            return False
+        self._repair_tokens -= 1
+        return True
+    
+    def describe(self) -> List[str]:
+        """Summarize reconciliation for the debug panel"""
+        last = time.strftime('%H:%M:%S', time.localtime(self.last_sweep_at)) if self.last_sweep_at else "never"
+        return [
+            f"Drift reconciler: last sweep {last}, {self.stats['sweeps']} sweeps ({self.stats['skipped']} skipped)",
+            f"  Inputs checked {self.stats['checked']}, drifted {self.stats['drifted']}, "
+            f"repaired {self.stats['repaired']}, deferred {self.stats['deferred']}, missing {self.stats['missing']}"
+        ]
@@ -0,0 +1,306 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from obswebsocket import requests
+import json
+import logging
+import threading
+import time
+
+from obs_manager import OBSManager, Deadline
+from event_log import log_event, OUTCOME_OK, OUTCOME_FAILED
+from settings import RoomSettings
+from vdo_ninja_manager import VDONinjaManager
+
+# Input kinds created for rooms whose sources do not exist yet
+BROWSER_INPUT_KIND = "browser_source"
+TEXT_INPUT_KIND = "text_gdiplus_v2"
+
+@dataclass
+class ManagedRoom:
+    """One active room: its roster, generated links, OBS target and what OBS last accepted"""
+    key: str
+    room: RoomSettings
+    target: Tuple[str, int]  # (host, port) of the OBS instance
+    scene: str  # Scene the room's sources live in
+    prefix: str  # Prepended to pNvdosolo/pNname so rooms sharing an OBS do not collide
+    links: Dict[str, str] = field(default_factory=dict)
+    sent: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # Input settings OBS accepted, by input name
+    slot_count: int = 0
+    revision: int = 0  # Bumped on every edit
+    synced_revision: int = 0
+    last_sync_ms: Optional[float] = None
+    error: str = ""
+
+class OBSConnectionPool:
+    """One OBSManager per OBS instance, shared by every room that targets it"""
+    
+    def __init__(self, factory: Callable[[], OBSManager] = OBSManager):
+        self.factory = factory
+        self.managers: Dict[Tuple[str, int], OBSManager] = {}
+        self._passwords: Dict[Tuple[str, int], Optional[str]] = {}
+        self._lock = threading.Lock()
+        self._connect_locks: Dict[Tuple[str, int], threading.Lock] = {}
+        self.logger = logging.getLogger(__name__)
+    
+    def add(self, host: str, port: int, manager: OBSManager, password: Optional[str] = None) -> None:
+        """Share an existing manager, e.g. the main window's connection"""
+        with self._lock:
+            self.managers[(host, port)] = manager
+            self._passwords[(host, port)] = password
+    
+    def get(self, host: str, port: int, password: Optional[str] = None) -> OBSManager:
+        """Get the connected manager for an OBS instance, connecting on first use"""
+        target = (host, port)
+        with self._lock:
+            manager = self.managers.get(target)
+            if manager is None:
+                manager = self.managers[target] = self.factory()
+                self._passwords[target] = password
+            connect_lock = self._connect_locks.setdefault(target, threading.Lock())
+        
+        with connect_lock:
+            if not manager.connected:
+                manager.connect(host=host, port=port, password=self._passwords.get(target, password))
+        return manager
+    
+    def close_all(self) -> None:
+        """Disconnect every pooled connection"""
+        with self._lock:
+            managers = list(self.managers.values())
+        for manager in managers:
+            if manager.connected:
+                manager.disconnect()
+
+class RoomManager:
+    """Holds many active rooms at once and keeps each one's OBS sources in sync.
+    
+    Rooms share a pool of OBS connections (one per OBS instance) and a fixed
+    pool of `workers` sync threads; there are no per-room threads. An edit
+    bumps the room's revision and queues one sync for it; edits made while a
+    sync runs are folded into a follow-up sync, so a busy room never has more
+    than one sync queued. A sync sends one RequestBatch with only the input
+    settings that changed since OBS last accepted them, plus moved tiles.
+    
+    Rooms on a shared OBS get their own scene and prefixed source names
+    ("table1 p0vdosolo"); the number of rooms is capped at `max_rooms`.
+    """
+    
+    def __init__(self, pool: OBSConnectionPool, vdo_ninja: VDONinjaManager, layout_manager: Optional[Any] = None,
+                 default_target: Tuple[str, int, Optional[str]] = ("localhost", 4455, None),
+                 workers: int = 8, max_rooms: int = 50, history: int = 500):
+        self.pool = pool
+        self.vdo_ninja = vdo_ninja
+        self.layout = layout_manager
+        self.default_target = default_target
+        self.max_rooms = max_rooms
+        
+        self.rooms: Dict[str, ManagedRoom] = {}
+        self._passwords: Dict[str, Optional[str]] = {}
+        self._syncing: Dict[str, Future] = {}  # room key -> running or queued sync
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="room-sync")
+        
+        # Recent sync durations (ms) across all rooms
+        self.sync_times = deque(maxlen=history)
+        self.stats = {"syncs": 0, "coalesced": 0, "failures": 0, "requests": 0}
+        self.logger = logging.getLogger(__name__)
+    
+    def add_room(self, room: RoomSettings, host: Optional[str] = None, port: Optional[int] = None,
+                 password: Optional[str] = None, scene: Optional[str] = None,
+                 prefix: Optional[str] = None) -> ManagedRoom:
+        """Start managing a room and queue its first sync"""
+        key = room.room_name
+        if not key:
+            raise ValueError("Room name is not set")
+        default_host, default_port, default_password = self.default_target
+        with self._lock:
+            if key in self.rooms:
+                raise ValueError(f"Room {key} is already active")
+            if len(self.rooms) >= self.max_rooms:
+                raise ValueError(f"Cannot run more than {self.max_rooms} rooms at once")
+            managed = ManagedRoom(
+                key=key,
+                room=room,
+                target=(host or default_host, port or default_port),
+                scene=scene or f"VDO Room {key}",
+                prefix=f"{key} " if prefix is None else prefix
+            )
+            self.rooms[key] = managed
+            self._passwords[key] = password if password is not None else default_password
+        self._regenerate(managed)
+        self.logger.info(f"Added room {key} on {managed.target[0]}:{managed.target[1]} ({managed.scene})")
+        self._schedule(managed)
+        return managed
+    
+    def load_room(self, path: str) -> ManagedRoom:
+        """Add a room from a room configuration file; an optional "obs" object picks its target"""
+        with open(path, 'r') as f:
+            data = json.load(f)
+        room = RoomSettings()
+        room.from_dict(data)
+        target = data.get("obs", {})
+        return self.add_room(room, host=target.get("host"), port=target.get("port"), password=target.get("password"),
+                             scene=target.get("scene"), prefix=target.get("prefix"))
+    
+    def load_all(self, paths: List[str]) -> List[ManagedRoom]:
+        """Add several rooms, skipping files that fail"""
+        loaded = []
+        for path in paths:
+            try:
+                loaded.append(self.load_room(path))
+            except Exception as e:
+                self.logger.error(f"Failed to add room from {path}: {str(e)}")
+        return loaded
+    
+    def remove_room(self, key: str) -> None:
+        """Stop managing a room; its sources are left in OBS"""
+        with self._lock:
+            self.rooms.pop(key, None)
+            self._passwords.pop(key, None)
+    
+    def update_room(self, key: str, **changes: Any) -> Future:
+        """Change a room's settings (e.g. players={...}) and queue a sync of just that room"""
+        managed = self.rooms[key]
+        for name, value in changes.items():
+            if not hasattr(managed.room, name):
+                raise AttributeError(f"RoomSettings has no field {name}")
+            setattr(managed.room, name, value)
+        self._regenerate(managed)
+        return self._schedule(managed)
+    
+    def resync(self) -> None:
+        """Send every room again in full, e.g. after OBS reconnected"""
+        for managed in list(self.rooms.values()):
+            managed.sent = {}
+            managed.revision += 1
+            self._schedule(managed)
+    
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Wait for every queued sync to finish"""
+        with self._lock:
+            futures = list(self._syncing.values())
+        for future in futures:
+            future.exception(timeout)
+    
+    def _regenerate(self, managed: ManagedRoom) -> None:
+        """Regenerate a room's links after an edit"""
+        room = managed.room
+        managed.links = self.vdo_ninja.generate_room_links(room.room_name, room.room_password,
+                                                           host_username=room.host_username,
+                                                           host_character=room.host_character,
+                                                           players=room.players)
+        managed.revision += 1
+    
+    def _schedule(self, managed: ManagedRoom) -> Future:
+        """Queue a sync unless one is already queued or running; that one will pick the edit up"""
+        with self._lock:
+            future = self._syncing.get(managed.key)
+            if future is not None:
+                self.stats["coalesced"] += 1
+                return future
+            future = self._syncing[managed.key] = self._executor.submit(self._sync, managed)
+            return future
+    
+    def _sync(self, managed: ManagedRoom) -> None:
+        """Sync a room until OBS has its latest revision"""
+        while True:
+            with self._lock:
+                # Checked under the lock, so an edit either sees this sync queued or starts a new one
+                if managed.synced_revision == managed.revision or managed.key not in self.rooms:
+                    self._syncing.pop(managed.key, None)
+                    return
+            revision = managed.revision
+            try:
+                self._sync_once(managed)
+            except Exception as e:
+                managed.error = str(e)
+                with self._lock:
+                    self.stats["failures"] += 1
+                    self._syncing.pop(managed.key, None)
+                self.logger.error(f"Failed to sync room {managed.key}: {str(e)}")
+                raise
+            managed.synced_revision = revision
+    
+    def _sync_once(self, managed: ManagedRoom) -> None:
+        """Send the input settings and tiles of one room that differ from what OBS has"""
+        started = time.perf_counter()
+        obs = self.pool.get(managed.target[0], managed.target[1], self._passwords.get(managed.key))
+        if obs.ws.legacy:
+            raise RuntimeError("Multiple rooms need obs-websocket 5")
+        deadline = Deadline(obs.sync_deadline)
+        obs.room_prefixes[managed.prefix] = managed.key
+        
+        inputs = {f"{managed.prefix}{name}": settings
+                  for name, settings in obs.room_inputs(managed.links, self.layout).items()}
+        slot_count = obs.roster_size(managed.links)
+        for slot in range(slot_count, managed.slot_count):
+            inputs[f"{managed.prefix}p{slot}vdosolo"] = {"url": "about:blank"}
+            inputs[f"{managed.prefix}p{slot}name"] = {"text": ""}
+        unknown = {name: settings for name, settings in inputs.items() if name not in managed.sent}
+        if unknown:
+            # First sync, or the roster grew
+            self._provision(obs, managed, unknown, deadline)
+        
+        changed = {name: settings for name, settings in inputs.items() if managed.sent.get(name) != settings}
+        results = obs.call_batch([requests.SetInputSettings(inputName=name, inputSettings=settings)
+                                  for name, settings in changed.items()], deadline=deadline)
+        failed = 0
+        for (name, settings), result in zip(changed.items(), results):
+            if result.ok:
+                managed.sent[name] = settings
+            else:
+                failed += 1
+                self.logger.error(f"Failed to update {name} for room {managed.key}: {result.error}")
+        
+        if self.layout is not None and self.layout.layout.arrange:
+            results += obs.apply_layout(self.layout, slot_count, scene_name=managed.scene, deadline=deadline,
+                                        prefix=managed.prefix)
+        managed.slot_count = slot_count
+        managed.last_sync_ms = (time.perf_counter() - started) * 1000
+        managed.error = f"{failed} updates failed" if failed else ""
+        with self._lock:
+            self.sync_times.append(managed.last_sync_ms)
+            self.stats["syncs"] += 1
+            self.stats["requests"] += len(results)
+        log_event("sync", OUTCOME_FAILED if failed else OUTCOME_OK, room=managed.key,
+                  latency=managed.last_sync_ms / 1000, changed=len(changed), failed=failed)
+        self.logger.info(f"Synced room {managed.key}: {len(changed)} of {len(inputs)} inputs changed "
+                         f"in {managed.last_sync_ms:.1f}ms")
+    
+    def _provision(self, obs: OBSManager, managed: ManagedRoom, inputs: Dict[str, Dict[str, Any]],
+                   deadline: Deadline) -> None:
+        """Create the room's scene and any of its sources OBS does not have yet"""
+        obs._get_or_create_scene(managed.scene, deadline)
+        existing = {entry["inputName"] for entry in obs._call(requests.GetInputList(), deadline).getInputs()}
+        missing = [name for name in inputs if name not in existing]
+        results = obs.call_batch([
+            requests.CreateInput(sceneName=managed.scene, inputName=name,
+                                 inputKind=BROWSER_INPUT_KIND if name.endswith("vdosolo") else TEXT_INPUT_KIND,
+                                 inputSettings=inputs[name], sceneItemEnabled=True)
+            for name in missing
+        ], deadline=deadline)
+        for name, result in zip(missing, results):
+            if result.ok:
+                managed.sent[name] = inputs[name]
+            else:
+                self.logger.error(f"Failed to create {name} for room {managed.key}: {result.error}")
+    
+    def shutdown(self) -> None:
+        """Stop the sync workers once queued syncs are done"""
+        self._executor.shutdown(wait=True)
+    
+    def describe(self) -> List[str]:
+        """Summarize active rooms for the debug panel"""
+        if not self.rooms:
+            return []
+        times = sorted(self.sync_times)
+        p95 = f", sync p95 {times[min(len(times) - 1, int(len(times) * 0.95))]:.1f}ms" if times else ""
+        lines = [f"Active rooms: {len(self.rooms)}/{self.max_rooms}, {len(self._syncing)} syncing, "
+                 f"{self.stats['syncs']} syncs ({self.stats['coalesced']} edits coalesced){p95}"]
+        for managed in list(self.rooms.values()):
+            state = managed.error or ("synced" if managed.synced_revision == managed.revision else "pending")
+            lines.append(f"  {managed.key}: {managed.slot_count} slots on {managed.target[0]}:{managed.target[1]}, "
+                         f"{state}")
+        return lines
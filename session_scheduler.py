@@ -0,0 +1,252 @@
+"""Run a calendar of game sessions, pre-warming each room's sources before it starts
+    
+    python session_scheduler.py calendar.json [--lead 120]
+
+A calendar is a JSON list of {"room": "rooms/table1.json", "start": "2026-10-19T19:00"}
+entries, or a CSV file with room,start columns. Room paths are relative to
+the calendar file. OBS connection and layout come from settings.json.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, List, Optional
+import argparse
+import csv
+import json
+import logging
+import os
+import threading
+import time
+
+from obs_manager import OBSManager, Deadline
+from preset_manager import PresetManager, RoomPreset
+from vdo_ninja_manager import VDONinjaManager
+
+@dataclass
+class Session:
+    """One calendar entry and how its warm-up and switch went"""
+    room_path: str
+    start: datetime
+    state: str = "pending"  # pending, warm, cold (warm-up failed), live, done, missed or failed
+    preset: Optional[RoomPreset] = None
+    warm_ms: Optional[float] = None
+    switch_ms: Optional[float] = None
+    late_ms: Optional[float] = None  # How long after the start time OBS acknowledged the switch
+
+def load_calendar(path: str) -> List[Session]:
+    """Read a JSON or CSV session calendar, sorted by start time"""
+    with open(path, 'r', newline='') as f:
+        if path.lower().endswith(".csv"):
+            entries = list(csv.DictReader(f))
+        else:
+            entries = json.load(f)
+    
+    base = os.path.dirname(os.path.abspath(path))
+    sessions = [Session(room_path=os.path.join(base, entry["room"]),
+                        start=datetime.fromisoformat(entry["start"].strip()))
+                for entry in entries]
+    return sorted(sessions, key=lambda session: session.start)
+
+class SessionScheduler:
+    """Switches OBS from room to room on a schedule, next to the Tk loop or headless.
+    
+    `lead_time` seconds before a session starts, its room file is loaded and
+    its browser sources are provisioned into the hidden pNvdosolo_next shadow
+    slots (OBSManager.warm_shadow_bank) so VDO.Ninja has connected by the
+    start. At the start time the shadows are flipped on air in one batch on
+    the live lane. Warm-up and switch latencies are logged for every session.
+    """
+    
+    def __init__(self, obs_manager: OBSManager, vdo_ninja: VDONinjaManager, layout_manager: Optional[Any] = None,
+                 lead_time: float = 120.0, on_switch: Optional[Callable[[Session], None]] = None):
+        self.obs = obs_manager
+        self.layout = layout_manager
+        self.lead_time = lead_time
+        self.on_switch = on_switch
+        
+        # Session rooms are loaded on their own, so they do not take preset hotkeys
+        self.presets = PresetManager(obs_manager, vdo_ninja, layout_manager)
+        self.sessions: List[Session] = []
+        
+        self._thread = None
+        self._stop = threading.Event()
+        self.logger = logging.getLogger(__name__)
+    
+    def load(self, path: str) -> List[Session]:
+        """Load a calendar; sessions that already started are skipped"""
+        self.sessions = load_calendar(path)
+        now = datetime.now()
+        for session in self.sessions:
+            if session.start < now:
+                session.state = "missed"
+        upcoming = [session for session in self.sessions if session.state == "pending"]
+        self.logger.info(f"Loaded {len(self.sessions)} sessions from {path} ({len(upcoming)} upcoming)")
+        return self.sessions
+    
+    def start(self) -> None:
+        """Run the calendar on a background thread"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="session-scheduler", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Session scheduler started (warm-up {self.lead_time:.0f}s before each start)")
+    
+    def stop(self) -> None:
+        """Stop the background thread"""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+    
+    def join(self) -> None:
+        """Wait until the calendar has run out or stop() was called"""
+        while self._thread is not None and self._thread.is_alive():
+            self._thread.join(0.5)
+    
+    def next_session(self) -> Optional[Session]:
+        """The next session that has not gone live yet"""
+        for session in self.sessions:
+            if session.state in ("pending", "warm", "cold"):
+                return session
+        return None
+    
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            session = self.next_session()
+            if session is None:
+                self.logger.info("Session calendar finished")
+                return
+            
+            now = datetime.now()
+            warm_at = session.start - timedelta(seconds=self.lead_time)
+            if session.state == "pending" and now >= warm_at:
+                self.warm(session)
+                continue
+            if now >= session.start:
+                self.switch(session)
+                continue
+            
+            # Sleep until the next warm-up or start; re-check now and then in case the clock moved
+            wake_at = warm_at if session.state == "pending" else session.start
+            self._stop.wait(min(60.0, (wake_at - now).total_seconds()))
+    
+    def warm(self, session: Session) -> None:
+        """Load a session's room and pre-load its browser sources into the hidden shadow slots"""
+        started = time.perf_counter()
+        try:
+            session.preset = self.presets.load(session.room_path)
+        except Exception as e:
+            session.state = "failed"
+            self.logger.error(f"Failed to load session room {session.room_path}: {str(e)}")
+            return
+        
+        if not self.obs.connected or not self.obs.ws or self.obs.ws.legacy:
+            session.state = "cold"
+            self.logger.warning(f"Cannot pre-warm {session.preset.name}; it will be switched cold")
+            return
+        try:
+            results = self.obs.warm_shadow_bank(session.preset.inputs, session.preset.slot_count, self.layout,
+                                                Deadline(self.obs.sync_deadline))
+        except Exception as e:
+            session.state = "cold"
+            self.logger.error(f"Failed to pre-warm {session.preset.name}; it will be switched cold: {str(e)}")
+            return
+        
+        session.warm_ms = (time.perf_counter() - started) * 1000
+        session.state = "warm"
+        failed = sum(1 for result in results if not result.ok)
+        lead = (session.start - datetime.now()).total_seconds()
+        self.logger.info(f"Pre-warmed {session.preset.name} in {session.warm_ms:.1f}ms "
+                         f"({len(results)} requests, {failed} failed), {lead:.0f}s before its start")
+    
+    def switch(self, session: Session) -> None:
+        """Put a session's room on air, flipping its warm shadows live"""
+        if session.preset is None:
+            self.warm(session)
+            if session.preset is None:
+                return
+        preset = session.preset
+        started = time.perf_counter()
+        
+        try:
+            if not self.obs.connected or not self.obs.ws:
+                raise ConnectionError("Not connected to OBS")
+            if self.obs.ws.legacy:
+                self.obs.update_sources(preset.links, layout=self.layout)
+                results = []
+            elif session.state == "warm":
+                results = self.obs.flip_shadow_bank(preset.inputs, preset.slot_count, self.layout,
+                                                    Deadline(self.obs.request_timeout))
+            else:
+                results = self.obs.switch_room(preset.inputs, preset.slot_count, self.layout,
+                                               Deadline(self.obs.request_timeout))
+        except Exception as e:
+            session.state = "failed"
+            self.logger.error(f"Failed to switch to session {preset.name}: {str(e)}")
+            return
+        
+        session.switch_ms = (time.perf_counter() - started) * 1000
+        session.late_ms = (datetime.now() - session.start).total_seconds() * 1000
+        was_warm = session.state == "warm"
+        for earlier in self.sessions:
+            if earlier.state == "live":
+                earlier.state = "done"
+        session.state = "live"
+        self.presets.active = preset
+        
+        failed = sum(1 for result in results if not result.ok)
+        self.logger.info(f"Switched to session {preset.name} ({'warm' if was_warm else 'cold'}) in "
+                         f"{session.switch_ms:.1f}ms, {session.late_ms:.0f}ms after its start "
+                         f"({len(results)} changes in one batch, {failed} failed)")
+        if self.on_switch is not None:
+            self.on_switch(session)
+    
+    def describe(self) -> str:
+        """Summarize the calendar for the debug panel"""
+        session = self.next_session()
+        upcoming = (f"next {session.preset.name if session.preset else os.path.basename(session.room_path)} "
+                    f"at {session.start:%H:%M:%S} ({session.state})") if session else "no upcoming sessions"
+        live = [entry for entry in self.sessions if entry.state == "live"]
+        last = ""
+        if live and live[-1].switch_ms is not None:
+            warm = f"warm-up {live[-1].warm_ms:.0f}ms, " if live[-1].warm_ms is not None else ""
+            last = f", last: {warm}switch {live[-1].switch_ms:.1f}ms"
+        return f"Session calendar: {len(self.sessions)} sessions, {upcoming}{last}"
+
+def main():
+    from layout_manager import LayoutManager
+    from settings import Settings
+    
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("calendar", help="JSON or CSV session calendar")
+    parser.add_argument("--lead", type=float, help="Seconds before each start to pre-warm (default: from settings)")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    settings = Settings()
+    settings.load()
+    
+    obs = OBSManager(
+        pipeline_window=settings.obs.pipeline_window,
+        request_timeout=settings.obs.request_timeout,
+        connect_timeout=settings.obs.connect_timeout,
+        sync_deadline=settings.obs.sync_deadline,
+        encoding=settings.obs.encoding,
+        lane_rates=settings.obs.lane_rates,
+        lane_max_wait=settings.obs.lane_max_wait
+    )
+    obs.connect(host=settings.obs.host, port=settings.obs.port, password=settings.obs.password)
+    
+    scheduler = SessionScheduler(obs, VDONinjaManager(), LayoutManager(settings.layout, settings.video),
+                                 lead_time=args.lead if args.lead is not None else settings.sessions.lead_time)
+    scheduler.load(args.calendar)
+    scheduler.start()
+    try:
+        scheduler.join()
+    except KeyboardInterrupt:
+        scheduler.stop()
+    finally:
+        obs.disconnect()
+
+if __name__ == "__main__":
+    main()
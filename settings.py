@@ -1,15 +1,28 @@
 from dataclasses import dataclass, asdict, field
 import json
 import os
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 
 @dataclass
 class InterfaceSettings:
     """Interface settings"""
     show_labels: bool = True
     clean_output: bool = False
-    debug_mode: bool = False
+    debug_mode: bool = False  # Also profiles user actions; see action_profiler
     enable_obs: bool = False  # Added OBS enable toggle
+    debug_tail_kb: int = 64  # How much of the end of the debug log the panel loads on open
+    debug_max_lines: int = 2000  # Log lines kept in the debug panel
+    log_max_kb: int = 1024  # obs_debug.log is rotated at this size
+    log_backups: int = 3  # Rotated logs kept (obs_debug.log.1 ...)
+    event_log: str = "obs_events.jsonl"  # Structured events as JSON lines; empty to turn off
+    event_log_max_kb: int = 10240
+    heartbeat_ms: int = 100  # How often the stall watchdog checks that the Tk event loop runs
+    stall_threshold_ms: int = 500  # Log the main thread's stack when the loop is this late; 0 turns it off
+    edit_debounce_ms: int = 250  # Links are regenerated once typing has paused this long
+    profile_dir: str = "profiles"  # Where debug mode saves action profiles
+    profile_top: int = 15  # Functions listed per profile in the debug log
+    memory_profile: bool = False  # tracemalloc around Generate, Update OBS, Load Room and Copy All; see memory_profiler
+    memory_top: int = 10  # Allocation sites listed per action in the debug log
 
 @dataclass
 class VideoSettings:
@@ -31,6 +44,83 @@ class OBSSettings:
     host: str = "localhost"
     port: int = 4455  # Updated to OBS 28+ default port
     password: Optional[str] = None
+    pipeline_window: int = 8  # Requests kept in flight during source updates
+    request_timeout: float = 5.0  # Seconds to wait for each request's answer
+    connect_timeout: float = 3.0  # Seconds before giving up on connecting
+    sync_deadline: float = 15.0  # Overall bound for one full source update
+    encoding: str = "json"  # "msgpack" negotiates obswebsocket.msgpack, falling back to JSON
+    stats_interval: float = 2.0  # Seconds between GetStats samples; 0 disables the sampler
+    stats_history: int = 300  # Samples kept in the ring buffer
+    skipped_frames_threshold: int = 30  # Warn when more frames are skipped after a source update
+    lifecycle_mode: str = "off"  # "shutdown" or "visibility" parks browser sources not on program/preview
+    preroll_seconds: float = 3.0  # How long sources are woken before a scene switch
+    park_delay: float = 2.0  # Seconds after a scene change before sources that left are parked
+    reconcile_interval: float = 30.0  # Seconds between drift checks of managed inputs; 0 disables them
+    reconcile_quiet_period: float = 5.0  # Drift checks wait this long after a source update
+    reconcile_max_repairs: int = 10  # Drifted inputs rewritten per minute at most
+    lane_rates: Dict[str, float] = field(default_factory=lambda: {"reconcile": 5.0, "telemetry": 2.0})  # Requests/s per scheduler lane
+    lane_max_wait: float = 2.0  # Seconds a queued request may wait before it is served ahead of higher lanes
+    capture_path: str = ""  # JSONL file that records all OBS traffic for obs_replay.py; empty disables capture
+
+@dataclass
+class LayoutSettings:
+    """Player grid layout on the output canvas"""
+    canvas_width: int = 1920
+    canvas_height: int = 1080
+    columns: int = 0  # 0 picks a near-square grid for the roster size
+    rows: int = 0
+    fps: int = 30
+    min_bitrate: int = 300  # kbps floor for small tiles
+    slot_sizes: Dict[str, List[int]] = field(default_factory=dict)  # slot -> [width, height] override
+    padding: int = 8  # Pixels kept clear around each tile
+    label_height: int = 40  # Height of the name label strip under each video; 0 leaves labels alone
+    aspect_ratio: str = "16:9"  # Shape of the video tiles
+    source_aspect: str = "16:9"  # Shape of the incoming streams
+    fit: str = "contain"  # "cover" crops streams to fill their tile, "contain" letterboxes them
+    arrange: bool = True  # Position sources in the scene on every update
+    scene: str = "VDO Assets"  # Scene whose items are arranged
+
+@dataclass
+class PresetSettings:
+    """Room configurations preloaded for hot-swapping"""
+    files: List[str] = field(default_factory=list)  # Room JSON files; Ctrl+1..Ctrl+9 switch to them in order
+    hotkeys: bool = True
+
+@dataclass
+class APISettings:
+    """HTTP control API (see api_server)"""
+    enabled: bool = False  # Also serve the API from the Tk app
+    host: str = "127.0.0.1"
+    port: int = 5000
+    token: str = ""  # Bearer token required on every request when set
+
+@dataclass
+class PushSettings:
+    """WebSocket feed of roster and link changes for dashboards (see push_server)"""
+    enabled: bool = False
+    host: str = "127.0.0.1"
+    port: int = 8765
+    max_pending: int = 64  # Rooms a dashboard may fall behind before it is resent a snapshot
+
+@dataclass
+class MetricsSettings:
+    """Prometheus /metrics endpoint (see metrics)"""
+    enabled: bool = False
+    host: str = "127.0.0.1"
+    port: int = 9108
+
+@dataclass
+class MultiRoomSettings:
+    """Extra rooms kept in sync alongside the one in the main window"""
+    files: List[str] = field(default_factory=list)  # Room JSON files; an optional "obs" object picks host/port/scene
+    workers: int = 8  # Sync threads shared by all rooms
+    max_rooms: int = 50
+
+@dataclass
+class SessionSettings:
+    """Calendar of sessions whose rooms are switched to on schedule"""
+    calendar: str = ""  # JSON or CSV of room files and start times; empty disables the scheduler
+    lead_time: float = 120.0  # Seconds before a start to pre-load the room into hidden sources
 
 @dataclass
 class RoomSettings:
@@ -134,6 +224,13 @@ class Settings:
         self.video = VideoSettings()
         self.audio = AudioSettings()
         self.obs = OBSSettings()
+        self.layout = LayoutSettings()
+        self.presets = PresetSettings()
+        self.sessions = SessionSettings()
+        self.rooms = MultiRoomSettings()
+        self.api = APISettings()
+        self.push = PushSettings()
+        self.metrics = MetricsSettings()
         self.room = RoomSettings()
     
     def save(self, file_path: str = None):
@@ -147,6 +244,13 @@ class Settings:
                 'video': asdict(self.video),
                 'audio': asdict(self.audio),
                 'obs': asdict(self.obs),
+                'layout': asdict(self.layout),
+                'presets': asdict(self.presets),
+                'sessions': asdict(self.sessions),
+                'rooms': asdict(self.rooms),
+                'api': asdict(self.api),
+                'push': asdict(self.push),
+                'metrics': asdict(self.metrics),
                 'room': asdict(self.room)
             }
             with open(file_path, 'w') as f:
@@ -163,10 +267,10 @@ class Settings:
         except Exception as e:
             raise Exception(f"Failed to save room configuration: {str(e)}")
     
-    def load(self):
-        """Load settings from file"""
+    def load(self, file_path: str = None):
+        """Load settings from a file (settings.json next to this module by default)"""
         try:
-            settings_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'settings.json')
+            settings_path = file_path or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'settings.json')
             if os.path.exists(settings_path):
                 with open(settings_path, 'r') as f:
                     data = json.load(f)
@@ -191,6 +295,41 @@ class Settings:
                         for k, v in data['obs'].items():
                             setattr(self.obs, k, v)
                     
+                    # Load layout settings
+                    if 'layout' in data:
+                        for k, v in data['layout'].items():
+                            setattr(self.layout, k, v)
+                    
+                    # Load room presets
+                    if 'presets' in data:
+                        for k, v in data['presets'].items():
+                            setattr(self.presets, k, v)
+                    
+                    # Load session calendar settings
+                    if 'sessions' in data:
+                        for k, v in data['sessions'].items():
+                            setattr(self.sessions, k, v)
+                    
+                    # Load extra room settings
+                    if 'rooms' in data:
+                        for k, v in data['rooms'].items():
+                            setattr(self.rooms, k, v)
+                    
+                    # Load API settings
+                    if 'api' in data:
+                        for k, v in data['api'].items():
+                            setattr(self.api, k, v)
+                    
+                    # Load push settings
+                    if 'push' in data:
+                        for k, v in data['push'].items():
+                            setattr(self.push, k, v)
+                    
+                    # Load metrics settings
+                    if 'metrics' in data:
+                        for k, v in data['metrics'].items():
+                            setattr(self.metrics, k, v)
+                    
                     # Load room settings
                     if 'room' in data:
                         for k, v in data['room'].items():
@@ -0,0 +1,247 @@
+from typing import Optional, Set, List, Any
+from obswebsocket import requests, events
+import logging
+import queue
+import re
+import threading
+import time
+
+from obs_manager import OBSManager, OBSRequestError, Deadline
+from obs_scheduler import LANE_LIVE
+
+# Browser sources created for player slots: p0vdosolo (host), p1vdosolo, ...
+MANAGED_SOURCE = re.compile(r"^p\d+vdosolo$")
+
+class SourceLifecycleManager:
+    """Parks player browser sources that are not on program or preview.
+    
+    Parked sources stop decoding video, which frees OBS CPU on large rosters.
+    Two modes are supported:
+    
+    - "shutdown": parked sources get shutdown/restart_when_active set, so OBS
+      tears the browser down while the source is not showing; woken sources
+      have shutdown cleared and keep running even before they are shown.
+    - "visibility": the source's scene item in the managed scene is hidden
+      while parked and shown again when woken.
+    
+    Sources in the preview scene count as live, and switch_scene() wakes the
+    target scene's sources `preroll` seconds before cutting to it, so video
+    is already flowing when a scene goes on air.
+    """
+    
+    def __init__(self, obs_manager: OBSManager, mode: str = "shutdown", preroll: float = 3.0,
+                 park_delay: float = 2.0, managed_scene: str = "VDO Assets"):
+        self.obs = obs_manager
+        self.mode = mode
+        self.preroll = preroll
+        self.park_delay = park_delay
+        self.managed_scene = managed_scene
+        
+        self.live: Set[str] = set()
+        self.parked: Set[str] = set()
+        self._state_lock = threading.Lock()  # live/parked are also cleared from the receive thread on renames
+        self._resync_pending = threading.Event()
+        
+        # OBS events arrive on the obsws receive thread, which must not wait on
+        # requests itself; they are handed to a worker through this queue
+        self._jobs = queue.Queue()
+        self._worker = None
+        self._ws = None
+        
+        self.logger = logging.getLogger(__name__)
+    
+    def start(self) -> None:
+        """Subscribe to scene changes and bring source state in line with the current scenes"""
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name="source-lifecycle", daemon=True)
+            self._worker.start()
+        
+        self._ws = self.obs.ws
+        self._ws.register(self._on_scene_changed, events.CurrentProgramSceneChanged)
+        self._ws.register(self._on_scene_changed, events.CurrentPreviewSceneChanged)
+        self._ws.register(self._on_transition_started, events.SceneTransitionStarted)
+        self._ws.register(self._on_input_renamed, events.InputNameChanged)
+        self._jobs.put(self.refresh)
+        self.logger.info(f"Browser source lifecycle started ({self.mode} mode, {self.preroll}s pre-roll)")
+    
+    def stop(self) -> None:
+        """Unsubscribe from OBS events and stop the worker"""
+        if self._ws is not None:
+            self._ws.unregister(self._on_scene_changed, events.CurrentProgramSceneChanged)
+            self._ws.unregister(self._on_scene_changed, events.CurrentPreviewSceneChanged)
+            self._ws.unregister(self._on_transition_started, events.SceneTransitionStarted)
+            self._ws.unregister(self._on_input_renamed, events.InputNameChanged)
+            self._ws = None
+        if self._worker is not None:
+            self._jobs.put(None)
+            self._worker.join()
+            self._worker = None
+    
+    def _run(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            try:
+                job()
+            except Exception as e:
+                self.logger.error(f"Browser source lifecycle update failed: {str(e)}")
+    
+    def _on_scene_changed(self, event) -> None:
+        # Wake what is now live right away; park what left only after the transition
+        self._jobs.put(self.refresh_wake_only)
+        threading.Timer(self.park_delay, self._jobs.put, args=(self.refresh,)).start()
+    
+    def _on_transition_started(self, event) -> None:
+        self._jobs.put(self.refresh_wake_only)
+    
+    def _on_input_renamed(self, event) -> None:
+        # flip_shadow_bank() swaps pNvdosolo and pNvdosolo_next by renaming them, so what was known
+        # about either name now describes another source; forget it and work the state out again
+        names = {event.getOldInputName(), event.getInputName()}
+        with self._state_lock:
+            self.live -= names
+            self.parked -= names
+        # A flip renames every slot at once; one refresh covers them all
+        if not self._resync_pending.is_set():
+            self._resync_pending.set()
+            self._jobs.put(self._resync)
+    
+    def _resync(self) -> None:
+        self._resync_pending.clear()
+        self.refresh()
+    
+    def refresh_wake_only(self) -> None:
+        """Wake sources that became live without parking anything"""
+        self.refresh(park=False)
+    
+    def refresh(self, park: bool = True) -> None:
+        """Wake sources on program/preview and park the rest"""
+        if not self.obs.connected:
+            return
+        
+        deadline = Deadline(self.obs.sync_deadline)
+        live = set()
+        for scene in self._live_scenes(deadline):
+            live |= self.scene_sources(scene, deadline)
+        
+        managed = self.managed_sources(deadline)
+        self._apply(live & managed, managed - live if park else set(), deadline)
+    
+    def switch_scene(self, scene_name: str, preroll: Optional[float] = None) -> None:
+        """Wake a scene's sources, wait the pre-roll, then cut program to it"""
+        preroll = self.preroll if preroll is None else preroll
+        deadline = Deadline(self.obs.sync_deadline + preroll)
+        woken = self.prepare_scene(scene_name, deadline)
+        if woken:
+            time.sleep(preroll)
+        self._call(requests.SetCurrentProgramScene(sceneName=scene_name), deadline)
+        self.logger.info(f"Switched program to {scene_name} after waking {len(woken)} sources")
+    
+    def prepare_scene(self, scene_name: str, deadline: Optional[Deadline] = None) -> Set[str]:
+        """Wake a scene's sources ahead of it going on air; returns the sources that were parked"""
+        deadline = deadline or Deadline(self.obs.sync_deadline)
+        sources = self.scene_sources(scene_name, deadline) & self.managed_sources(deadline)
+        woken = sources & self.parked
+        self._apply(sources, set(), deadline)
+        return woken
+    
+    def _call(self, request: Any, deadline: Deadline) -> Any:
+        """Send a request in the scheduler's live lane, ahead of bulk syncs"""
+        return self.obs._call(request, deadline, lane=LANE_LIVE)
+    
+    def _live_scenes(self, deadline: Deadline) -> List[str]:
+        """Get the program scene and, in studio mode, the preview scene"""
+        scenes = [self._call(requests.GetCurrentProgramScene(), deadline).getCurrentProgramSceneName()]
+        try:
+            scenes.append(self._call(requests.GetCurrentPreviewScene(), deadline).getCurrentPreviewSceneName())
+        except OBSRequestError:
+            pass  # Studio mode is off
+        return scenes
+    
+    def scene_sources(self, scene_name: str, deadline: Deadline, _seen: Optional[Set[str]] = None) -> Set[str]:
+        """Names of enabled sources shown by a scene, following nested scenes and groups"""
+        seen = _seen if _seen is not None else set()
+        if scene_name in seen:
+            return set()
+        seen.add(scene_name)
+        
+        items = self._call(requests.GetSceneItemList(sceneName=scene_name), deadline).getSceneItems()
+        sources = set()
+        for item in items:
+            # Items hidden by visibility mode still belong to the scene
+            if not item.get("sceneItemEnabled", True) and scene_name != self.managed_scene:
+                continue
+            if item.get("isGroup"):
+                group_items = self._call(requests.GetGroupSceneItemList(sceneName=item["sourceName"]),
+                                         deadline).getSceneItems()
+                sources |= {group_item["sourceName"] for group_item in group_items
+                            if group_item.get("sceneItemEnabled", True)}
+            elif item.get("sourceType") == "OBS_SOURCE_TYPE_SCENE":
+                sources |= self.scene_sources(item["sourceName"], deadline, seen)
+            else:
+                sources.add(item["sourceName"])
+        return sources
+    
+    def managed_sources(self, deadline: Deadline) -> Set[str]:
+        """Names of the player browser sources vidLinker manages"""
+        inputs = self._call(requests.GetInputList(inputKind="browser_source"), deadline).getInputs()
+        return {entry["inputName"] for entry in inputs if MANAGED_SOURCE.match(entry["inputName"])}
+    
+    def _apply(self, wake: Set[str], park: Set[str], deadline: Deadline) -> None:
+        """Send only the wake/park changes that differ from the last known state.
+        
+        Only changes OBS confirmed are recorded, so a source that failed to
+        wake or park is tried again on the next refresh.
+        """
+        with self._state_lock:
+            wake = wake - self.live
+            park = park - self.parked
+        if not wake and not park:
+            return
+        
+        changes = [(name, True) for name in sorted(wake)] + [(name, False) for name in sorted(park)]
+        changes = [(name, awake, self._state_request(name, awake, deadline)) for name, awake in changes]
+        changes = [(name, awake, request) for name, awake, request in changes if request]
+        results = self.obs.call_pipelined([request for _, _, request in changes], deadline=deadline,
+                                          lane=LANE_LIVE)
+        
+        woken, parked = set(), set()
+        for (name, awake, _), result in zip(changes, results):
+            if not result.ok:
+                self.logger.error(f"Failed to change {result.request.data()}: {result.error}")
+            elif awake:
+                woken.add(name)
+            else:
+                parked.add(name)
+        with self._state_lock:
+            self.live = (self.live | woken) - parked
+            self.parked = (self.parked | parked) - woken
+        
+        cpu = f", OBS CPU {self.obs.stats_history[-1].cpu_usage:.1f}%" if self.obs.stats_history else ""
+        self.logger.info(f"Woke {len(woken)} and parked {len(parked)} browser sources "
+                         f"({len(self.live)} live, {len(self.parked)} parked{cpu})")
+    
+    def _state_request(self, source_name: str, awake: bool, deadline: Deadline) -> Optional[Any]:
+        """Build the request that wakes or parks one source"""
+        if self.mode == "visibility":
+            item_id = self._scene_item_id(source_name, deadline)
+            if item_id is None:
+                return None
+            return requests.SetSceneItemEnabled(sceneName=self.managed_scene, sceneItemId=item_id,
+                                                sceneItemEnabled=awake)
+        return requests.SetInputSettings(inputName=source_name, inputSettings={
+            "shutdown": not awake,
+            "restart_when_active": not awake
+        })
+    
+    def _scene_item_id(self, source_name: str, deadline: Deadline) -> Optional[int]:
+        # OBSManager keeps the cache, so it stays right when sources are renamed (see flip_shadow_bank)
+        item_ids = self.obs._get_scene_item_ids(self.managed_scene, [source_name], deadline, lane=LANE_LIVE)
+        if source_name not in item_ids:
+            self.logger.warning(f"{source_name} is not in {self.managed_scene}; cannot toggle its visibility")
+        return item_ids.get(source_name)
+    
+    def describe(self) -> str:
+        """Summarize lifecycle state for the debug panel"""
+        return f"Browser source lifecycle ({self.mode}): {len(self.live)} live, {len(self.parked)} parked"
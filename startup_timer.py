@@ -0,0 +1,33 @@
+from typing import Dict, List, Optional
+import time
+
+class StartupTimer:
+    """Marks how long each startup phase took, measured from when this module was first imported"""
+    
+    def __init__(self, started: Optional[float] = None):
+        self.started = time.perf_counter() if started is None else started
+        self.marks: Dict[str, float] = {}
+    
+    def mark(self, phase: str) -> float:
+        """Record that `phase` finished now; returns seconds since startup"""
+        elapsed = time.perf_counter() - self.started
+        self.marks.setdefault(phase, elapsed)
+        return elapsed
+    
+    def phases(self) -> List[str]:
+        """One "phase +Xms (at Yms)" entry per mark, in the order they happened"""
+        lines = []
+        previous = 0.0
+        for phase, elapsed in sorted(self.marks.items(), key=lambda item: item[1]):
+            lines.append(f"{phase} +{(elapsed - previous) * 1000:.0f}ms (at {elapsed * 1000:.0f}ms)")
+            previous = elapsed
+        return lines
+    
+    def describe(self) -> str:
+        """One line for the debug panel"""
+        if not self.marks:
+            return "Startup: not measured"
+        return "Startup: " + ", ".join(self.phases())
+
+# Created on first import, so importing this before anything else times the whole import phase
+STARTUP = StartupTimer()
@@ -0,0 +1,29 @@
+import time
+
+import pytest
+
+from obs_manager import OBSManager
+
+
+@pytest.fixture
+def connect_obs():
+    """Start a stand-in server and connect an OBSManager to it; both are stopped after the test"""
+    servers, managers = [], []
+
+    def connect(server, **kwargs):
+        server.start()
+        servers.append(server)
+        manager = OBSManager(**kwargs)
+        manager.connect(host="127.0.0.1", port=server.port)
+        managers.append(manager)
+        return manager
+
+    yield connect
+    for manager in managers:
+        manager.disconnect()
+    for server in servers:
+        # Let answers a test stopped waiting for finish, so the loop stops with no pending tasks
+        deadline = time.monotonic() + 2.0
+        while getattr(server, "in_flight", 0) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        server.stop()
@@ -0,0 +1,123 @@
+import pytest
+from obswebsocket import requests
+
+from api_server import RoomService, create_app
+from obs_manager import OBSRequestError, OBSRequestResult, OBSTimeoutError
+from vdo_ninja_manager import VDONinjaManager
+
+
+@pytest.fixture
+def client():
+    return create_app(RoomService(VDONinjaManager())).test_client()
+
+
+def create_room(client, players):
+    return client.post("/api/rooms", json={"room": "show", "password": "secret", "players": players})
+
+
+def roster(client, name="show"):
+    return {player["username"]: player["character_name"]
+            for player in client.get(f"/api/rooms/{name}").get_json()["players"]}
+
+
+def test_create_accepts_a_dict_or_a_list_of_players(client):
+    assert create_room(client, {"alice": "Mario"}).status_code == 201
+    response = client.post("/api/rooms", json={"room": "other", "players": [{"username": "bob", "character": "Luigi"}]})
+
+    assert response.status_code == 201
+    assert roster(client, "other") == {"bob": "Luigi"}
+
+
+@pytest.mark.parametrize("players", [
+    [{"character": "Mario"}],
+    ["alice"],
+    {"alice": 3},
+    {"alice": None},
+    [{"username": 7, "character": "Mario"}],
+    "alice,Mario",
+])
+def test_create_rejects_malformed_players(client, players):
+    response = create_room(client, players)
+
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+    assert client.get("/api/rooms").get_json()["rooms"] == []
+
+
+def test_roster_upsert_accepts_a_list(client):
+    create_room(client, {"alice": "Mario"})
+    response = client.post("/api/rooms/show/roster", json={"players": [{"username": "bob", "character": "Luigi"}]})
+
+    assert response.status_code == 200
+    assert roster(client) == {"alice": "Mario", "bob": "Luigi"}
+
+
+@pytest.mark.parametrize("players", [[{"character": "Luigi"}], {"bob": ["Luigi"]}, 5])
+def test_roster_upsert_rejects_malformed_players(client, players):
+    create_room(client, {"alice": "Mario"})
+    response = client.post("/api/rooms/show/roster", json={"players": players, "replace": True})
+
+    assert response.status_code == 400
+    assert roster(client) == {"alice": "Mario"}
+
+
+def test_put_player_rejects_a_non_string_character(client):
+    create_room(client, {"alice": "Mario"})
+
+    assert client.put("/api/rooms/show/players/bob", json={"character": 1}).status_code == 400
+    assert client.put("/api/rooms/show/players/bob", json={"character": "Luigi"}).status_code == 200
+
+
+class FakeOBS:
+    """Stands in for OBSManager in RoomService.sync(): raises `error` or answers with `results`"""
+
+    def __init__(self, error=None, results=()):
+        self.connected = True
+        self.slot_count = 0
+        self.error = error
+        self.results = list(results)
+
+    def update_sources(self, links, layout=None):
+        if self.error is not None:
+            raise self.error
+        self.slot_count = len(links)
+        return self.results
+
+
+def sync_client(obs):
+    client = create_app(RoomService(VDONinjaManager(), obs)).test_client()
+    create_room(client, {"alice": "Mario"})
+    return client
+
+
+@pytest.mark.parametrize("error, status", [(OBSTimeoutError("slow"), 504), (OBSRequestError("refused"), 502)])
+def test_sync_maps_obs_errors_to_gateway_statuses(error, status):
+    response = sync_client(FakeOBS(error=error)).post("/api/rooms/show/sync")
+
+    assert response.status_code == status
+    assert "error" in response.get_json()
+
+
+def test_sync_reports_failed_source_updates():
+    failed = OBSRequestResult(requests.SetInputSettings(inputName="p1vdosolo"), False, "No source")
+    response = sync_client(FakeOBS(results=[failed])).post("/api/rooms/show/sync")
+
+    assert response.status_code == 502
+    assert "1 of 1" in response.get_json()["error"]
+
+
+def test_sync_answers_with_the_synced_revision():
+    response = sync_client(FakeOBS()).post("/api/rooms/show/sync")
+
+    assert response.status_code == 200
+    assert response.get_json() == {"room": "show", "slots": 2, "revision": 1}
+
+
+def test_links_and_list_carry_the_revision(client):
+    create_room(client, {"alice": "Mario"})
+    client.put("/api/rooms/show/players/bob", json={"character": "Luigi"})
+
+    assert client.get("/api/rooms/show/links").get_json()["revision"] == 2
+    assert client.get("/api/rooms").get_json()["rooms"] == [{"room": "show", "players": 2, "revision": 2}]
+    client.delete("/api/rooms/show")
+    assert client.get("/api/rooms/show/links").status_code == 404
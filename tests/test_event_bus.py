@@ -0,0 +1,115 @@
+import threading
+from dataclasses import dataclass
+
+import pytest
+
+from event_bus import (EventBus, Event, DISPATCH_SYNC, DISPATCH_THREAD, POLICY_BLOCK, POLICY_DROP_NEWEST,
+                       POLICY_DROP_OLDEST, POLICY_LATEST)
+
+@dataclass
+class Tick(Event):
+    number: int
+
+class BlockedSubscriber:
+    """A thread subscriber whose handler holds on the first event until released"""
+
+    def __init__(self, bus: EventBus, policy: str, max_pending: int = 2):
+        self.received = []
+        self.started = threading.Event()
+        self.gate = threading.Event()
+        self.subscription = bus.subscribe(Tick, self.handle, name="blocked", dispatch=DISPATCH_THREAD,
+                                          policy=policy, max_pending=max_pending)
+
+    def handle(self, event: Tick) -> None:
+        self.started.set()
+        self.gate.wait(5)
+        self.received.append(event.number)
+
+    def hold(self, bus: EventBus) -> None:
+        """Publish tick 0 and wait until the handler is busy with it, leaving the queue empty"""
+        bus.publish(Tick(0))
+        assert self.started.wait(5)
+
+@pytest.fixture
+def bus():
+    bus = EventBus(workers=2)
+    yield bus
+    bus.shutdown()
+
+def drain(bus: EventBus, subscriber: BlockedSubscriber) -> None:
+    subscriber.gate.set()
+    bus.shutdown()
+
+def test_drop_oldest_keeps_the_newest_events(bus):
+    subscriber = BlockedSubscriber(bus, POLICY_DROP_OLDEST, max_pending=2)
+    subscriber.hold(bus)
+    for number in range(1, 5):
+        bus.publish(Tick(number))
+
+    assert [event.number for _, event in subscriber.subscription.pending] == [3, 4]
+    drain(bus, subscriber)
+    assert subscriber.received == [0, 3, 4]
+    assert subscriber.subscription.dropped == 2
+
+def test_drop_newest_keeps_the_oldest_events(bus):
+    subscriber = BlockedSubscriber(bus, POLICY_DROP_NEWEST, max_pending=2)
+    subscriber.hold(bus)
+    for number in range(1, 5):
+        bus.publish(Tick(number))
+
+    drain(bus, subscriber)
+    assert subscriber.received == [0, 1, 2]
+    assert subscriber.subscription.dropped == 2
+
+def test_latest_keeps_only_the_newest_event(bus):
+    subscriber = BlockedSubscriber(bus, POLICY_LATEST, max_pending=10)
+    subscriber.hold(bus)
+    for number in range(1, 5):
+        bus.publish(Tick(number))
+
+    assert subscriber.subscription.max_pending == 1
+    drain(bus, subscriber)
+    assert subscriber.received == [0, 4]
+    assert subscriber.subscription.dropped == 3
+
+def test_block_makes_the_publisher_wait_for_room(bus):
+    subscriber = BlockedSubscriber(bus, POLICY_BLOCK, max_pending=1)
+    subscriber.hold(bus)
+    bus.publish(Tick(1))
+    publisher = threading.Thread(target=bus.publish, args=(Tick(2),))
+    publisher.start()
+    publisher.join(0.2)
+
+    assert publisher.is_alive()
+    subscriber.gate.set()
+    publisher.join(5)
+    assert not publisher.is_alive()
+    bus.shutdown()
+    assert subscriber.received == [0, 1, 2]
+    assert subscriber.subscription.dropped == 0
+
+def test_sync_subscribers_run_inline_and_respect_where(bus):
+    received = []
+    bus.subscribe(Tick, lambda event: received.append(event.number), dispatch=DISPATCH_SYNC,
+                  where=lambda event: event.number % 2 == 0)
+    for number in range(5):
+        bus.publish(Tick(number))
+
+    assert received == [0, 2, 4]
+
+def test_failing_handler_does_not_stop_other_subscribers(bus):
+    received = []
+
+    def fail(event):
+        raise RuntimeError("boom")
+
+    failing = bus.subscribe(Tick, fail, name="failing")
+    bus.subscribe(Tick, lambda event: received.append(event.number))
+    bus.publish(Tick(1))
+
+    assert received == [1]
+    assert failing.failures == 1
+
+def test_unknown_policy_is_rejected(bus):
+    with pytest.raises(ValueError):
+        bus.subscribe(Tick, lambda event: None, policy="sometimes")
@@ -0,0 +1,96 @@
+import json
+import logging
+import logging.handlers
+
+from event_index import EventIndex
+
+
+def event_lines(start, count, type_="sync"):
+    return "".join(json.dumps({"ts": 1000.0 + index, "type": type_, "slot": index % 4}) + "\n"
+                   for index in range(start, start + count))
+
+
+def test_update_indexes_only_new_lines(tmp_path):
+    log = tmp_path / "events.jsonl"
+    log.write_text(event_lines(0, 3))
+    index = EventIndex(str(log))
+    try:
+        assert index.update() == 3
+        with open(log, "a") as f:
+            f.write(event_lines(3, 2) + '{"ts": 2000')  # Last line still being written
+        assert index.update() == 2
+        assert [event["ts"] for event in index.query(since=1003.0)] == [1003.0, 1004.0]
+    finally:
+        index.close()
+
+
+def test_reused_inode_with_other_content_is_indexed_again(tmp_path):
+    log = tmp_path / "events.jsonl"
+    log.write_text(event_lines(0, 3))
+    index = EventIndex(str(log))
+    try:
+        index.update()
+        # Same inode, different file: as when rotation reuses a deleted backup's inode
+        with open(log, "r+") as f:
+            f.write(event_lines(50, 5, type_="generate_links"))
+        assert index.update() == 5
+        assert [event["ts"] for event in index.query()] == [1050.0 + index for index in range(5)]
+        assert index.unreadable == 0
+    finally:
+        index.close()
+
+
+def test_query_skips_lines_the_log_no_longer_holds(tmp_path):
+    log = tmp_path / "events.jsonl"
+    log.write_text(event_lines(0, 3))
+    index = EventIndex(str(log))
+    try:
+        index.update()
+        with open(log, "r+") as f:
+            f.write("x" * 200 + "\n")
+        assert list(index.query()) == []
+        assert index.unreadable == 3
+    finally:
+        index.close()
+
+
+def test_query_stays_readable_across_rotations(tmp_path):
+    log = tmp_path / "events.jsonl"
+    handler = logging.handlers.RotatingFileHandler(log, maxBytes=600, backupCount=1)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger = logging.getLogger("test_event_index.rotation")
+    logger.propagate = False
+    logger.addHandler(handler)
+    index = EventIndex(str(log), str(tmp_path / "events.idx"))
+    try:
+        written = 0
+        for _ in range(20):
+            for _ in range(7):
+                logger.warning(json.dumps({"ts": 1000.0 + written, "type": "sync", "slot": written % 4}))
+                written += 1
+            index.update()
+            on_disk = sorted(json.loads(line)["ts"] for path in index.log_files() for line in open(path))
+            assert [event["ts"] for event in index.query()] == on_disk
+            assert [event["ts"] for event in index.query(slot=1)] == [ts for ts in on_disk if ts % 4 == 1]
+    finally:
+        index.close()
+        logger.removeHandler(handler)
+        handler.close()
+
+
+def test_index_without_fingerprints_is_rebuilt(tmp_path):
+    log = tmp_path / "events.jsonl"
+    log.write_text(event_lines(0, 3))
+    index_path = str(tmp_path / "events.idx")
+    index = EventIndex(str(log), index_path)
+    index.update()
+    index.db.execute("UPDATE files SET fingerprint = NULL")
+    index.db.commit()
+    index.close()
+
+    index = EventIndex(str(log), index_path)
+    try:
+        assert index.update() == 3
+        assert len(list(index.query())) == 3
+    finally:
+        index.close()
@@ -0,0 +1,77 @@
+import urllib.request
+
+import pytest
+
+from metrics import MetricsRegistry, MetricsServer
+
+def test_counter_with_labels_renders_one_line_per_label_set():
+    registry = MetricsRegistry()
+    requests = registry.counter("obs_requests_total", "OBS requests", ("type", "outcome"))
+    requests.labels("SetInputSettings", "ok").inc()
+    requests.labels("SetInputSettings", "ok").inc(2)
+    requests.labels("GetVersion", "failed").inc()
+
+    assert registry.render().splitlines() == [
+        "# HELP obs_requests_total OBS requests",
+        "# TYPE obs_requests_total counter",
+        'obs_requests_total{type="SetInputSettings",outcome="ok"} 3',
+        'obs_requests_total{type="GetVersion",outcome="failed"} 1',
+    ]
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.counter("rooms_total", "Rooms", ("room",)).labels('a "quoted"\\room\nname').inc()
+
+    assert 'rooms_total{room="a \\"quoted\\"\\\\room\\nname"} 1' in registry.render()
+
+def test_histogram_renders_cumulative_buckets_sum_and_count():
+    registry = MetricsRegistry()
+    latency = registry.histogram("sync_seconds", "Sync time", ("room",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        latency.labels("main").observe(value)
+
+    assert registry.render().splitlines()[2:] == [
+        'sync_seconds_bucket{room="main",le="0.1"} 1',
+        'sync_seconds_bucket{room="main",le="1"} 3',
+        'sync_seconds_bucket{room="main",le="+Inf"} 4',
+        'sync_seconds_sum{room="main"} 4.05',
+        'sync_seconds_count{room="main"} 4',
+    ]
+
+def test_gauge_function_is_read_at_render_time():
+    registry = MetricsRegistry()
+    depth = {"bulk": 3, "live": 0}
+    registry.gauge("lane_depth", "Queued commands", ("lane",)).set_function(lambda: dict(depth))
+    registry.gauge("connected", "Connected").set_function(lambda: 1)
+    depth["bulk"] = 5
+
+    lines = registry.render().splitlines()
+    assert 'lane_depth{lane="bulk"} 5' in lines
+    assert 'lane_depth{lane="live"} 0' in lines
+    assert "connected 1" in lines
+    assert lines.index("# TYPE connected gauge") < lines.index("# TYPE lane_depth gauge")  # Sorted by name
+
+def test_registering_again_returns_the_same_metric():
+    registry = MetricsRegistry()
+    counter = registry.counter("hits_total", "Hits", ("cache",))
+
+    assert registry.counter("hits_total", "Hits", ("cache",)) is counter
+    with pytest.raises(ValueError):
+        registry.gauge("hits_total", "Hits", ("cache",))
+    with pytest.raises(ValueError):
+        counter.labels("links", "extra")
+
+def test_server_serves_the_registry():
+    registry = MetricsRegistry()
+    registry.counter("scrapes_total", "Scrapes").inc()
+    server = MetricsServer(registry, port=0)
+    port = server.start()
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+            body = response.read().decode("utf-8")
+            content_type = response.headers["Content-Type"]
+    finally:
+        server.stop()
+
+    assert "scrapes_total 1" in body.splitlines()
+    assert content_type.startswith("text/plain; version=0.0.4")
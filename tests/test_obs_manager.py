@@ -0,0 +1,175 @@
+import asyncio
+import socket
+import time
+
+import pytest
+from obswebsocket import requests
+
+from obs_manager import Deadline, OBSManager, OBSTimeoutError
+from obs_standin import StandInOBSServer
+
+LINKS = {"host": "https://vdo.ninja/?view=host", "alice": "https://vdo.ninja/?view=alice"}
+
+
+def roster_server():
+    server = StandInOBSServer()
+    for slot in range(2):
+        server.add_input(f"p{slot}vdosolo", "browser_source", scene="VDO Assets")
+        server.add_input(f"p{slot}name", "text_gdiplus_v2", scene="VDO Assets")
+    return server
+
+
+def test_update_sources_labels_the_host(connect_obs):
+    server = roster_server()
+    manager = connect_obs(server)
+    results = manager.update_sources(LINKS, host_label="Dana")
+
+    assert results and all(result.ok for result in results)
+    assert server.inputs["p0name"]["inputSettings"]["text"] == "Dana"
+    assert server.inputs["p1name"]["inputSettings"]["text"] == "Player 1"
+    assert server.inputs["p1vdosolo"]["inputSettings"]["url"] == LINKS["alice"]
+    # The reconciler compares OBS against what was asked for, so the label must be part of it
+    assert manager.get_desired_inputs()["p0name"] == {"text": "Dana"}
+
+
+def test_update_sources_defaults_the_host_label(connect_obs):
+    server = roster_server()
+    connect_obs(server).update_sources(LINKS)
+
+    assert server.inputs["p0name"]["inputSettings"]["text"] == "Host"
+
+
+class SlowStandIn(StandInOBSServer):
+    """Stand-in server that holds each answer for `delays[inputName]` seconds and tracks concurrency"""
+
+    def __init__(self, delays=None):
+        super().__init__()
+        self.delays = delays or {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _answer(self, websocket, codec, request):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get((request.get("requestData") or {}).get("inputName"), 0.0))
+            await super()._answer(websocket, codec, request)
+        finally:
+            self.in_flight -= 1
+
+
+def named_inputs(server, count):
+    for slot in range(count):
+        server.add_input(f"p{slot}vdosolo", "browser_source", {"url": f"https://vdo.ninja/?view=p{slot}"})
+    return [requests.GetInputSettings(inputName=f"p{slot}vdosolo") for slot in range(count)]
+
+
+def test_answers_arriving_out_of_order_go_to_their_requests(connect_obs):
+    # Later requests are answered first
+    server = SlowStandIn({f"p{slot}vdosolo": 0.05 * (5 - slot) for slot in range(5)})
+    obs_requests = named_inputs(server, 5)
+    manager = connect_obs(server)
+    results = manager.call_pipelined(obs_requests)
+
+    assert [result.request for result in results] == obs_requests
+    assert [result.request.getInputSettings()["url"] for result in results] == [
+        f"https://vdo.ninja/?view=p{slot}" for slot in range(5)]
+    assert manager.metrics["requests"] == 6  # GetVersion on connect, then the five
+    assert manager.metrics["failures"] == 0
+
+
+def test_window_caps_requests_in_flight(connect_obs):
+    server = SlowStandIn({f"p{slot}vdosolo": 0.05 for slot in range(6)})
+    obs_requests = named_inputs(server, 6)
+    manager = connect_obs(server, pipeline_window=8)
+
+    assert all(result.ok for result in manager.call_pipelined(obs_requests, window=2))
+    assert server.max_in_flight == 2
+
+    server.max_in_flight = 0
+    assert all(result.ok for result in manager.call_pipelined(obs_requests))
+    assert server.max_in_flight == 6
+
+
+def test_a_timeout_only_fails_its_own_request(connect_obs):
+    server = SlowStandIn({"p1vdosolo": 0.3})
+    obs_requests = named_inputs(server, 3)
+    manager = connect_obs(server)
+    results = manager.call_pipelined(obs_requests, timeout=0.1)
+
+    assert [result.ok for result in results] == [True, False, True]
+    assert results[1].timed_out
+    assert manager.metrics["timeouts"] == 1
+    # The late answer is dropped rather than given to another request
+    time.sleep(0.3)
+    assert manager.call_pipelined(obs_requests[:1])[0].request.getInputSettings()["url"] == "https://vdo.ninja/?view=p0"
+
+
+def test_failures_are_counted(connect_obs):
+    manager = connect_obs(StandInOBSServer())
+    results = manager.call_pipelined([requests.GetInputSettings(inputName="missing")])
+
+    assert not results[0].ok and not results[0].timed_out
+    assert "No source was found" in results[0].error
+    assert manager.metrics["failures"] == 1
+
+
+def test_deadline_caps_timeouts():
+    assert Deadline().remaining() is None
+    assert Deadline().cap(5.0) == 5.0
+    assert Deadline(0.5).cap(5.0) <= 0.5
+    assert Deadline(0.0).expired()
+
+
+def test_shared_deadline_stops_sending_once_it_passes(connect_obs):
+    server = SlowStandIn({f"p{slot}vdosolo": 0.15 for slot in range(6)})
+    obs_requests = named_inputs(server, 6)
+    manager = connect_obs(server)
+    started = time.monotonic()
+    results = manager.call_pipelined(obs_requests, window=1, deadline=Deadline(0.4))
+
+    assert time.monotonic() - started < 1.0
+    assert results[0].ok
+    assert not results[-1].ok and results[-1].timed_out
+    # Requests are sent in order, so once one misses the deadline so does everything after it
+    first_missed = [result.ok for result in results].index(False)
+    assert all(result.timed_out for result in results[first_missed:])
+
+
+def test_single_call_raises_on_timeout(connect_obs):
+    server = SlowStandIn({"p0vdosolo": 0.5})
+    named_inputs(server, 1)
+    manager = connect_obs(server)
+
+    with pytest.raises(OBSTimeoutError):
+        manager._call(requests.GetInputSettings(inputName="p0vdosolo"), Deadline(0.1))
+
+
+def test_update_sources_raises_when_the_deadline_passes(connect_obs):
+    server = SlowStandIn({"p0vdosolo": 0.5, "p1vdosolo": 0.5})
+    for slot in range(2):
+        server.add_input(f"p{slot}vdosolo", "browser_source", scene="VDO Assets")
+        server.add_input(f"p{slot}name", "text_gdiplus_v2", scene="VDO Assets")
+    manager = connect_obs(server)
+    started = time.monotonic()
+
+    with pytest.raises(OBSTimeoutError):
+        manager.update_sources(LINKS, deadline=Deadline(0.2))
+    assert time.monotonic() - started < 1.0
+
+
+def test_connect_gives_up_on_a_silent_server():
+    # Accepts the TCP connection but never sends the websocket handshake
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(1)
+    manager = OBSManager()
+    started = time.monotonic()
+    try:
+        with pytest.raises(OBSTimeoutError):
+            manager.connect(host="127.0.0.1", port=listener.getsockname()[1], timeout=0.3)
+        assert time.monotonic() - started < 1.5
+        assert not manager.connected and manager.ws is None
+        assert manager.metrics["connect_timeouts"] == 1
+    finally:
+        listener.close()
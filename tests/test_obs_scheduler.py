@@ -0,0 +1,105 @@
+import threading
+
+from obs_scheduler import (OBSScheduler, LANE_BULK, LANE_INTERACTIVE, LANE_LIVE, LANE_RECONCILE,
+                           LANE_TELEMETRY)
+
+def queued_scheduler(**kwargs):
+    """A scheduler that accepts commands but has no workers, so _next_command can be stepped by hand"""
+    scheduler = OBSScheduler(**kwargs)
+    scheduler.running = True
+    return scheduler
+
+def next_lane(scheduler):
+    with scheduler._cond:
+        command, _ = scheduler._next_command()
+    return command.lane if command is not None else None
+
+def test_lanes_are_served_by_priority_and_in_order_within_a_lane():
+    scheduler = queued_scheduler()
+    for lane in (LANE_TELEMETRY, LANE_BULK, LANE_RECONCILE, LANE_LIVE, LANE_BULK, LANE_INTERACTIVE):
+        scheduler.submit(lane, lambda: None)
+
+    order = [next_lane(scheduler) for _ in range(6)]
+
+    assert order == [LANE_INTERACTIVE, LANE_LIVE, LANE_BULK, LANE_BULK, LANE_RECONCILE, LANE_TELEMETRY]
+    assert next_lane(scheduler) is None
+
+def test_command_waiting_past_max_wait_is_promoted_over_higher_lanes():
+    scheduler = queued_scheduler(max_wait=2.0)
+    scheduler.submit(LANE_TELEMETRY, lambda: None)
+    scheduler.submit(LANE_INTERACTIVE, lambda: None)
+    scheduler._queues[LANE_TELEMETRY][0].queued_at -= 5.0
+
+    assert next_lane(scheduler) == LANE_TELEMETRY
+    assert scheduler.starvation_promotions == 1
+    assert next_lane(scheduler) == LANE_INTERACTIVE
+
+def test_oldest_starved_command_goes_first():
+    scheduler = queued_scheduler(max_wait=1.0)
+    scheduler.submit(LANE_BULK, lambda: None)
+    scheduler.submit(LANE_TELEMETRY, lambda: None)
+    scheduler._queues[LANE_BULK][0].queued_at -= 3.0
+    scheduler._queues[LANE_TELEMETRY][0].queued_at -= 6.0
+
+    assert next_lane(scheduler) == LANE_TELEMETRY
+    assert next_lane(scheduler) == LANE_BULK
+
+def test_command_within_max_wait_is_not_promoted():
+    scheduler = queued_scheduler(max_wait=60.0)
+    scheduler.submit(LANE_TELEMETRY, lambda: None)
+    scheduler.submit(LANE_INTERACTIVE, lambda: None)
+
+    assert next_lane(scheduler) == LANE_INTERACTIVE
+    assert scheduler.starvation_promotions == 0
+
+def test_background_lanes_leave_reserved_workers_free():
+    scheduler = queued_scheduler(workers=2, reserved_workers=1)
+    scheduler._busy_background = 1
+    scheduler.submit(LANE_BULK, lambda: None)
+
+    assert next_lane(scheduler) is None
+    scheduler.submit(LANE_LIVE, lambda: None)
+    assert next_lane(scheduler) == LANE_LIVE
+
+def test_rate_limited_lane_waits_for_a_token():
+    scheduler = queued_scheduler(lane_rates={LANE_BULK: 1.0})
+    scheduler.submit(LANE_BULK, lambda: None)
+    scheduler.submit(LANE_BULK, lambda: None)
+
+    assert next_lane(scheduler) == LANE_BULK
+    with scheduler._cond:
+        command, wait = scheduler._next_command()
+    assert command is None
+    assert 0 < wait <= 1.0
+
+def test_workers_run_interactive_before_queued_bulk():
+    scheduler = OBSScheduler(workers=1, reserved_workers=0)
+    scheduler.start()
+    gate = threading.Event()
+    started = threading.Event()
+    ran = []
+    try:
+        def blocker():
+            started.set()
+            gate.wait(5)
+
+        scheduler.submit(LANE_BULK, blocker)
+        assert started.wait(5)
+        bulk = [scheduler.submit(LANE_BULK, lambda i=i: ran.append(f"bulk{i}")) for i in range(3)]
+        interactive = scheduler.submit(LANE_INTERACTIVE, lambda: ran.append("interactive"))
+        gate.set()
+        for future in bulk + [interactive]:
+            future.result(5)
+    finally:
+        scheduler.stop()
+
+    assert ran == ["interactive", "bulk0", "bulk1", "bulk2"]
+    assert scheduler.counts[LANE_INTERACTIVE] == 1
+
+def test_stop_cancels_commands_that_have_not_started():
+    scheduler = queued_scheduler()
+    future = scheduler.submit(LANE_BULK, lambda: None)
+    scheduler.stop()
+
+    assert future.cancelled()
+    assert scheduler.submit(LANE_BULK, lambda: None).cancelled()
@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+
+from obs_manager import SHADOW_SUFFIX
+from obs_standin import StandInOBSServer
+
+TRANSFORM = {"positionX": 10.0, "positionY": 20.0}
+
+
+class RejectingTransforms(StandInOBSServer):
+    """Stand-in server where every SetSceneItemTransform fails"""
+
+    def handle_request(self, request_type, data):
+        if request_type == "SetSceneItemTransform":
+            self.request_count += 1
+            return False, {"comment": "Rejected"}
+        return super().handle_request(request_type, data)
+
+
+def arranged_layout():
+    return SimpleNamespace(layout=SimpleNamespace(scene="VDO Assets", arrange=True),
+                           video_transform=lambda slot, slot_count: dict(TRANSFORM))
+
+
+def shadow_server(server):
+    server.add_input("p0vdosolo", "browser_source", scene="VDO Assets")
+    return server
+
+
+def test_warm_shadow_bank_records_transforms_obs_applied(connect_obs):
+    manager = connect_obs(shadow_server(StandInOBSServer()))
+    results = manager.warm_shadow_bank({"p0vdosolo": {"url": "https://vdo.ninja/?view=a"}}, 1, arranged_layout())
+
+    assert all(result.ok for result in results)
+    assert manager._applied_transforms == {("VDO Assets", f"p0vdosolo{SHADOW_SUFFIX}"): TRANSFORM}
+
+
+def test_warm_shadow_bank_skips_transforms_that_failed(connect_obs):
+    manager = connect_obs(shadow_server(RejectingTransforms()))
+    results = manager.warm_shadow_bank({"p0vdosolo": {"url": "https://vdo.ninja/?view=a"}}, 1, arranged_layout())
+
+    assert [result.request.name for result in results if not result.ok] == ["SetSceneItemTransform"]
+    assert manager._applied_transforms == {}
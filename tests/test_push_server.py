@@ -0,0 +1,149 @@
+import asyncio
+import json
+
+import pytest
+from websockets.sync.client import connect
+
+from event_bus import EventBus, LinksRegenerated
+from push_server import KIND_LINKS, PushServer, _Client, _Delta
+
+
+class HeldWebSocket:
+    """A dashboard connection whose first send waits until released"""
+
+    def __init__(self):
+        self.sent = []
+        self.sending = asyncio.Event()
+        self.release = asyncio.Event()
+        self.transport = None
+
+    async def send(self, message):
+        if not self.sent:
+            self.sending.set()
+            await self.release.wait()
+        self.sent.append(json.loads(message))
+
+
+@pytest.fixture
+def bus():
+    bus = EventBus(workers=2)
+    yield bus
+    bus.shutdown()
+
+
+def busy_client(server):
+    """A client that has its snapshot and is in the middle of a send, so deltas queue for it"""
+    client = _Client(HeldWebSocket())
+    client.needs_snapshot = False
+    client.sending = True
+    server.clients.add(client)
+    return client
+
+
+def test_deltas_for_a_busy_client_merge_into_one(bus):
+    server = PushServer(bus)
+    client = busy_client(server)
+
+    server._update(KIND_LINKS, "table1", {"alice": "a1", "bob": "b1"})
+    server._update(KIND_LINKS, "table1", {"alice": "a2"})
+    server._update(KIND_LINKS, "table1", {"alice": "a2", "bob": "b2"})
+
+    delta = client.pending[(KIND_LINKS, "table1")]
+    assert len(client.pending) == 1
+    assert delta.changed == {"alice": "a2", "bob": "b2"}
+    assert delta.removed == set()
+    assert server.stats["coalesced"] == 2
+
+
+def test_merging_leaves_the_shared_delta_alone(bus):
+    server = PushServer(bus)
+    first, second = busy_client(server), busy_client(server)
+
+    server._update(KIND_LINKS, "table1", {"alice": "a1"})
+    shared = first.pending[(KIND_LINKS, "table1")]
+    assert second.pending[(KIND_LINKS, "table1")] is shared
+
+    second.pending.clear()  # The second client caught up with the first delta
+    server._update(KIND_LINKS, "table1", {})
+
+    assert shared.changed == {"alice": "a1"}
+    assert json.loads(shared.encoded)["changed"] == {"alice": "a1"}
+    assert first.pending[(KIND_LINKS, "table1")].changed == {}
+    assert first.pending[(KIND_LINKS, "table1")].removed == {"alice"}
+    assert second.pending[(KIND_LINKS, "table1")].removed == {"alice"}
+
+
+def test_client_too_far_behind_is_resynced(bus):
+    server = PushServer(bus, max_pending=2)
+    client = busy_client(server)
+
+    server._update(KIND_LINKS, "table1", {"alice": "a1"})
+    server._update(KIND_LINKS, "table2", {"bob": "b1"})
+    server._update(KIND_LINKS, "table3", {"carol": "c1"})
+
+    assert client.pending == {}
+    assert client.needs_snapshot
+    assert server.stats["resyncs"] == 1
+
+    # The snapshot will carry later changes; nothing queues until it is sent
+    server._update(KIND_LINKS, "table1", {"alice": "a2"})
+    assert client.pending == {}
+    assert json.loads(server.snapshot())["rooms"]["table1"][KIND_LINKS] == {"alice": "a2"}
+
+
+def test_unchanged_state_sends_nothing(bus):
+    server = PushServer(bus)
+    client = busy_client(server)
+
+    server._update(KIND_LINKS, "table1", {"alice": "a1"})
+    client.pending.clear()
+    server._update(KIND_LINKS, "table1", {"alice": "a1"})
+
+    assert client.pending == {}
+    assert server.stats["deltas"] == 1
+
+
+def test_deltas_published_during_a_send_go_out_as_one_message(bus):
+    server = PushServer(bus)
+
+    async def run():
+        websocket = HeldWebSocket()
+        client = _Client(websocket)
+        client.needs_snapshot = False
+        server.clients.add(client)
+        client.pending[(KIND_LINKS, "table1")] = _Delta({"alice": "a1"})
+        client.wakeup.set()
+        sender = asyncio.ensure_future(server._send_loop(client))
+
+        await websocket.sending.wait()
+        server._update(KIND_LINKS, "table2", {"bob": "b1"})
+        server._update(KIND_LINKS, "table2", {"bob": "b2", "carol": "c1"})
+        websocket.release.set()
+        while len(websocket.sent) < 2:
+            await asyncio.sleep(0.01)
+        sender.cancel()
+        return websocket.sent
+
+    sent = asyncio.run(run())
+
+    assert [message["room"] for message in sent] == ["table1", "table2"]
+    assert sent[1]["changed"] == {"bob": "b2", "carol": "c1"}
+    assert server.stats["coalesced"] == 1
+
+
+def test_dashboard_gets_snapshot_then_deltas(bus):
+    server = PushServer(bus, port=0)
+    server.state[(KIND_LINKS, "table1")] = {"alice": "a1"}
+    port = server.start()
+    try:
+        with connect(f"ws://127.0.0.1:{port}") as websocket:
+            snapshot = json.loads(websocket.recv(timeout=5))
+            assert snapshot == {"type": "snapshot", "rooms": {"table1": {KIND_LINKS: {"alice": "a1"}}}}
+
+            bus.publish(LinksRegenerated(room_name="table1", links={"bob": "b1"}))
+            delta = json.loads(websocket.recv(timeout=5))
+    finally:
+        server.stop()
+
+    assert delta == {"type": "delta", "kind": KIND_LINKS, "room": "table1", "changed": {"bob": "b1"},
+                     "removed": ["alice"]}
@@ -0,0 +1,143 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from obs_standin import StandInOBSServer
+from room_manager import OBSConnectionPool, RoomManager
+from settings import RoomSettings
+from vdo_ninja_manager import VDONinjaManager
+
+
+class FakeManager:
+    """Counts connects; each one takes a moment, so concurrent callers overlap"""
+
+    def __init__(self):
+        self.connected = False
+        self.connects = []
+
+    def connect(self, host, port, password=None):
+        self.connects.append((host, port, password))
+        time.sleep(0.05)
+        self.connected = True
+
+    def disconnect(self):
+        self.connected = False
+
+
+class RecordingStandIn(StandInOBSServer):
+    """Stand-in server that records input writes and can hold request batches until released"""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = []
+        self.hold = threading.Event()
+        self.holding = threading.Event()
+        self.release = threading.Event()
+
+    def handle_request(self, request_type, data):
+        if request_type in ("CreateInput", "SetInputSettings"):
+            self.writes.append((request_type, data["inputName"]))
+        return super().handle_request(request_type, data)
+
+    async def _answer_batch(self, websocket, codec, batch):
+        if self.hold.is_set():
+            self.holding.set()
+            while not self.release.is_set():
+                await asyncio.sleep(0.01)
+        await super()._answer_batch(websocket, codec, batch)
+
+
+@pytest.fixture
+def rooms():
+    """Start a recording stand-in server and a RoomManager that targets it"""
+    server = RecordingStandIn()
+    server.start()
+    pool = OBSConnectionPool()
+    manager = RoomManager(pool, VDONinjaManager(), default_target=("127.0.0.1", server.port, None), workers=2)
+    yield server, manager
+    server.release.set()
+    manager.shutdown()
+    pool.close_all()
+    server.stop()
+
+
+def test_pool_connects_once_per_obs_instance():
+    created = []
+
+    def factory():
+        created.append(FakeManager())
+        return created[-1]
+
+    pool = OBSConnectionPool(factory)
+    found = []
+    threads = [threading.Thread(target=lambda: found.append(pool.get("obs1", 4455, "secret"))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    other = pool.get("obs2", 4455)
+
+    assert len(created) == 2
+    assert all(manager is created[0] for manager in found)
+    assert created[0].connects == [("obs1", 4455, "secret")]
+    assert other is created[1]
+
+
+def test_pool_shares_an_added_manager():
+    shared = FakeManager()
+    shared.connected = True
+    pool = OBSConnectionPool(lambda: pytest.fail("The added manager should be used"))
+    pool.add("localhost", 4455, shared)
+
+    assert pool.get("localhost", 4455) is shared
+    assert shared.connects == []
+    pool.close_all()
+    assert not shared.connected
+
+
+def test_rooms_on_one_obs_share_its_connection(rooms):
+    server, manager = rooms
+    manager.add_room(RoomSettings(room_name="table1", host_username="dana", players={"alice": "Knight"}))
+    manager.add_room(RoomSettings(room_name="table2", host_username="eve"))
+    manager.wait(5)
+
+    assert len(manager.pool.managers) == 1
+    assert ("CreateInput", "table1 p1vdosolo") in server.writes
+    assert ("CreateInput", "table2 p0vdosolo") in server.writes
+    assert "username=dana" in server.inputs["table1 p0vdosolo"]["inputSettings"]["url"]
+    assert "username=eve" in server.inputs["table2 p0vdosolo"]["inputSettings"]["url"]
+
+
+def test_sync_sends_only_the_inputs_that_changed(rooms):
+    server, manager = rooms
+    manager.add_room(RoomSettings(room_name="table1", host_username="dana", players={"alice": "Knight"}))
+    manager.wait(5)
+    server.writes.clear()
+
+    manager.update_room("table1", players={"bob": "Knight"}).result(5)
+
+    assert server.writes == [("SetInputSettings", "table1 p1vdosolo")]
+    assert "username=bob" in server.inputs["table1 p1vdosolo"]["inputSettings"]["url"]
+
+
+def test_edits_during_a_sync_fold_into_one_follow_up(rooms):
+    server, manager = rooms
+    managed = manager.add_room(RoomSettings(room_name="table1", host_username="dana", players={"alice": "Knight"}))
+    manager.wait(5)
+    syncs = manager.stats["syncs"]
+
+    server.hold.set()
+    first = manager.update_room("table1", players={"bob": "Knight"})
+    assert server.holding.wait(5)
+    second = manager.update_room("table1", players={"carol": "Knight"})
+    third = manager.update_room("table1", players={"dave": "Knight"})
+    server.release.set()
+    first.result(5)
+
+    assert second is first and third is first
+    assert manager.stats["coalesced"] == 2
+    assert manager.stats["syncs"] == syncs + 2
+    assert managed.synced_revision == managed.revision
+    assert "username=dave" in server.inputs["table1 p1vdosolo"]["inputSettings"]["url"]
@@ -0,0 +1,80 @@
+import time
+
+from obswebsocket import requests
+
+from obs_standin import StandInOBSServer
+from source_lifecycle import SourceLifecycleManager
+
+
+class RejectingSettings(StandInOBSServer):
+    """Stand-in server that refuses SetInputSettings for the inputs in `rejected`"""
+
+    def __init__(self):
+        super().__init__()
+        self.rejected = set()
+
+    def handle_request(self, request_type, data):
+        if request_type == "SetInputSettings" and data.get("inputName") in self.rejected:
+            self.request_count += 1
+            return False, {"comment": "Rejected"}
+        return super().handle_request(request_type, data)
+
+
+def two_slot_server(server):
+    """p0vdosolo is on program; p1vdosolo is only in the managed scene, so it gets parked"""
+    for slot in range(2):
+        server.add_input(f"p{slot}vdosolo", "browser_source", scene="VDO Assets")
+    server.add_scene_item("Scene", "p0vdosolo")
+    return server
+
+
+def wait_for(condition, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting"
+        time.sleep(0.01)
+
+
+def test_refresh_parks_off_air_sources(connect_obs):
+    server = two_slot_server(StandInOBSServer())
+    lifecycle = SourceLifecycleManager(connect_obs(server))
+    lifecycle.refresh()
+
+    assert lifecycle.live == {"p0vdosolo"}
+    assert lifecycle.parked == {"p1vdosolo"}
+    assert server.inputs["p1vdosolo"]["inputSettings"]["shutdown"] is True
+    assert server.inputs["p0vdosolo"]["inputSettings"]["shutdown"] is False
+
+
+def test_failed_changes_are_retried(connect_obs):
+    server = two_slot_server(RejectingSettings())
+    server.rejected.add("p1vdosolo")
+    lifecycle = SourceLifecycleManager(connect_obs(server))
+    lifecycle.refresh()
+
+    assert lifecycle.live == {"p0vdosolo"}
+    assert lifecycle.parked == set()
+
+    server.rejected.clear()
+    lifecycle.refresh()
+    assert lifecycle.parked == {"p1vdosolo"}
+    assert server.inputs["p1vdosolo"]["inputSettings"]["shutdown"] is True
+
+
+def test_swapped_names_are_parked_again(connect_obs):
+    server = two_slot_server(StandInOBSServer())
+    server.add_input("p1vdosolo_next", "browser_source", scene="VDO Assets", enabled=False)
+    manager = connect_obs(server)
+    lifecycle = SourceLifecycleManager(manager, park_delay=0.0)
+    lifecycle.start()
+    try:
+        wait_for(lambda: lifecycle.parked == {"p1vdosolo"})
+        # The renames flip_shadow_bank() sends: the warm shadow takes the parked source's name
+        for name, new_name in (("p1vdosolo", "p1vdosolo_swap"), ("p1vdosolo_next", "p1vdosolo"),
+                               ("p1vdosolo_swap", "p1vdosolo_next")):
+            manager._call(requests.SetInputName(inputName=name, newInputName=new_name))
+
+        wait_for(lambda: server.inputs["p1vdosolo"]["inputSettings"].get("shutdown") is True)
+        assert lifecycle.parked == {"p1vdosolo"}
+    finally:
+        lifecycle.stop()
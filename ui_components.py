@@ -1,7 +1,6 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Any, Callable, Optional
-from obswebsocket import obsws, requests, exceptions
 
 class ScrollableFrame(ttk.Frame):
     """A scrollable frame widget"""
@@ -119,6 +118,13 @@ class SettingsDialog:
             variable=self.debug_mode_var
         ).pack(anchor="w", pady=5)
         
+        self.memory_profile_var = tk.BooleanVar(value=self.settings.interface.memory_profile)
+        ttk.Checkbutton(
+            frame,
+            text="Memory Profiling (slower)",
+            variable=self.memory_profile_var
+        ).pack(anchor="w", pady=5)
+        
         self.notebook.add(frame, text="Interface")
     
     def setup_video_tab(self):
@@ -265,28 +271,34 @@ class SettingsDialog:
         if not self.enable_obs_var.get():
             messagebox.showwarning("Warning", "OBS integration is disabled. Please enable it first.")
             return
+        # Imported here so the app can start without loading obswebsocket
+        from obs_manager import OBSManager, OBSTimeoutError
             
+        # Create temporary OBS manager for testing
+        test_manager = OBSManager(request_timeout=self.settings.obs.request_timeout,
+                                  encoding=self.settings.obs.encoding)
         try:
-            # Create temporary OBS manager for testing
-            test_manager = OBSManager()
-            
-            # Try to connect with current settings
+            # Try to connect with current settings; bounded so a wrong host can't hang the dialog
             if test_manager.connect(
                 host=self.obs_host_var.get(),
                 port=int(self.obs_port_var.get()),
-                password=self.obs_password_var.get()
+                password=self.obs_password_var.get(),
+                timeout=self.settings.obs.connect_timeout
             ):
                 messagebox.showinfo("Success", "Successfully connected to OBS!")
             else:
                 messagebox.showerror("Error", "Failed to connect to OBS. Please check your settings.")
-            
-            # Clean up test connection
-            test_manager.disconnect()
                 
         except ValueError:
             messagebox.showerror("Error", "Invalid port number")
+        except OBSTimeoutError:
+            messagebox.showerror("Error", f"Timed out connecting to OBS after {self.settings.obs.connect_timeout}s. "
+                                          "Please check the host and port.")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to connect to OBS: {str(e)}")
+        finally:
+            # Clean up test connection
+            test_manager.disconnect()
     
     def apply_settings(self):
         """Apply the settings from the dialog"""
@@ -294,6 +306,7 @@ class SettingsDialog:
         self.settings.interface.show_labels = self.show_labels_var.get()
         self.settings.interface.clean_output = self.clean_output_var.get()
         self.settings.interface.debug_mode = self.debug_mode_var.get()
+        self.settings.interface.memory_profile = self.memory_profile_var.get()
         self.settings.interface.enable_obs = self.enable_obs_var.get()
         
         # Video settings
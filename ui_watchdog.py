@@ -0,0 +1,110 @@
+from collections import deque
+from typing import Any, Deque, Optional
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from metrics import REGISTRY
+
+TK_LOOP_LAG = REGISTRY.histogram("vidlinker_tk_loop_lag_seconds", "How late the Tk event loop ran a timer",
+                                 buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
+UI_STALLS = REGISTRY.counter("vidlinker_ui_stalls_total", "Times the Tk event loop stalled past the threshold")
+
+class StallWatchdog:
+    """Notices when the Tk main loop stops running and logs what it was doing.
+    
+    A heartbeat scheduled with root.after records how late each tick runs
+    (the event loop lag, which is also how long a keystroke would wait).
+    A monitor thread checks the last heartbeat; once it is `threshold`
+    seconds overdue, the main thread's stack is captured with
+    sys._current_frames() and written to the log, again every `threshold`
+    while the stall lasts (up to `max_samples`), and the stall's length is
+    logged when the loop comes back.
+    """
+    
+    def __init__(self, root: Any, interval: float = 0.1, threshold: float = 0.5, max_samples: int = 5,
+                 history: int = 600):
+        self.root = root
+        self.interval = interval
+        self.threshold = threshold
+        self.max_samples = max_samples
+        self.lags: Deque[float] = deque(maxlen=history)
+        self.stalls = 0
+        self.longest_stall = 0.0
+        
+        self._main_ident = threading.get_ident()  # Created on the Tk thread
+        self._last_beat = time.perf_counter()
+        self._stalled_since: Optional[float] = None
+        self._samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.logger = logging.getLogger(__name__)
+    
+    def start(self) -> None:
+        """Start the heartbeat and the monitor thread"""
+        self._stop.clear()
+        self._last_beat = time.perf_counter()
+        self.root.after(int(self.interval * 1000), self._beat)
+        self._thread = threading.Thread(target=self._monitor, name="ui-watchdog", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+    
+    def _beat(self) -> None:
+        """Runs on the Tk thread"""
+        now = time.perf_counter()
+        lag = max(0.0, now - self._last_beat - self.interval)
+        self.lags.append(lag)
+        TK_LOOP_LAG.observe(lag)
+        self._last_beat = now
+        if not self._stop.is_set():
+            self.root.after(int(self.interval * 1000), self._beat)
+    
+    def _monitor(self) -> None:
+        while not self._stop.wait(self.interval / 2):
+            now = time.perf_counter()
+            last_beat = self._last_beat
+            overdue = now - last_beat - self.interval
+            
+            if self._stalled_since is not None and last_beat > self._stalled_since:
+                # The loop is running again
+                duration = last_beat - self._stalled_since - self.interval
+                self.longest_stall = max(self.longest_stall, duration)
+                self.logger.warning(f"UI stall ended after {duration * 1000:.0f}ms")
+                self._stalled_since = None
+            
+            if overdue < self.threshold:
+                continue
+            if self._stalled_since is None:
+                self._stalled_since = last_beat
+                self._samples = 0
+                self.stalls += 1
+                UI_STALLS.inc()
+            # One sample as the threshold is crossed, then one per threshold while it lasts
+            if self._samples < self.max_samples and overdue >= self.threshold * (self._samples + 1):
+                self._samples += 1
+                self.logger.warning(f"UI stalled for {overdue * 1000:.0f}ms so far; main thread stack:\n"
+                                    f"{self.main_stack()}")
+    
+    def main_stack(self) -> str:
+        """The Tk thread's current stack, innermost call last"""
+        frame = sys._current_frames().get(self._main_ident)
+        if frame is None:
+            return "  (main thread not found)"
+        return "".join(traceback.format_stack(frame)).rstrip()
+    
+    def describe(self) -> str:
+        """Summarize event loop lag and stalls for the debug panel"""
+        lags = sorted(self.lags)
+        if not lags:
+            return "UI loop: no heartbeats yet"
+        p50 = lags[len(lags) // 2] * 1000
+        p95 = lags[min(len(lags) - 1, int(len(lags) * 0.95))] * 1000
+        return (f"UI loop: lag p50 {p50:.1f}ms, p95 {p95:.1f}ms, max {lags[-1] * 1000:.0f}ms; "
+                f"{self.stalls} stalls over {self.threshold * 1000:.0f}ms "
+                f"(longest {self.longest_stall * 1000:.0f}ms)")
@@ -19,6 +19,15 @@ class URLManager:
                 param_strings.append(f"{k}={v}")
         return URLManager.BASE_URL + "&".join(param_strings)
     
+    @staticmethod
+    def append_params(url: str, params: dict) -> str:
+        """Append parameters to an existing link, handling None values as standalone parameters"""
+        if not params:
+            return url
+        extra = URLManager.build_url(params)[len(URLManager.BASE_URL):]
+        separator = "&" if "?" in url else "?"
+        return url + separator + extra
+    
     @staticmethod
     def get_common_params(room_name: str) -> dict:
         """Get common parameters used in all links"""
@@ -1,3 +1,11 @@
+import time
+
+from metrics import REGISTRY
+
+LINK_GENERATIONS = REGISTRY.counter("vidlinker_link_generations_total", "Rooms whose links were generated")
+LINK_GENERATION_SECONDS = REGISTRY.histogram("vidlinker_link_generation_seconds", "Time to generate a room's links",
+                                             buckets=(0.00001, 0.0001, 0.001, 0.01, 0.1))
+
 class VDONinjaManager:
     def __init__(self):
         self.base_url = "https://vdo.ninja"
@@ -48,7 +56,61 @@ class VDONinjaManager:
             
         query_string = "&".join([f"{k}={v}" for k, v in params.items()])
         return f"{self.base_url}/?{query_string}"
-
+    
+    def generate_room_links(self, room_name, password, host_username="", host_character="", players=None):
+        """Generate the host link and one link per player (keyed by username) for a room"""
+        if not room_name:
+            raise ValueError("Room name is not set")
+        started = time.perf_counter()
+        links = {}
+        
+        # Generate host/director params
+        params = {
+            "room": room_name,
+            "director": "1",
+            "quality": "1080p",
+            "meshcast": "1"
+        }
+        
+        # Only add password if it exists
+        if password:
+            params["password"] = password
+        
+        # Add host name if provided
+        if host_username:
+            params["username"] = host_username
+        
+        # Add host character if provided
+        if host_character:
+            params["character"] = host_character
+        
+        links['host'] = f"{self.base_url}/?" + "&".join(f"{k}={v}" for k, v in params.items())
+        
+        # Generate player links
+        for username, character in (players or {}).items():
+            if not username:  # Only generate link if username is provided
+                continue
+            player_params = {
+                "room": room_name,
+                "username": username,
+                "quality": "1080p",
+                "meshcast": "1"
+            }
+            
+            # Only add password if it exists
+            if password:
+                player_params["password"] = password
+            
+            # Add character if provided
+            if character:
+                player_params["character"] = character
+            
+            links[username] = f"{self.base_url}/?" + "&".join(f"{k}={v}" for k, v in player_params.items())
+        
+        LINK_GENERATIONS.inc()
+        LINK_GENERATION_SECONDS.observe(time.perf_counter() - started)
+        return links
+    
     def generate_link(self, username: str, character: str = None, is_host: bool = False) -> str:
         """Generate a VDO.Ninja link for a player or host"""
         try: